@@ -0,0 +1,52 @@
+"""
+Microbenchmark: per-request overhead of building a MainAgent vs reusing one.
+
+Runs the full Planner → Worker → Evaluator path on a tiny pre-fetched
+transcript so the numbers reflect setup cost rather than network or text work.
+
+Usage:
+    python benchmarks/bench_agent_reuse.py [iterations]
+"""
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from project.main_agent import MainAgent, get_agent
+from project.memory.session_memory import SessionMemory
+from project.tools.tools import Transcript
+
+URL = "https://youtu.be/dQw4w9WgXcQ"
+TRANSCRIPT = Transcript("dQw4w9WgXcQ", "en", [
+    {"start": 0.0, "duration": 2.0, "text": "A short benchmark transcript."},
+])
+
+
+def per_call_agent(iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        agent = MainAgent()
+        agent.handle_message(URL, transcript=TRANSCRIPT)
+    return (time.perf_counter() - started) / iterations
+
+
+def shared_agent(iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        get_agent().handle_message(URL, transcript=TRANSCRIPT, memory=SessionMemory())
+    return (time.perf_counter() - started) / iterations
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    logging.disable(logging.INFO)
+    # Measure construction overhead only, not memoized stage hits.
+    get_agent().planner.stage_cache = get_agent().worker.stage_cache = None
+
+    before = per_call_agent(iterations)
+    after = shared_agent(iterations)
+    print(f"new MainAgent per request: {before * 1e6:8.1f} us/request")
+    print(f"shared MainAgent:          {after * 1e6:8.1f} us/request")
+    print(f"speedup:                   {before / after:8.2f}x")
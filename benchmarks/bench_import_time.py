@@ -0,0 +1,68 @@
+"""
+Startup cost of the entry points, measured with ``python -X importtime``.
+
+Each module is imported in a fresh interpreter several times; the best
+cumulative time is compared with a budget, and heavy dependencies that
+should only load on demand (the transcript API, requests, NumPy) must not
+show up at all. Exits non-zero when startup regresses.
+
+Usage:
+    python benchmarks/bench_import_time.py [--budget-ms 150] [--repeats 5]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+MODULES = ("project.cli", "project.main_agent")
+LAZY_DEPENDENCIES = ("youtube_transcript_api", "requests", "urllib3", "numpy")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_profile(module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Cumulative import time of ``module`` in ms, and every module it loaded.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    loaded: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            loaded[match.group(4)] = int(match.group(2)) / 1000.0
+    return loaded[module], loaded
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Budget per entry point")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'module':<24}{'best ms':>10}{'budget ms':>11}")
+    for module in MODULES:
+        best = None
+        for _ in range(args.repeats):
+            elapsed, loaded = import_profile(module)
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{module:<24}{best:>10.1f}{args.budget_ms:>11.0f}")
+        eager = [name for name in LAZY_DEPENDENCIES if name in loaded]
+        if eager:
+            print(f"  imports {', '.join(eager)} at startup")
+            failed = True
+        if best > args.budget_ms:
+            print("  over budget")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Insert and query latency of the near-duplicate index at scale.
+
+Bulk-loads random signatures (one million by default) into an index file,
+planting a perturbed copy for some of them, then times single inserts and
+lookups of planted re-uploads and of unseen videos, and reports recall.
+Signature computation itself is timed on synthetic transcripts.
+
+An existing index file with enough documents is reused, so the slow bulk
+load only happens once.
+
+Usage:
+    python benchmarks/bench_near_duplicates.py [--documents 1000000] [--index /tmp/dups.db]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fixtures import synthetic_transcript
+from project.tools.near_duplicates import NUM_BINS, NearDuplicateIndex, minhash
+
+BATCH = 10000
+
+
+def random_signature() -> array:
+    return array("Q", os.urandom(8 * NUM_BINS))
+
+
+def reupload_of(signature: array, rng: random.Random, changed: int = 4) -> array:
+    # About 97% of bins unchanged: a re-upload with a new intro and outro.
+    copy = array("Q", signature)
+    for i in rng.sample(range(NUM_BINS), changed):
+        copy[i] = int.from_bytes(os.urandom(8), "little")
+    return copy
+
+
+def percentiles(samples: List[float]) -> str:
+    ordered = sorted(samples)
+    p50 = ordered[len(ordered) // 2] * 1e3
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e3
+    return f"p50 {p50:7.2f} ms  p99 {p99:7.2f} ms"
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--index", default=os.path.join(tempfile.gettempdir(), "near_duplicates_bench.db"))
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    index = NearDuplicateIndex(args.index, threshold=args.threshold)
+    print(f"{args.index}: {index.num_bins} bins, {index.rows} rows per band")
+
+    for hours in (1, 10):
+        text = synthetic_transcript(hours * 3600).text
+        started = time.perf_counter()
+        minhash(text)
+        print(f"signature of a {hours}h transcript: {(time.perf_counter() - started) * 1e3:.0f} ms")
+
+    have = len(index)
+    if have < args.documents:
+        started = time.perf_counter()
+        for batch_start in range(have, args.documents, BATCH):
+            count = min(BATCH, args.documents - batch_start)
+            index.add_many((f"bulk{batch_start + i:07d}", random_signature(), None) for i in range(count))
+        elapsed = time.perf_counter() - started
+        print(f"bulk load of {args.documents - have} documents: {elapsed:.1f}s "
+              f"({(args.documents - have) / elapsed:.0f}/s)")
+    print(f"index holds {len(index)} documents, {os.path.getsize(args.index) / 2 ** 20:.0f} MiB")
+
+    originals = [random_signature() for _ in range(args.queries)]
+    inserts = []
+    for i, signature in enumerate(originals):
+        started = time.perf_counter()
+        index.add(f"orig{time.time_ns()}{i}", signature)
+        inserts.append(time.perf_counter() - started)
+    print(f"insert:           {percentiles(inserts)}")
+
+    hits, found = [], 0
+    for signature in originals:
+        query = reupload_of(signature, rng)
+        started = time.perf_counter()
+        found += index.find(query) is not None
+        hits.append(time.perf_counter() - started)
+    print(f"query (re-upload): {percentiles(hits)}  recall {found / len(originals):.3f}")
+
+    misses, false_positives = [], 0
+    for _ in range(args.queries):
+        started = time.perf_counter()
+        false_positives += index.find(random_signature()) is not None
+        misses.append(time.perf_counter() - started)
+    print(f"query (unseen):    {percentiles(misses)}  false positives {false_positives}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
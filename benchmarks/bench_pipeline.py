@@ -0,0 +1,199 @@
+"""
+Benchmark harness for the Planner → Worker → Evaluator pipeline.
+
+Replays recorded transcript fixtures (the youtube_transcript_*.txt articles
+in the repo root) and synthetic transcripts from 1 minute to 10 hours
+through a stub TranscriptFetcher, so no network is involved. Each agent
+stage and MainAgent.handle_message end to end are timed; results include
+p50/p99 latency, throughput and peak traced memory, and can be saved as
+JSON and compared against an earlier run.
+
+Usage:
+    python benchmarks/bench_pipeline.py --output results.json
+    python benchmarks/bench_pipeline.py --compare results.json --tolerance 0.15
+    python benchmarks/bench_pipeline.py --only "1m|recorded" --iterations 50
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fixtures import REPO_ROOT, all_fixtures
+from project.main_agent import MainAgent
+from project.memory.session_memory import SessionMemory
+from project.tools.transcript import Transcript
+
+STAGES = ("planner", "worker", "evaluator", "end_to_end")
+
+
+class FixtureFetcher:
+    """
+    Stand-in TranscriptFetcher serving fixtures by name.
+    """
+
+    def __init__(self, transcripts: Dict[str, Transcript]) -> None:
+        self.transcripts = transcripts
+
+    def fetch_transcript(self, url_or_query: str) -> Transcript:
+        return self.transcripts[url_or_query]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "runs": len(samples),
+        "mean_ms": 1e3 * sum(samples) / len(samples),
+        "p50_ms": 1e3 * percentile(samples, 50),
+        "p99_ms": 1e3 * percentile(samples, 99),
+    }
+
+
+def peak_memory(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_fixture(agent: MainAgent, name: str, transcript: Transcript, iterations: int, budget: float) -> Dict[str, Any]:
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    deadline = time.perf_counter() + budget
+    clock = time.perf_counter
+
+    for i in range(iterations):
+        memory = SessionMemory()
+        t0 = clock()
+        plan = agent.planner.create_plan(name, memory)
+        t1 = clock()
+        draft = agent.worker.generate_blog(plan, memory)
+        t2 = clock()
+        agent.evaluator.evaluate(draft, plan, memory)
+        t3 = clock()
+        agent.handle_message(name, memory=SessionMemory())
+        t4 = clock()
+
+        timings["planner"].append(t1 - t0)
+        timings["worker"].append(t2 - t1)
+        timings["evaluator"].append(t3 - t2)
+        timings["end_to_end"].append(t4 - t3)
+        if i >= 2 and clock() > deadline:
+            break
+
+    stages = {stage: summarize(samples) for stage, samples in timings.items()}
+    mean_e2e = stages["end_to_end"]["mean_ms"] / 1e3
+    text_bytes = len(transcript.text.encode("utf-8"))
+    return {
+        "segments": len(transcript),
+        "video_seconds": transcript.duration,
+        "text_bytes": text_bytes,
+        "stages": stages,
+        "videos_per_second": 1.0 / mean_e2e if mean_e2e else 0.0,
+        "mb_per_second": text_bytes / 1e6 / mean_e2e if mean_e2e else 0.0,
+        "peak_traced_bytes": peak_memory(lambda: agent.handle_message(name, memory=SessionMemory())),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Names of fixture/stage pairs whose p50 got slower than baseline by more than ``tolerance``.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for stage in STAGES:
+            now = result["stages"][stage]["p50_ms"]
+            before = previous["stages"][stage]["p50_ms"]
+            if before and now > before * (1.0 + tolerance):
+                regressions.append(f"{name}/{stage}: p50 {before:.2f} ms -> {now:.2f} ms (+{(now / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20, help="Maximum runs per fixture")
+    parser.add_argument("--budget", type=float, default=10.0, help="Seconds per fixture (at least 3 runs)")
+    parser.add_argument("--only", default="", help="Regex selecting fixture names")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--compare", help="Baseline JSON results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p50 slowdown, as a fraction")
+    parser.add_argument("--memoize", action="store_true",
+                        help="Keep the stage cache on (measures warm, memoized runs)")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    fixtures = all_fixtures(args.only)
+    agent = MainAgent()
+    agent.planner.transcript_fetcher = FixtureFetcher(fixtures)
+    if not args.memoize:
+        agent.planner.stage_cache = agent.worker.stage_cache = None
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "memoize": args.memoize,
+        },
+        "results": {},
+    }
+
+    print(f"{'fixture':<28}{'segments':>9}{'plan p50':>10}{'work p50':>10}{'eval p50':>10}"
+          f"{'e2e p50':>10}{'e2e p99':>10}{'videos/s':>10}{'peak MiB':>10}")
+    for name, transcript in fixtures.items():
+        r = bench_fixture(agent, name, transcript, args.iterations, args.budget)
+        results["results"][name] = r
+        s = r["stages"]
+        print(f"{name:<28}{r['segments']:>9}{s['planner']['p50_ms']:>10.2f}{s['worker']['p50_ms']:>10.2f}"
+              f"{s['evaluator']['p50_ms']:>10.2f}{s['end_to_end']['p50_ms']:>10.2f}"
+              f"{s['end_to_end']['p99_ms']:>10.2f}{r['videos_per_second']:>10.2f}"
+              f"{r['peak_traced_bytes'] / 2**20:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions against", args.compare)
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\nNo regressions against {args.compare} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
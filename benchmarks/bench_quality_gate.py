@@ -0,0 +1,87 @@
+"""
+Cost of the transcript quality gate, and the work it saves on unusable input.
+
+Times assess_transcript on every fixture (with NumPy and with the
+pure-Python fallback), then runs "[Music]"-only and looping-caption
+transcripts through MainAgent with the gate on (rejected after fetch) and
+off (the whole pipeline runs).
+
+Usage:
+    python benchmarks/bench_quality_gate.py [--only 1h] [--repeat 5]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fixtures import all_fixtures
+from project.main_agent import MainAgent
+from project.memory.session_memory import SessionMemory
+from project.tools import quality
+from project.tools.quality import LowQualityTranscript, assess_transcript
+from project.tools.transcript import Transcript
+
+
+def best_of(repeat: int, run: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1e3
+
+
+def unusable(seconds: float) -> dict:
+    count = int(seconds / 2)
+    return {
+        "music-only": Transcript("music000000", "en", [
+            {"start": 2.0 * i, "duration": 2.0, "text": "[Music]"} for i in range(count)
+        ]),
+        "looping": Transcript("looping0000", "en", [
+            {"start": 2.0 * i, "duration": 2.0, "text": ("la la la la", "oh baby oh")[i % 2]} for i in range(count)
+        ]),
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", default="", help="Regex selecting fixtures")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seconds", type=float, default=3600, help="Length of the unusable transcripts")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    numpy = quality._get_numpy()
+    print(f"{'fixture':<28} {'numpy ms':>9} {'python ms':>10}  score  issues")
+    for name, transcript in all_fixtures(args.only).items():
+        fast = best_of(args.repeat, lambda: assess_transcript(transcript)) if numpy else float("nan")
+        quality._get_numpy = lambda: None
+        try:
+            slow = best_of(args.repeat, lambda: assess_transcript(transcript))
+        finally:
+            quality._get_numpy = lambda: numpy
+        report = assess_transcript(transcript)
+        print(f"{name:<28} {fast:9.1f} {slow:10.1f}  {report.score:5.2f}  {'; '.join(report.issues) or '-'}")
+
+    print(f"\n{'unusable input':<28} {'gate on ms':>10} {'gate off ms':>12}")
+    for name, transcript in unusable(args.seconds).items():
+        def convert(gate: bool) -> None:
+            agent = MainAgent()
+            agent.planner.quality_gate = gate
+            try:
+                agent.handle_message(transcript.video_id, transcript=transcript, memory=SessionMemory())
+            except LowQualityTranscript:
+                pass
+
+        on = best_of(args.repeat, lambda: convert(True))
+        off = best_of(args.repeat, lambda: convert(False))
+        print(f"{name:<28} {on:10.1f} {off:12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Query latency of the transcript search index at corpus scale.
+
+Indexes synthetic videos (100k by default) whose words follow a Zipf
+distribution over a large vocabulary, with a rare phrase planted in 1%
+of them, then times term, multi-term and phrase queries of varying
+selectivity.
+
+An existing index directory with enough videos is reused, so the slow
+build only happens once.
+
+Usage:
+    python benchmarks/bench_search_index.py [--videos 100000] [--index /tmp/search_bench]
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from project.tools.search_index import TranscriptSearchIndex
+
+VOCABULARY = 50000
+PLANTED = "quantum pancake recipe"
+
+
+def vocabulary() -> List[str]:
+    # Pronounceable, distinct pseudo-words: "ba", "be", ..., "baba", ...
+    syllables = [c + v for c in "bdfgklmnprstvz" for v in "aeiou"]
+    words = []
+    for length in itertools.count(1):
+        for parts in itertools.product(syllables, repeat=length):
+            words.append("".join(parts))
+            if len(words) == VOCABULARY:
+                return words
+
+
+def video_segments(rng: random.Random, words: List[str], weights: List[float], count: int) -> List[Dict]:
+    tokens = rng.choices(words, cum_weights=weights, k=count)
+    if rng.random() < 0.01:
+        at = rng.randrange(count)
+        tokens[at:at] = PLANTED.split()
+    return [
+        {"start": 4.0 * i, "duration": 4.0, "text": " ".join(tokens[j:j + 10])}
+        for i, j in enumerate(range(0, len(tokens), 10))
+    ]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=1500, help="Words per video (about 10 minutes of speech)")
+    parser.add_argument("--index", default=os.path.join(tempfile.gettempdir(), "search_index_bench"))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    words = vocabulary()
+    weights = list(itertools.accumulate(1.0 / rank for rank in range(1, len(words) + 1)))
+    index = TranscriptSearchIndex(args.index, flush_every=1000)
+
+    have = len(index)
+    if have < args.videos:
+        started = time.perf_counter()
+        for i in range(have, args.videos):
+            index.add(f"v{i:010d}", video_segments(rng, words, weights, args.words))
+        index.flush()
+        elapsed = time.perf_counter() - started
+        print(f"indexed {args.videos - have} videos in {elapsed:.1f}s ({(args.videos - have) / elapsed:.0f}/s)")
+    size = sum(os.path.getsize(os.path.join(args.index, name)) for name in os.listdir(args.index))
+    print(f"{args.index}: {len(index)} videos, {size / 2 ** 20:.0f} MiB")
+
+    queries = {
+        "rare term": words[20000],
+        "mid term": words[500],
+        "common term": words[0],
+        "two terms": f"{words[30]} {words[700]}",
+        "common phrase": f'"{words[0]} {words[1]}"',
+        "planted phrase": f'"{PLANTED}"',
+        "phrase + term": f'"{PLANTED}" {words[3]}',
+    }
+    print(f"{'query':<16} {'p50 ms':>8} {'p99 ms':>8}  results")
+    for name, query in queries.items():
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            results = index.search(query, limit=10)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        p50 = timings[len(timings) // 2] * 1e3
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1e3
+        top = f"{results[0].url} ({results[0].matches})" if results else "-"
+        print(f"{name:<16} {p50:8.2f} {p99:8.2f}  {len(results):>2}  {top}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Scaling benchmark for parallel per-section analysis in the Worker.
+
+Builds a synthetic transcript, chunks it the way the Planner does and
+times Worker.analyze with 1, 2, ... N worker processes, checking that
+every worker count produces identical metadata.
+
+Usage:
+    python benchmarks/bench_section_scaling.py [--hours 10] [--max-workers 8]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fixtures import synthetic_transcript
+from project.agents.worker import Worker
+from project.core.context_engineering import chunk_transcript
+from project.tools.section_analysis import SectionProcessor
+
+
+def best_of(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hours", type=float, default=10.0, help="Synthetic transcript length")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-chars", type=int, default=800, help="Chunk budget, as in the Planner")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    transcript = synthetic_transcript(args.hours * 3600)
+    chunks = chunk_transcript(transcript, max_chars=args.max_chars)
+    sections = [chunk.text for chunk in chunks]
+
+    def plan():
+        return {"transcript_data": transcript, "transcript": transcript.text,
+                "sections": sections, "chunks": chunks}
+
+    print(f"{len(transcript.text) / 1e6:.1f} MB transcript, {len(sections)} sections, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'workers':>8}{'best ms':>10}{'speedup':>9}")
+
+    baseline_meta = None
+    baseline_time = None
+    for workers in range(1, args.max_workers + 1):
+        processor = SectionProcessor(workers=workers, min_parallel_chars=0)
+        worker = Worker(section_processor=processor)
+        try:
+            meta = worker.analyze(plan())  # warms the pool
+            elapsed = best_of(lambda: worker.analyze(plan()), args.repeats)
+        finally:
+            processor.shutdown()
+
+        if baseline_meta is None:
+            baseline_meta, baseline_time = meta, elapsed
+        elif meta != baseline_meta:
+            print(f"output with {workers} workers differs from 1 worker")
+            return 1
+        print(f"{workers:>8}{elapsed * 1e3:>10.1f}{baseline_time / elapsed:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Latency of the summarizer modes on synthetic transcripts up to 10 hours,
+checked against a fixed budget for the extractive modes.
+
+Usage:
+    python benchmarks/bench_summarizer.py [--hours 1 10] [--budget-ms 2000]
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fixtures import synthetic_transcript
+from project.tools.text_analysis import TextAnalysis
+from project.tools.tools import SimpleSummarizer
+
+
+def best_of(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hours", type=float, nargs="+", default=[0.1, 1.0, 10.0])
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="Budget per summary")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    over_budget = False
+    print(f"{'hours':>6}{'MB':>7}" + "".join(f"{mode + ' ms':>14}" for mode in SimpleSummarizer.MODES))
+    for hours in args.hours:
+        text = synthetic_transcript(hours * 3600).text
+        row = f"{hours:>6g}{len(text) / 1e6:>7.1f}"
+        for mode in SimpleSummarizer.MODES:
+            summarizer = SimpleSummarizer(mode)
+            # A fresh analysis per run, as the Worker builds one per plan.
+            elapsed = best_of(lambda: summarizer.summarize(text, 3, analysis=TextAnalysis(text)), args.repeats)
+            row += f"{elapsed * 1e3:>14.1f}"
+            over_budget |= elapsed * 1e3 > args.budget_ms
+        print(row)
+    if over_budget:
+        print(f"over the {args.budget_ms:g} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
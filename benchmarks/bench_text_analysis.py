@@ -0,0 +1,81 @@
+"""
+Benchmark: the three separate regex passes the Worker used to run over a
+transcript vs one shared TextAnalysis, on a ~1 MB synthetic transcript.
+
+Usage:
+    python benchmarks/bench_text_analysis.py [megabytes]
+"""
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from project.tools.text_analysis import TextAnalysis
+from project.tools.tools import SEO_STOPWORDS, SEOKeywordGenerator, SimpleSummarizer, estimate_reading_time
+
+VOCAB = ("so today we are going to talk about transformers attention models training "
+         "data pipeline python agents memory really actually basically the and you this "
+         "that with from have there video youtube using neural network layer token "
+         "embedding gradient loss optimizer batch epoch inference deployment").split()
+
+
+def synthetic_text(megabytes: float, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    target = int(megabytes * 1024 * 1024)
+    while size < target:
+        words = [rng.choice(VOCAB) for _ in range(rng.randint(6, 18))]
+        sentence = " ".join(words).capitalize() + rng.choice([".", ".", "?", "!"])
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)
+
+
+def legacy(text: str):
+    sentences = re.split(r'(?<=[.!?])\s+', text.strip())
+    sentences = [s.strip() for s in sentences if s.strip()]
+    summary = " ".join(sentences[:3])
+
+    tokens = re.findall(r"[a-zA-Z]{4,}", text.lower())
+    tokens = [t for t in tokens if t not in SEO_STOPWORDS]
+    keywords = [w for w, _ in Counter(tokens).most_common(8)]
+
+    words = re.findall(r"\w+", text)
+    reading_time = max(0.1, len(words) / 200.0) if words else 0.0
+    return summary, keywords, reading_time
+
+
+def shared(text: str):
+    analysis = TextAnalysis(text)
+    return (
+        SimpleSummarizer().summarize(text, 3, analysis=analysis),
+        SEOKeywordGenerator().generate(text, 8, analysis=analysis),
+        estimate_reading_time(text, analysis=analysis),
+    )
+
+
+def best_of(fn, text: str, repeats: int = 5) -> float:
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn(text)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+if __name__ == "__main__":
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    text = synthetic_text(megabytes)
+    assert legacy(text) == shared(text), "single-pass analysis must match the legacy tools"
+
+    before = best_of(legacy, text)
+    after = best_of(shared, text)
+    print(f"{len(text) / 1e6:.2f} MB transcript")
+    print(f"three passes: {before * 1e3:8.1f} ms")
+    print(f"single pass:  {after * 1e3:8.1f} ms")
+    print(f"speedup:      {before / after:8.2f}x")
@@ -0,0 +1,72 @@
+"""
+Benchmark: the old four-regex video ID extraction vs the precompiled
+single-pass extractor, and bulk extract-and-dedupe, over 1M mixed URLs.
+
+Usage:
+    python benchmarks/bench_video_ids.py [count]
+"""
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from project.tools.video_id import extract_video_id, extract_video_ids
+
+ID_CHARS = string.ascii_letters + string.digits + "_-"
+TEMPLATES = (
+    "https://www.youtube.com/watch?v={id}",
+    "https://www.youtube.com/watch?v={id}&list=PL{id}&index=4",
+    "https://youtu.be/{id}?si=abcdefgh",
+    "https://www.youtube.com/embed/{id}",
+    "https://m.youtube.com/watch?v={id}",
+    "https://music.youtube.com/watch?v={id}&feature=share",
+    "https://www.youtube.com/shorts/{id}",
+    "https://www.youtube.com/live/{id}?feature=shared",
+    "{id}",
+)
+
+
+def synthetic_urls(count: int, distinct: int, seed: int = 1):
+    rng = random.Random(seed)
+    ids = ["".join(rng.choice(ID_CHARS) for _ in range(11)) for _ in range(distinct)]
+    return [rng.choice(TEMPLATES).format(id=rng.choice(ids)) for _ in range(count)]
+
+
+def legacy_extract(url_or_query: str):
+    pattern1 = r'(?:youtube\.com\/watch\?v=)([a-zA-Z0-9_-]{11})'
+    pattern2 = r'(?:youtu\.be\/)([a-zA-Z0-9_-]{11})'
+    pattern3 = r'(?:youtube\.com\/(?:embed|v)\/)([a-zA-Z0-9_-]{11})'
+    pattern4 = r'^([a-zA-Z0-9_-]{11})$'
+    for pattern in [pattern1, pattern2, pattern3, pattern4]:
+        match = re.search(pattern, url_or_query)
+        if match:
+            return match.group(1)
+    return None
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    urls = synthetic_urls(count, distinct=count // 4)
+
+    legacy_ids, legacy_time = timed(lambda: [legacy_extract(u) for u in urls])
+    single_ids, single_time = timed(lambda: [extract_video_id(u) for u in urls])
+    unique_ids, bulk_time = timed(extract_video_ids, urls)
+
+    assert None not in single_ids
+    assert unique_ids == list(dict.fromkeys(single_ids))
+    recognized = sum(1 for v in legacy_ids if v is not None)
+
+    print(f"{count:,} URLs, {len(unique_ids):,} distinct videos")
+    print(f"four regexes:      {legacy_time:7.2f} s  ({recognized / count:.0%} recognized)")
+    print(f"single pass:       {single_time:7.2f} s  ({legacy_time / single_time:.2f}x)")
+    print(f"bulk + dedupe:     {bulk_time:7.2f} s  ({count / bulk_time / 1e6:.2f} M URLs/s)")
@@ -0,0 +1,72 @@
+"""
+Benchmark: time and memory for rendering a synthetic 10-hour transcript
+(~50k segments) with Worker.generate_blog vs streaming Worker.write_blog.
+
+The analysis runs first and is excluded: its whole-text pass sets the
+process's peak RSS either way. The rendering call alone is timed, then
+repeated under tracemalloc for the peak memory it allocates. Each mode
+runs in its own child process.
+
+Usage:
+    python benchmarks/bench_worker_render.py [segments]
+"""
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fixtures import synthetic_transcript
+from project.agents.worker import Worker
+from project.memory.session_memory import SessionMemory
+
+
+def run_mode(mode: str, segments: int) -> dict:
+    logging.disable(logging.INFO)
+    worker = Worker()
+    plan = {"transcript_data": synthetic_transcript(segments * 0.72), "style": {}}
+    meta = worker.analyze(plan)
+    time_labels = worker.time_labels(plan)
+
+    def render() -> int:
+        if mode == "string":
+            return len(worker.generate_blog(plan, SessionMemory(), meta, time_labels)["body"])
+        with open(os.devnull, "w", encoding="utf-8") as sink:
+            return worker.write_blog(plan, sink, SessionMemory(), meta, time_labels)["length"]
+
+    started = time.perf_counter()
+    length = render()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "peak_alloc_kb": peak / 1024,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "chars": length,
+    }
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        print(json.dumps(run_mode(sys.argv[2], int(sys.argv[3]))))
+        sys.exit(0)
+
+    segments = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    print(f"{segments} segments (~{segments * 0.72 / 3600:.1f} h)")
+    for mode in ("string", "sink"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, str(segments)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        r = json.loads(out)
+        print(f"{mode:>6}: {r['seconds']:.3f}s  {r['peak_alloc_kb'] / 1024:.2f} MiB allocated while rendering  "
+              f"(process peak RSS {r['peak_rss_kb'] / 1024:.1f} MiB)  {r['chars']} chars")
@@ -0,0 +1,85 @@
+"""
+Transcript fixtures for the benchmarks: recorded articles and synthetic transcripts.
+"""
+import glob
+import os
+import random
+import re
+from typing import Dict, List
+
+from project.tools.transcript import Transcript
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+_LINE_RE = re.compile(r"^((?:\d+:)?\d+:\d+) - ((?:\d+:)?\d+:\d+): (.*)$")
+
+WORDS = ("so today we are going to talk about transformers attention models training "
+         "data pipeline python agents memory really actually basically the and you this "
+         "that with from have there video youtube using neural network layer token "
+         "embedding gradient loss optimizer batch epoch inference deployment").split()
+
+SYNTHETIC_DURATIONS = {
+    "synthetic-1m": 60,
+    "synthetic-10m": 600,
+    "synthetic-1h": 3600,
+    "synthetic-10h": 36000,
+}
+
+
+def _seconds(label: str) -> int:
+    total = 0
+    for part in label.split(":"):
+        total = total * 60 + int(part)
+    return total
+
+
+def load_recorded(path: str) -> Transcript:
+    """
+    Rebuild a transcript from a saved article's "MM:SS - MM:SS: text" lines.
+    """
+    segments: List[Dict] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            match = _LINE_RE.match(line.rstrip("\n"))
+            if match:
+                start = _seconds(match.group(1))
+                end = _seconds(match.group(2))
+                segments.append({"start": float(start), "duration": float(end - start), "text": match.group(3)})
+    video_id = os.path.splitext(os.path.basename(path))[0][-11:]
+    return Transcript(video_id, "en", segments)
+
+
+def recorded_fixtures(directory: str = REPO_ROOT) -> Dict[str, Transcript]:
+    """
+    Every youtube_transcript_*.txt article saved by the demo scripts.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, "youtube_transcript_*.txt")))
+    return {f"recorded-{os.path.basename(p)[len('youtube_transcript_'):-4]}": load_recorded(p) for p in paths}
+
+
+def synthetic_transcript(seconds: float, seed: int = 0, segment_seconds: float = 0.72) -> Transcript:
+    """
+    Deterministic speech-like transcript covering ``seconds`` of video.
+
+    The default segment length gives about 50k segments for 10 hours.
+    """
+    rng = random.Random(seed)
+    segments = []
+    t = 0.0
+    while t < seconds:
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 14))]
+        text = " ".join(words)
+        if rng.random() < 0.3:
+            text = text.capitalize() + rng.choice([".", ".", "?", "!"])
+        segments.append({"start": t, "duration": segment_seconds, "text": text})
+        t += segment_seconds
+    return Transcript("synthetic00", "en", segments)
+
+
+def all_fixtures(include: str = "") -> Dict[str, Transcript]:
+    fixtures = recorded_fixtures()
+    for name, seconds in SYNTHETIC_DURATIONS.items():
+        fixtures[name] = synthetic_transcript(seconds)
+    if include:
+        fixtures = {name: t for name, t in fixtures.items() if re.search(include, name)}
+    return fixtures
@@ -0,0 +1,8 @@
+"""
+python -m project: see project.cli.
+"""
+import sys
+
+from project.cli import main
+
+sys.exit(main())
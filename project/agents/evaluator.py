@@ -1,12 +1,16 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from project.core.observability import get_logger
+from project.core.observability import get_logger, span
 from project.memory.session_memory import SessionMemory
+from project.tools.quality import QualityReport, assess_transcript, weakest_metrics
 
 
 class Evaluator:
     """
     Evaluator agent that scores and returns the final article.
+
+    The score is the transcript's quality score (see project.tools.quality),
+    reusing the report the Planner's gate computed when the plan has one.
     """
 
     def __init__(self) -> None:
@@ -14,23 +18,51 @@ class Evaluator:
 
     def evaluate(self, draft: Dict[str, Any], plan: Dict[str, Any], memory: SessionMemory) -> Dict[str, Any]:
         self.logger.info("Evaluating draft.")
-        body = draft.get("body", "").strip()
+        with span("evaluation") as s:
+            # Streamed drafts carry only the body's length; their final
+            # article is None since the caller already has the fragments.
+            body = draft.get("body")
+            if body is not None:
+                body = body.strip()
+            length = draft.get("length", 0) if body is None else len(body)
+
+            quality = self._quality(plan)
 
-        if not body:
-            score = 0.0
-            feedback = "No article content generated."
-            final_article = "No article generated."
-        else:
-            score = 1.0
-            feedback = "For this demo, the generated article looks acceptable."
-            final_article = body
+            if not length:
+                score = 0.0
+                feedback = "No article content generated."
+                final_article = "No article generated."
+            elif quality is None:
+                score = 1.0
+                feedback = "No transcript to assess; the article is accepted as generated."
+                final_article = body
+            else:
+                score = quality.score
+                weakest = weakest_metrics(quality)
+                if weakest:
+                    feedback = "Transcript quality limits the article; weakest signals: " + ", ".join(
+                        f"{name.replace('_', ' ')} ({value:.2f})" for name, value in weakest
+                    ) + "."
+                else:
+                    feedback = "The transcript reads as clear speech; the article looks acceptable."
+                final_article = body
+            s.add(bytes=length)
 
         result: Dict[str, Any] = {
             "score": score,
             "feedback": feedback,
             "final_article": final_article,
         }
+        if quality is not None:
+            result["quality"] = quality.to_dict()
 
         memory.set("last_evaluation", result)
         self.logger.info("Evaluation complete with score %.2f.", score)
         return result
+
+    @staticmethod
+    def _quality(plan: Dict[str, Any]) -> Optional[QualityReport]:
+        quality = plan.get("quality")
+        if quality is None and plan.get("transcript_data") is not None:
+            quality = assess_transcript(plan["transcript_data"])
+        return quality
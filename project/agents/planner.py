@@ -1,9 +1,13 @@
-from typing import Dict, Any
+import weakref
+from typing import Dict, Any, Optional
 
-from project.tools.tools import TranscriptFetcher
-from project.core.context_engineering import chunk_text
-from project.core.observability import get_logger
+from project.tools.tools import Transcript, TranscriptFetcher
+from project.core.context_engineering import CHUNKER_VERSION, chunk_transcript
+from project.core.observability import get_logger, span
 from project.memory.session_memory import SessionMemory
+from project.memory.stage_cache import StageCache, stage_key
+from project.tools.near_duplicates import NearDuplicateIndex
+from project.tools.quality import LowQualityTranscript, QualityReport, assess_transcript
 
 
 class Planner:
@@ -12,34 +16,117 @@ class Planner:
 
     Responsibilities:
     - Fetch a transcript (simulated here)
+    - Reject transcripts that fail the quality gate before any analysis
     - Break it into sections
     - Build a high-level plan for the worker
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        stage_cache: Optional[StageCache] = None,
+        duplicate_index: Optional[NearDuplicateIndex] = None,
+        quality_gate: bool = True,
+    ) -> None:
         self.logger = get_logger("Planner")
         self.transcript_fetcher = TranscriptFetcher()
+        self.stage_cache = stage_cache
+        self.duplicate_index = duplicate_index if duplicate_index is not None else NearDuplicateIndex.from_env()
+        self.quality_gate = quality_gate
+        # Reports live as long as their transcript, so the server's early
+        # check and the one in create_plan assess it only once.
+        self._quality_reports: "weakref.WeakKeyDictionary[Transcript, QualityReport]" = weakref.WeakKeyDictionary()
 
-    def create_plan(self, user_input: str, memory: SessionMemory) -> Dict[str, Any]:
+    def check_quality(self, transcript_data: Transcript) -> QualityReport:
+        """
+        Quality metrics of a freshly fetched transcript.
+
+        Raises LowQualityTranscript when the gate is enabled and the
+        transcript fails it, so callers can stop before any analysis.
+        """
+        with span("quality_gate") as s:
+            report = self._quality_reports.get(transcript_data)
+            if report is None:
+                report = self._quality_reports[transcript_data] = assess_transcript(transcript_data)
+                s.add(bytes=len(transcript_data.text))
+            else:
+                s.add(cache_hits=1)
+        if self.quality_gate and not report.usable:
+            self.logger.warning("Rejecting transcript of %s: %s", transcript_data.video_id, "; ".join(report.issues))
+            raise LowQualityTranscript(report, transcript_data.video_id)
+        return report
+
+    def create_plan(
+        self,
+        user_input: str,
+        memory: SessionMemory,
+        transcript_data: Optional[Transcript] = None,
+    ) -> Dict[str, Any]:
         self.logger.info("Creating plan for user input.")
         style_prefs = memory.get(
             "style_preferences",
             {"tone": "simple", "length": "medium"},
         )
 
-        transcript = self.transcript_fetcher.fetch(user_input)
-        timestamped_transcript = self.transcript_fetcher.fetch_with_timestamps(user_input)
-        sections = chunk_text(transcript, max_chars=800)
+        # One fetch per video; text and segments are views of the same object.
+        # Callers that fetched ahead of time (e.g. batch jobs) pass it in.
+        if transcript_data is None:
+            transcript_data = self.transcript_fetcher.fetch_transcript(user_input)
+        transcript = transcript_data.text
+        quality = self.check_quality(transcript_data)
+
+        # Re-uploads and mirrors: the Worker can reuse the original's analysis.
+        # The video itself is indexed by remember_analysis once its article is done.
+        near_duplicate = signature = None
+        if self.duplicate_index is not None:
+            with span("near_duplicate_lookup") as s:
+                signature = self.duplicate_index.signature(transcript)
+                match = None
+                if signature is not None:
+                    match = self.duplicate_index.find(signature, exclude=transcript_data.video_id)
+                if match is not None:
+                    self.logger.info("%s is a near-duplicate of %s (%.2f).",
+                                     transcript_data.video_id, match.video_id, match.similarity)
+                    near_duplicate = match.to_dict()
+                s.add(bytes=len(transcript))
+
+        with span("chunking") as s:
+            if self.stage_cache is not None:
+                key = stage_key("chunking", transcript_data.content_hash, 800, CHUNKER_VERSION)
+                chunks = self.stage_cache.get_or_compute(
+                    key, lambda: chunk_transcript(transcript_data, max_chars=800), span=s
+                )
+            else:
+                chunks = chunk_transcript(transcript_data, max_chars=800)
+            sections = [chunk.text for chunk in chunks]
+            s.add(bytes=len(transcript))
 
         plan: Dict[str, Any] = {
             "task": "youtube_to_blog",
             "original_input": user_input,
+            "transcript_data": transcript_data,
             "transcript": transcript,
-            "timestamped_transcript": timestamped_transcript,
+            "timestamped_transcript": transcript_data.segments,
             "sections": sections,
+            "chunks": chunks,
             "style": style_prefs,
+            "near_duplicate": near_duplicate,
+            "duplicate_signature": signature,
+            "quality": quality,
         }
 
         memory.set("last_plan", plan)
         self.logger.info("Plan created with %d sections.", len(sections))
         return plan
+
+    def remember_analysis(self, plan: Dict[str, Any], meta: Dict[str, Any]) -> None:
+        """
+        Index this plan's video and the Worker's analysis of it in the
+        near-duplicate index, so later re-uploads of it can reuse the
+        analysis. Called once the article is finished, so a failed run is
+        never offered as the original of a later upload.
+        """
+        signature = plan.get("duplicate_signature")
+        if self.duplicate_index is not None and signature is not None:
+            video_id = plan["transcript_data"].video_id
+            self.duplicate_index.add(video_id, signature)
+            self.duplicate_index.set_meta(video_id, meta)
@@ -1,8 +1,28 @@
-from typing import Dict, Any, List
+import hashlib
+import io
+from typing import Dict, Any, Iterator, List, Optional, TextIO, Tuple
 
 from project.tools.tools import SimpleSummarizer, SEOKeywordGenerator, estimate_reading_time
-from project.core.observability import get_logger
+from project.tools.section_analysis import SECTION_VERSION, SectionProcessor, merge_sections
+from project.tools.text_analysis import TextAnalysis
+from project.tools.timestamps import columns_of, format_time_labels
+from project.core.a2a_protocol import A2AProtocol, AgentMessage
+from project.core.context_engineering import CHUNKER_VERSION
+from project.core.observability import get_logger, span
+from project.core.scheduler import Stage, StageScheduler
 from project.memory.session_memory import SessionMemory
+from project.memory.stage_cache import StageCache, stage_key
+
+FOOTER = "\n" + "=" * 60 + "\n" + "Developed by Raqibul Islam Ratul\n" + "=" * 60
+
+# Worker-internal analysis steps, routed to the Worker's own handlers.
+ANALYSIS_STAGES = (
+    Stage("section_analysis", "worker", "analyze_sections", ("plan",), ("sections",)),
+    Stage("text_analysis", "worker", "analyze_text", ("plan", "sections"), ("analysis",)),
+    Stage("summarization", "worker", "summarize", ("transcript", "analysis"), ("summary",)),
+    Stage("keyword_extraction", "worker", "extract_keywords", ("transcript", "analysis"), ("keywords",)),
+    Stage("reading_time", "worker", "estimate_reading_time", ("transcript", "analysis"), ("reading_time",)),
+)
 
 
 class Worker:
@@ -10,78 +30,353 @@ class Worker:
     Worker agent that turns a transcript plan into a blog-style article.
     """
 
-    def __init__(self) -> None:
+    # Bump when the article layout changes so memoized bodies are re-rendered.
+    RENDER_VERSION = "3"
+
+    def __init__(
+        self,
+        stage_cache: Optional[StageCache] = None,
+        section_processor: Optional[SectionProcessor] = None,
+    ) -> None:
         self.logger = get_logger("Worker")
         self.summarizer = SimpleSummarizer()
         self.keyword_gen = SEOKeywordGenerator()
+        self.stage_cache = stage_cache
+        self.section_processor = section_processor or SectionProcessor()
+        self.protocol = A2AProtocol()
+        self.protocol.register("worker", "analyze_sections", self._analyze_sections)
+        self.protocol.register("worker", "analyze_text", self._text_analysis)
+        self.protocol.register("worker", "summarize", self._summarize)
+        self.protocol.register("worker", "extract_keywords", self._extract_keywords)
+        self.protocol.register("worker", "estimate_reading_time", self._reading_time)
+        self.analysis_scheduler = StageScheduler(self.protocol, ANALYSIS_STAGES, max_workers=3)
 
-    def generate_blog(self, plan: Dict[str, Any], memory: SessionMemory) -> Dict[str, Any]:
-        self.logger.info("Generating blog content from plan.")
-        transcript: str = plan.get("transcript", "")
-        timestamped_transcript: List[Dict] = plan.get("timestamped_transcript", [])
-        sections: List[str] = plan.get("sections", [])
-        style = plan.get("style", {})
-
-        overall_summary = (
-            self.summarizer.summarize(transcript, max_sentences=3)
-            if transcript
-            else ""
+    def _transcript_views(self, plan: Dict[str, Any]) -> Tuple[str, List[Dict]]:
+        transcript_data = plan.get("transcript_data")
+        if transcript_data is not None:
+            return transcript_data.text, transcript_data.segments
+        return plan.get("transcript", ""), plan.get("timestamped_transcript", [])
+
+    def _content_hash(self, plan: Dict[str, Any]) -> Optional[str]:
+        transcript_data = plan.get("transcript_data")
+        return transcript_data.content_hash if transcript_data is not None else None
+
+    def analyze(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compute the article metadata (title, summary, keywords, reading time).
+
+        Memoized on the transcript content and tool versions when a stage
+        cache is configured.
+        """
+        duplicate = plan.get("near_duplicate")
+        if duplicate and duplicate.get("meta"):
+            return self._reuse_analysis(plan, duplicate)
+
+        content_hash = self._content_hash(plan)
+        if self.stage_cache is None or content_hash is None:
+            return self._analyze(plan)
+
+        key = stage_key(
+            "analysis", content_hash, self.summarizer.cache_version, self.keyword_gen.cache_version,
+            SECTION_VERSION, CHUNKER_VERSION, bool(plan.get("sections")),
+        )
+        with span("analysis") as s:
+            return self.stage_cache.get_or_compute(key, lambda: self._analyze(plan), span=s)
+
+    def _reuse_analysis(self, plan: Dict[str, Any], duplicate: Dict[str, Any]) -> Dict[str, Any]:
+        # Title, summary, keywords and section headings come from the
+        # near-duplicate the Planner found; the reading time and section
+        # times are this transcript's own.
+        transcript, _ = self._transcript_views(plan)
+        self.logger.info(
+            "Reusing the analysis of near-duplicate %s (similarity %.2f).",
+            duplicate["video_id"], duplicate["similarity"],
         )
-        keywords = self.keyword_gen.generate(transcript)
-        est_read_time = estimate_reading_time(transcript)
+        meta = dict(duplicate["meta"])
+        meta["reading_time"] = estimate_reading_time(transcript)
+        meta["duplicate_of"] = duplicate["video_id"]
+        if meta.get("sections"):
+            meta["sections"] = self._retime_sections(plan, meta["sections"])
+        return meta
+
+    @staticmethod
+    def _retime_sections(plan: Dict[str, Any], sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # The original's section times are off for a re-upload with a
+        # different intro. Chunks follow the text, so when this transcript
+        # splits into as many chunks, they line up with the original's
+        # sections; otherwise the sections are dropped.
+        chunks = plan.get("chunks") or []
+        if len(chunks) != len(sections):
+            return []
+        return [dict(section, start=chunk.start, end=chunk.end) for section, chunk in zip(sections, chunks)]
+
+    def _analyze(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        transcript, _ = self._transcript_views(plan)
+
+        # Summary, keywords and reading time only share the text analysis,
+        # so they run as concurrent stages once it exists.
+        run = self.analysis_scheduler.run({"plan": plan, "transcript": transcript})
+        run.raise_for_error()
+        values = run.values
+        analysis = values["analysis"]
+        keywords = values["keywords"]
+        self.keyword_gen.observe(transcript, analysis, doc_id=self._content_hash(plan))
 
         title = "Blog Article based on YouTube Video"
         if keywords:
             title = f"{keywords[0].capitalize()} – A Blog Based on a YouTube Video"
 
-        # Format timestamped transcript
-        timestamped_sections: List[str] = []
-        timestamped_sections.append("## Timestamped Transcript\n")
-        
-        for entry in timestamped_transcript:
-            start_time = entry['start']
-            end_time = start_time + entry['duration']
-            text = entry['text']
-            
-            # Format time as MM:SS
-            start_min = int(start_time // 60)
-            start_sec = int(start_time % 60)
-            end_min = int(end_time // 60)
-            end_sec = int(end_time % 60)
-            
-            timestamped_sections.append(
-                f"{start_min:02d}:{start_sec:02d} - {end_min:02d}:{end_sec:02d}: {text}\n"
+        return {
+            "title": title,
+            "summary": values["summary"],
+            "keywords": keywords,
+            "reading_time": values["reading_time"],
+            "sections": self._section_meta(plan, values["sections"] or []),
+        }
+
+    def _text_analysis(self, message: AgentMessage) -> Dict[str, Any]:
+        # One shared tokenization per plan, read by all three tools. With
+        # Planner sections it is merged from per-section results (map-reduce).
+        plan, sections = message.payload["plan"], message.payload["sections"]
+        analysis = plan.get("analysis")
+        if analysis is None:
+            transcript, _ = self._transcript_views(plan)
+            if sections is not None:
+                analysis = merge_sections(transcript, sections)
+            else:
+                analysis = TextAnalysis(transcript)
+            plan["analysis"] = analysis
+        # Tokenize here, once, rather than racing in the keyword and reading-time stages.
+        analysis.word_count
+        return {"analysis": analysis}
+
+    def _summarize(self, message: AgentMessage) -> Dict[str, Any]:
+        transcript, analysis = message.payload["transcript"], message.payload["analysis"]
+        with span("summarization") as s:
+            summary = (
+                self.summarizer.summarize(transcript, max_sentences=3, analysis=analysis)
+                if transcript
+                else ""
             )
+            s.add(bytes=len(transcript))
+        return {"summary": summary}
+
+    def _extract_keywords(self, message: AgentMessage) -> Dict[str, Any]:
+        transcript, analysis = message.payload["transcript"], message.payload["analysis"]
+        with span("keyword_extraction") as s:
+            keywords = self.keyword_gen.generate(transcript, analysis=analysis)
+            s.add(bytes=len(transcript))
+        return {"keywords": keywords}
+
+    def _reading_time(self, message: AgentMessage) -> Dict[str, Any]:
+        transcript, analysis = message.payload["transcript"], message.payload["analysis"]
+        return {"reading_time": estimate_reading_time(transcript, analysis=analysis)}
 
+    def _section_meta(self, plan: Dict[str, Any], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        chunks = plan.get("chunks") or []
+        meta = []
+        for i, result in enumerate(results):
+            section = {
+                "heading": result["heading"] or f"Part {i + 1}",
+                "summary": result["summary"],
+                "keywords": result["keywords"],
+            }
+            if i < len(chunks):
+                section["start"] = chunks[i].start
+                section["end"] = chunks[i].end
+            meta.append(section)
+        return meta
+
+    def _analyze_sections(self, message: AgentMessage) -> Dict[str, Any]:
+        """
+        Per-section summary, keywords and heading for the Planner's sections,
+        computed in parallel by the section processor. None without sections.
+        """
+        sections = message.payload["plan"].get("sections")
+        if not sections:
+            return {"sections": None}
+        with span("section_analysis") as s:
+            results = self.section_processor.process(sections)
+            s.add(bytes=sum(len(section) for section in sections))
+        return {"sections": results}
+
+    def render_header(self, meta: Dict[str, Any]) -> str:
         header_meta = [
-            f"# {title}",
+            f"# {meta['title']}",
             "",
-            f"**Estimated reading time:** {est_read_time:.1f} minutes",
+            f"**Estimated reading time:** {meta['reading_time']:.1f} minutes",
             "",
         ]
 
-        if overall_summary:
-            header_meta.append(f"**Summary:** {overall_summary}\n")
+        if meta["summary"]:
+            header_meta.append(f"**Summary:** {meta['summary']}\n")
 
-        if keywords:
-            header_meta.append(f"**SEO Keywords:** {', '.join(keywords)}\n")
-
-        # Combine all parts with developer credit at the end
-        article_body = (
-            "\n".join(header_meta) + 
-            "\n".join(timestamped_sections) +
-            "\n" + "="*60 + "\n" +
-            "Developed by Raqibul Islam Ratul\n" +
-            "="*60
-        )
+        if meta["keywords"]:
+            header_meta.append(f"**SEO Keywords:** {', '.join(meta['keywords'])}\n")
 
-        draft: Dict[str, Any] = {
-            "title": title,
-            "summary": overall_summary,
-            "keywords": keywords,
+        # A single section would only repeat the summary.
+        sections = meta.get("sections") or []
+        if len(sections) > 1:
+            header_meta.append("## Sections\n")
+            timed = all("start" in section for section in sections)
+            if timed:
+                labels, _ = format_time_labels(
+                    [section["start"] for section in sections],
+                    [section["end"] - section["start"] for section in sections],
+                )
+            for i, section in enumerate(sections):
+                heading = f"{labels[i]} {section['heading']}" if timed else section["heading"]
+                header_meta.append(f"### {heading}\n")
+                if section["summary"]:
+                    header_meta.append(f"{section['summary']}\n")
+
+        return "\n".join(header_meta)
+
+    def time_labels(self, plan: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """
+        Start and end labels of every timestamped segment, in one batched pass.
+
+        Independent of the analysis, so MainAgent computes them alongside it.
+        """
+        _, timestamped_transcript = self._transcript_views(plan)
+        starts, durations = columns_of(timestamped_transcript)
+        return format_time_labels(starts, durations)
+
+    def iter_article(
+        self,
+        plan: Dict[str, Any],
+        meta: Dict[str, Any],
+        time_labels: Optional[Tuple[List[str], List[str]]] = None,
+    ) -> Iterator[str]:
+        """
+        Yield the article in order: header and summary first, then one
+        fragment per timestamped segment, then the footer.
+
+        Concatenating the fragments gives exactly the body of generate_blog.
+        """
+        _, timestamped_transcript = self._transcript_views(plan)
+
+        yield self.render_header(meta)
+        yield "## Timestamped Transcript\n"
+
+        start_labels, end_labels = time_labels or self.time_labels(plan)
+        for entry, start_label, end_label in zip(timestamped_transcript, start_labels, end_labels):
+            yield f"\n{start_label} - {end_label}: {entry['text']}\n"
+        yield FOOTER
+
+    def build_draft(self, plan: Dict[str, Any], meta: Dict[str, Any], article_body: Optional[str]) -> Dict[str, Any]:
+        draft = {
+            "title": meta["title"],
+            "summary": meta["summary"],
+            "keywords": meta["keywords"],
             "body": article_body,
-            "style": style,
+            "style": plan.get("style", {}),
         }
+        if "duplicate_of" in meta:
+            draft["duplicate_of"] = meta["duplicate_of"]
+        return draft
+
+    def _measured(
+        self,
+        plan: Dict[str, Any],
+        meta: Dict[str, Any],
+        time_labels: Optional[Tuple[List[str], List[str]]],
+        draft: Dict[str, Any],
+    ) -> Iterator[str]:
+        # The article's fragments; the body's "length" and "sha256" are
+        # added to ``draft`` as they pass, so the body is never joined.
+        digest = hashlib.sha256()
+        length = 0
+        for fragment in self.iter_article(plan, meta, time_labels):
+            digest.update(fragment.encode("utf-8"))
+            length += len(fragment)
+            yield fragment
+        draft["length"] = length
+        draft["sha256"] = digest.hexdigest()
+
+    def write_blog(
+        self,
+        plan: Dict[str, Any],
+        sink: TextIO,
+        memory: SessionMemory,
+        meta: Optional[Dict[str, Any]] = None,
+        time_labels: Optional[Tuple[List[str], List[str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Render the article fragment by fragment into any file-like ``sink``
+        without ever holding the full body as one string.
+
+        Returns the draft metadata; its "body" is None, "length" holds the
+        number of characters written and "sha256" the digest of their UTF-8.
+        """
+        self.logger.info("Generating blog content from plan.")
+        if meta is None:
+            meta = self.analyze(plan)
+
+        draft = self.build_draft(plan, meta, None)
+        with span("rendering") as s:
+            for fragment in self._measured(plan, meta, time_labels, draft):
+                sink.write(fragment)
+            s.add(bytes=draft["length"])
+
+        memory.set("last_draft", draft)
+        self.logger.info("Draft generated with length %d characters.", draft["length"])
+        return draft
+
+    def stream_blog(
+        self,
+        plan: Dict[str, Any],
+        memory: SessionMemory,
+        meta: Dict[str, Any],
+        time_labels: Optional[Tuple[List[str], List[str]]] = None,
+    ) -> Iterator[str]:
+        """
+        Yield the article fragments of iter_article, then store and return
+        the same draft metadata as write_blog (``draft = yield from ...``).
+        """
+        self.logger.info("Streaming blog content from plan.")
+        draft = self.build_draft(plan, meta, None)
+        yield from self._measured(plan, meta, time_labels, draft)
+
+        memory.set("last_draft", draft)
+        self.logger.info("Draft streamed with length %d characters.", draft["length"])
+        return draft
+
+    def generate_blog(
+        self,
+        plan: Dict[str, Any],
+        memory: SessionMemory,
+        meta: Optional[Dict[str, Any]] = None,
+        time_labels: Optional[Tuple[List[str], List[str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Render the full article into the draft's "body".
+
+        ``meta`` and ``time_labels`` may be passed in when already computed
+        (see MainAgent's stage pipeline); otherwise they are computed here.
+        """
+        content_hash = self._content_hash(plan)
+        if self.stage_cache is None or content_hash is None:
+            buffer = io.StringIO()
+            draft = self.write_blog(plan, buffer, memory, meta, time_labels)
+            draft["body"] = buffer.getvalue()
+            del draft["length"], draft["sha256"]
+            # Re-store so backends that copy values see the finished body.
+            memory.set("last_draft", draft)
+            return draft
+
+        # Memoized path: only a style or renderer change re-renders the body.
+        self.logger.info("Generating blog content from plan.")
+        if meta is None:
+            meta = self.analyze(plan)
+        key = stage_key("rendering", content_hash, meta, plan.get("style", {}), self.RENDER_VERSION)
+        with span("rendering") as s:
+            article_body = self.stage_cache.get_or_compute(
+                key, lambda: "".join(self.iter_article(plan, meta, time_labels)), span=s
+            )
+            s.add(bytes=len(article_body))
+
+        draft = self.build_draft(plan, meta, article_body)
 
         memory.set("last_draft", draft)
         self.logger.info("Draft generated with length %d characters.", len(article_body))
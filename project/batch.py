@@ -0,0 +1,289 @@
+"""
+Batch conversion of many YouTube URLs.
+
+Transcripts are fetched on a bounded thread pool with per-host rate
+limiting, the Planner → Worker → Evaluator stages run in a process pool,
+and every finished article is written out immediately together with a
+checkpoint line so an interrupted run can be resumed.
+
+Usage:
+    python -m project.batch urls.txt --output-dir articles/
+    cat urls.txt | python -m project.batch - --concurrency 16 --processes 4
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+from urllib.parse import urlparse
+
+from project.core.observability import get_logger
+from project.tools.tools import Transcript, TranscriptFetcher
+from project.tools.video_id import dedupe_urls, extract_video_id
+
+CHECKPOINT_FILENAME = "checkpoint.jsonl"
+
+# Every video ID is fetched from here, whatever form its URL was given in.
+UPSTREAM_HOST = "www.youtube.com"
+
+
+def read_urls(source: str) -> Iterator[str]:
+    """
+    Yield URLs from a file path, or from stdin when source is "-".
+
+    Blank lines and lines starting with "#" are skipped.
+    """
+    stream: TextIO = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests to the same upstream host to at most ``rate`` per second.
+
+    youtu.be, m.youtube.com, www.youtube.com links and bare video IDs are
+    all fetched from YouTube, so they share one bucket.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+        host = UPSTREAM_HOST if extract_video_id(url) else (urlparse(url).netloc or UPSTREAM_HOST)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _render_article(url: str, transcript: Transcript) -> str:
+    """
+    Run the CPU-bound agent stages for one pre-fetched transcript.
+
+    Executed inside pool worker processes, each of which reuses its own
+    shared MainAgent with a fresh SessionMemory per video.
+    """
+    from project.main_agent import get_agent
+    from project.memory.session_memory import SessionMemory
+
+    result = get_agent().handle_message(url, transcript=transcript, memory=SessionMemory())
+    return result["response"]
+
+
+class _InlineExecutor(Executor):
+    """
+    Executor that runs work in the calling thread; used when processes=0.
+    """
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def _process_context():
+    # The render pool starts while fetch threads are running; forking then can
+    # copy a lock another thread holds, so workers come from a clean process.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """
+    Return the video IDs already converted successfully according to a checkpoint file.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from a crash; the URL will simply be redone.
+                continue
+            if record.get("status") == "ok":
+                video_id = record.get("video_id") or extract_video_id(record["url"])
+                if video_id:
+                    done.add(video_id)
+    return done
+
+
+def run_batch(
+    urls: Iterable[str],
+    output_dir: str,
+    concurrency: int = 8,
+    processes: Optional[int] = None,
+    rate_limit: float = 5.0,
+    fetcher: Optional[TranscriptFetcher] = None,
+) -> Dict[str, Any]:
+    """
+    Convert many URLs into Markdown articles under ``output_dir``.
+
+    URLs pointing at a video already seen earlier in ``urls``, or already
+    converted according to the checkpoint (in whatever URL form), are skipped.
+
+    Args:
+        urls: YouTube URLs or video IDs
+        output_dir: Directory for ``<video_id>.md`` files and the checkpoint
+        concurrency: Maximum number of transcript fetches in flight
+        processes: Size of the process pool for agent stages (0 runs them inline)
+        rate_limit: Maximum fetches per second per host (0 disables the limit)
+        fetcher: TranscriptFetcher to use; defaults to a new one
+
+    Returns:
+        Summary with counts, elapsed seconds and throughput in videos per second
+    """
+    logger = get_logger("Batch")
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_FILENAME)
+    done = load_checkpoint(checkpoint_path)
+    fetcher = fetcher or TranscriptFetcher()
+    limiter = HostRateLimiter(rate_limit)
+
+    # Fetchers without a cache (or without cached_transcript) always go upstream.
+    cached_transcript = getattr(fetcher, "cached_transcript", None)
+
+    def fetch(url: str) -> Transcript:
+        # Cache hits never reach YouTube, so they skip the rate limit.
+        transcript = cached_transcript(url) if cached_transcript is not None else None
+        if transcript is not None:
+            return transcript
+        limiter.wait(url)
+        return fetcher.fetch_transcript(url)
+
+    stats = {"converted": 0, "failed": 0, "skipped": 0}
+
+    def not_done(deduped: Iterable[str]) -> Iterator[str]:
+        for url in deduped:
+            if extract_video_id(url) in done:
+                stats["skipped"] += 1
+            else:
+                yield url
+
+    pending_urls = not_done(dedupe_urls(urls))
+    started = time.perf_counter()
+
+    fetch_pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch")
+    render_pool: Executor = (
+        _InlineExecutor() if processes == 0 else ProcessPoolExecutor(max_workers=processes, mp_context=_process_context())
+    )
+    in_flight: Dict[Future, Tuple[str, str, Optional[str]]] = {}
+    # Every fetched transcript waiting for a render process is held in
+    # memory, so fetching pauses while this many renders are pending.
+    max_pending_renders = 2 * (processes or os.cpu_count() or 1)
+    counts = {"fetch": 0, "render": 0}
+    exhausted = False
+
+    def submit_fetches() -> None:
+        nonlocal exhausted
+        while not exhausted and counts["fetch"] < concurrency and counts["render"] < max_pending_renders:
+            url = next(pending_urls, None)
+            if url is None:
+                exhausted = True
+                return
+            in_flight[fetch_pool.submit(fetch, url)] = ("fetch", url, None)
+            counts["fetch"] += 1
+
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+
+        def record(url: str, video_id: Optional[str], status: str, detail: str) -> None:
+            key = "output" if status == "ok" else "error"
+            entry = {"url": url, "video_id": video_id, "status": status, key: detail}
+            checkpoint.write(json.dumps(entry) + "\n")
+            checkpoint.flush()
+            stats["converted" if status == "ok" else "failed"] += 1
+
+        try:
+            submit_fetches()
+            while in_flight:
+                finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, url, video_id = in_flight.pop(future)
+                    counts[stage] -= 1
+                    error = future.exception()
+
+                    if stage == "fetch":
+                        if error is not None:
+                            logger.warning("Fetch failed for %s: %s", url, error)
+                            record(url, None, "error", str(error))
+                            continue
+                        transcript: Transcript = future.result()
+                        render = render_pool.submit(_render_article, url, transcript)
+                        in_flight[render] = ("render", url, transcript.video_id)
+                        counts["render"] += 1
+                        continue
+
+                    if error is not None:
+                        logger.warning("Conversion failed for %s: %s", url, error)
+                        record(url, video_id, "error", str(error))
+                        continue
+
+                    path = os.path.join(output_dir, f"{video_id}.md")
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(future.result())
+                    record(url, video_id, "ok", path)
+                submit_fetches()
+        finally:
+            fetch_pool.shutdown(wait=True, cancel_futures=True)
+            render_pool.shutdown(wait=True, cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    processed = stats["converted"] + stats["failed"]
+    stats["elapsed_seconds"] = elapsed
+    stats["videos_per_second"] = processed / elapsed if elapsed > 0 else 0.0
+    logger.info(
+        "Batch finished: %d converted, %d failed, %d skipped in %.1fs (%.2f videos/s).",
+        stats["converted"], stats["failed"], stats["skipped"], elapsed, stats["videos_per_second"],
+    )
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert many YouTube videos into blog articles.")
+    parser.add_argument("source", help="File with one URL per line, or '-' for stdin")
+    parser.add_argument("-o", "--output-dir", default="articles", help="Where to write articles")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Concurrent transcript fetches")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="Processes for the agent stages (default: CPU count, 0 = inline)")
+    parser.add_argument("-r", "--rate-limit", type=float, default=5.0,
+                        help="Max fetches per second per host (0 = unlimited)")
+    args = parser.parse_args(argv)
+
+    stats = run_batch(
+        read_urls(args.source),
+        output_dir=args.output_dir,
+        concurrency=args.concurrency,
+        processes=args.processes,
+        rate_limit=args.rate_limit,
+    )
+    print(
+        f"Converted {stats['converted']}, failed {stats['failed']}, skipped {stats['skipped']} "
+        f"in {stats['elapsed_seconds']:.1f}s ({stats['videos_per_second']:.2f} videos/s)"
+    )
+    return 0 if stats["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Command-line entry point for converting one YouTube video into a blog article.
+
+Usage:
+    python -m project https://youtu.be/VIDEO_ID
+    python -m project https://youtu.be/VIDEO_ID -o article.md
+    python -m project                      (prompts for the URL, then offers to save)
+
+Only argparse is imported up front; the agents, and the transcript API
+with them, load once there is a video to convert, so --help and argument
+errors return immediately.
+"""
+import argparse
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+RULE = "=" * 60
+
+
+def default_filename() -> str:
+    return f"youtube_transcript_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+
+
+def save_article(article: str, filename: str) -> bool:
+    try:
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(article)
+    except OSError as e:
+        print(f"\n✗ Error saving file: {e}")
+        return False
+    print(f"\n✓ Transcript saved successfully to: {filename}")
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m project",
+        description="Convert a YouTube video into a blog article.",
+    )
+    parser.add_argument("url", nargs="?", help="YouTube URL or video ID (prompted for when omitted)")
+    parser.add_argument("-o", "--output", help="Also write the article to this file")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Print only the article")
+    args = parser.parse_args(argv)
+
+    interactive = args.url is None
+    if interactive:
+        print(RULE)
+        print("YouTube → Blog Article Converter")
+        print(RULE)
+        args.url = input("\nEnter YouTube URL: ").strip()
+        if not args.url:
+            print("Error: No URL provided. Exiting...")
+            return 1
+        print("\nProcessing your video...\n")
+
+    from project.main_agent import run_agent
+    from project.tools.fetch_resilience import TranscriptFetchError
+
+    try:
+        article = run_agent(args.url)
+    except TranscriptFetchError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.quiet:
+        print(article)
+    else:
+        print("\n" + RULE)
+        print("GENERATED BLOG ARTICLE")
+        print(RULE)
+        print(article)
+
+    if args.output:
+        return 0 if save_article(article, args.output) else 1
+    if interactive:
+        print("\n" + RULE)
+        save_choice = input("\nDo you want to save this transcript to a file? (yes/no): ").strip().lower()
+        if save_choice in ("yes", "y"):
+            save_article(article, default_filename())
+        else:
+            print("\n✓ File not saved. Thank you for using the YouTube → Blog Converter!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
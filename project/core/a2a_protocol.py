@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 
 @dataclass
@@ -14,11 +14,36 @@ class AgentMessage:
     meta: Optional[Dict[str, Any]] = None
 
 
+Handler = Callable[[AgentMessage], Any]
+
+
 class A2AProtocol:
     """
-    Simple helper to build messages between agents.
+    Simple helper to build messages between agents, and to route them to
+    the handler registered for their receiver and task.
     """
 
+    def __init__(self) -> None:
+        self._routes: Dict[Tuple[str, str], Handler] = {}
+
+    def register(self, receiver: str, task: str, handler: Handler) -> None:
+        """
+        Handle messages sent to ``receiver`` for ``task`` with ``handler``.
+        """
+        self._routes[(receiver, task)] = handler
+
+    def route(self, receiver: str, task: str) -> Handler:
+        try:
+            return self._routes[(receiver, task)]
+        except KeyError:
+            raise LookupError(f"No handler registered for {receiver}/{task}") from None
+
+    def dispatch(self, message: AgentMessage) -> Any:
+        """
+        Deliver ``message`` to its handler and return the handler's result.
+        """
+        return self.route(message.receiver, message.task)(message)
+
     def build_message(
         self,
         sender: str,
@@ -1,34 +1,229 @@
-from typing import List
+import math
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from project.tools.text_analysis import TextAnalysis
+
+# Bump when chunk_text / chunk_transcript output changes so memoized sections are recomputed.
+CHUNKER_VERSION = "2"
+
+# Gap between two segments, in seconds, treated as a pause worth cutting on.
+PAUSE_SECONDS = 1.5
+
+_SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]*$")
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def approx_tokens(text: str) -> int:
+    """
+    Cheap token estimate (about four characters per token for English).
+    """
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class Chunk:
+    """
+    A run of consecutive transcript segments ``[first, last)`` and its time range.
+    """
+    text: str
+    start: float
+    end: float
+    first: int
+    last: int
+
+
+def chunk_transcript(
+    transcript,
+    max_chars: int = 1000,
+    max_tokens: Optional[int] = None,
+    overlap: int = 0,
+    pause_seconds: float = PAUSE_SECONDS,
+    count_tokens: Callable[[str], int] = approx_tokens,
+) -> List[Chunk]:
+    """
+    Pack timestamped segments into chunks within a character or token budget.
+
+    Segments are never split. Chunks prefer to end where a segment closes
+    a sentence or is followed by a pause of ``pause_seconds`` or more; when
+    no such boundary lies in the second half of the chunk it is cut at the
+    budget. ``overlap`` repeats up to that many trailing segments of each
+    chunk at the start of the next one (for LLM context; keep it 0 when the
+    chunks must partition the text).
+
+    Runs in linear time: every segment is measured once, and chunk text is
+    taken as a slice of the transcript buffer (or joined once per chunk for
+    plain segment lists).
+    """
+    if hasattr(transcript, "columns"):
+        starts, durations, _, _ = transcript.columns()
+        count = len(transcript)
+        segment_text = transcript.segment_text
+
+        def text_of(first: int, last: int) -> str:
+            return transcript[first:last].text
+    else:
+        segments = list(transcript)
+        starts = [s["start"] for s in segments]
+        durations = [s["duration"] for s in segments]
+        count = len(segments)
+
+        def segment_text(i: int) -> str:
+            return segments[i]["text"]
+
+        def text_of(first: int, last: int) -> str:
+            return " ".join(segments[i]["text"] for i in range(first, last))
+
+    if not count:
+        return []
+
+    # Both budgets become a per-segment cost; characters also count the joining space.
+    if max_tokens is None:
+        limit = max_chars + 1
+        costs = [len(segment_text(i)) + 1 for i in range(count)]
+    else:
+        limit = max_tokens
+        costs = [count_tokens(segment_text(i)) for i in range(count)]
+
+    def is_boundary(i: int) -> bool:
+        # Whether a chunk may end after segment i.
+        if i + 1 >= count:
+            return True
+        gap = starts[i + 1] - (starts[i] + durations[i])
+        return gap >= pause_seconds or _SENTENCE_END_RE.search(segment_text(i)) is not None
+
+    chunks: List[Chunk] = []
+
+    def emit(first: int, last: int) -> None:
+        end = starts[last - 1] + durations[last - 1]
+        chunks.append(Chunk(text_of(first, last), starts[first], end, first, last))
+
+    first = 0
+    size = 0
+    last_boundary = -1
+    for i in range(count):
+        if i > first and size + costs[i] > limit:
+            # Prefer the last sentence/pause boundary if it keeps at least half the chunk.
+            cut = i
+            if last_boundary >= first and 2 * (last_boundary + 1 - first) > i - first:
+                cut = last_boundary + 1
+            emit(first, cut)
+
+            # Carry overlap segments, but only while they leave room for new ones.
+            first = cut
+            carried = 0
+            while (
+                overlap and cut - first < overlap and first - 1 > chunks[-1].first
+                and carried + costs[first - 1] + costs[i] <= limit // 2
+            ):
+                first -= 1
+                carried += costs[first]
+            size = sum(costs[first:i])
+            last_boundary = -1
+            for j in range(cut, i):
+                if is_boundary(j):
+                    last_boundary = j
+        size += costs[i]
+        if is_boundary(i):
+            last_boundary = i
+    if first < count:
+        emit(first, count)
+    return chunks
 
 
 def chunk_text(text: str, max_chars: int = 1000) -> List[str]:
     """
-    Naive text chunker that splits on paragraphs and respects a max character budget.
+    Split plain text into chunks of at most ``max_chars`` characters,
+    cutting on sentence and line boundaries.
+
+    A sentence longer than the budget is split on whitespace. Linear in
+    the length of ``text``.
     """
     if not text:
         return []
 
-    paragraphs = [p.strip() for p in text.split("\n") if p.strip()]
     chunks: List[str] = []
-    current = ""
+    parts: List[str] = []
+    size = 0
 
-    for para in paragraphs:
-        if not current:
-            current = para
-        elif len(current) + len(para) + 1 <= max_chars:
-            current = current + "\n" + para
-        else:
-            chunks.append(current)
-            current = para
+    def flush() -> None:
+        nonlocal parts, size
+        if parts:
+            chunks.append(" ".join(parts))
+            parts = []
+            size = 0
 
-    if current:
-        chunks.append(current)
+    position = 0
+    pieces = []
+    for match in _SENTENCE_BREAK_RE.finditer(text):
+        pieces.append(text[position:match.start()])
+        position = match.end()
+    pieces.append(text[position:])
 
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        if len(piece) > max_chars:
+            flush()
+            words = piece.split()
+            for word in words:
+                if parts and size + 1 + len(word) > max_chars:
+                    flush()
+                parts.append(word)
+                size += len(word) + (1 if len(parts) > 1 else 0)
+            flush()
+            continue
+        if parts and size + 1 + len(piece) > max_chars:
+            flush()
+        parts.append(piece)
+        size += len(piece) + (1 if len(parts) > 1 else 0)
+    flush()
     return chunks
 
 
-def compact_context(chunks: List[str], max_chunks: int = 3) -> str:
+def _chunk_terms(chunk: Union[str, Chunk]) -> Tuple[str, Dict[str, int]]:
+    text = chunk.text if isinstance(chunk, Chunk) else chunk
+    return text, TextAnalysis(text).term_counts
+
+
+def rank_chunks(chunks: Sequence[Union[str, Chunk]]) -> List[float]:
+    """
+    Importance score per chunk: TF-IDF weight of its terms, normalized by length.
+
+    Terms spread evenly across every chunk (filler) score zero; chunks that
+    concentrate distinctive, frequently used terms score highest.
+    """
+    analyzed = [_chunk_terms(chunk) for chunk in chunks]
+    document_frequency: Dict[str, int] = {}
+    for _, terms in analyzed:
+        for term in terms:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+
+    n = len(analyzed)
+    scores = []
+    for text, terms in analyzed:
+        weight = sum(
+            (1.0 + math.log(count)) * math.log(n / document_frequency[term])
+            for term, count in terms.items()
+        )
+        scores.append(weight / math.sqrt(max(1, len(text))))
+    return scores
+
+
+def compact_context(chunks: Sequence[Union[str, Chunk]], max_chunks: int = 3) -> str:
     """
-    Simple context compaction: keep first N chunks.
+    Keep the ``max_chunks`` most important chunks (see rank_chunks), in their
+    original order so the compacted context still reads chronologically.
     """
-    return "\n\n".join(chunks[:max_chunks])
+    if len(chunks) <= max_chunks:
+        selected = range(len(chunks))
+    else:
+        scores = rank_chunks(chunks)
+        # Stable on ties: earlier chunks win.
+        best = sorted(range(len(chunks)), key=lambda i: (-scores[i], i))[:max_chunks]
+        selected = sorted(best)
+    return "\n\n".join(
+        chunks[i].text if isinstance(chunks[i], Chunk) else chunks[i] for i in selected
+    )
@@ -1,16 +1,41 @@
+import json
 import logging
-from typing import Optional
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+LOG_MODE_ENV = "LOG_MODE"
+LOG_FORMAT_ENV = "LOG_FORMAT"
+LOG_QUEUE_SIZE_ENV = "LOG_QUEUE_SIZE"
 
 _LOGGER_INITIALIZED = False
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+_listener = None
+_ATEXIT_REGISTERED = False
 
 
 def _init_logging() -> None:
     global _LOGGER_INITIALIZED
     if not _LOGGER_INITIALIZED:
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        )
+        mode = os.environ.get(LOG_MODE_ENV, "sync").lower()
+        fmt = os.environ.get(LOG_FORMAT_ENV, "text").lower()
+        if mode == "async" or fmt == "json":
+            configure_logging(
+                async_mode=(mode == "async"),
+                json_format=(fmt == "json"),
+                queue_size=int(os.environ.get(LOG_QUEUE_SIZE_ENV, "10000")),
+            )
+        else:
+            logging.basicConfig(
+                level=logging.INFO,
+                format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+            )
         _LOGGER_INITIALIZED = True
 
 
@@ -20,3 +45,512 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     _init_logging()
     return logging.getLogger(name or "project")
+
+
+@contextmanager
+def bind_correlation_id(correlation_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Tag every log record emitted in this context with a request ID.
+
+    Without an explicit ID, an already-bound one is kept (so nested calls
+    share the outer request's ID) or a new one is generated.
+    """
+    current = _correlation_id.get()
+    if correlation_id is None and current is not None:
+        yield current
+        return
+    token = _correlation_id.set(correlation_id or uuid.uuid4().hex)
+    try:
+        yield _correlation_id.get()
+    finally:
+        _correlation_id.reset(token)
+
+
+class _CorrelationFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = _correlation_id.get() or "-"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "correlation_id": getattr(record, "correlation_id", "-"),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _make_queue_handler(log_queue, high_watermark: float, sample_every: int):
+    from logging.handlers import QueueHandler
+    import queue
+
+    class SheddingQueueHandler(QueueHandler):
+        """
+        QueueHandler that never blocks the request path on DEBUG/INFO.
+
+        Above ``high_watermark`` of the queue's capacity only every
+        ``sample_every``-th DEBUG/INFO record is kept; when the queue is full
+        they are dropped. WARNING and above wait briefly for space.
+        """
+
+        def __init__(self) -> None:
+            super().__init__(log_queue)
+            self.dropped = 0
+            self._seen = 0
+            self._threshold = int(log_queue.maxsize * high_watermark) if log_queue.maxsize else 0
+
+        def emit(self, record: logging.LogRecord) -> None:
+            # Decide before prepare(), which formats the message and any
+            # traceback, so shed records cost next to nothing.
+            if record.levelno < logging.WARNING and self._shed():
+                self.dropped += 1
+                return
+            super().emit(record)
+
+        def _shed(self) -> bool:
+            if self.queue.full():
+                return True
+            if self._threshold and self.queue.qsize() >= self._threshold:
+                self._seen += 1
+                return bool(self._seen % sample_every)
+            return False
+
+        def enqueue(self, record: logging.LogRecord) -> None:
+            try:
+                if record.levelno >= logging.WARNING:
+                    self.queue.put(record, timeout=0.1)
+                else:
+                    # Another thread may have filled the queue since _shed().
+                    self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    return SheddingQueueHandler()
+
+
+def configure_logging(
+    async_mode: bool = True,
+    json_format: bool = False,
+    queue_size: int = 10000,
+    level: int = logging.INFO,
+    stream=None,
+    high_watermark: float = 0.75,
+    sample_every: int = 10,
+) -> None:
+    """
+    (Re)configure the root logger.
+
+    In async mode records go through a bounded queue to a QueueListener
+    thread that does the formatting and writing, so request threads never
+    wait on stderr. Every record carries the current correlation ID.
+    """
+    global _LOGGER_INITIALIZED, _ATEXIT_REGISTERED, _listener
+    shutdown_logging()
+
+    if json_format:
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s [%(levelname)s] %(name)s [%(correlation_id)s]: %(message)s"
+        )
+    output = logging.StreamHandler(stream)
+    output.setFormatter(formatter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    if async_mode:
+        from logging.handlers import QueueListener
+        import atexit
+        import queue
+
+        log_queue = queue.Queue(maxsize=queue_size)
+        handler = _make_queue_handler(log_queue, high_watermark, sample_every)
+        _listener = QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        if not _ATEXIT_REGISTERED:
+            atexit.register(shutdown_logging)
+            _ATEXIT_REGISTERED = True
+    else:
+        handler = output
+    handler.addFilter(_CorrelationFilter())
+    root.addHandler(handler)
+    _LOGGER_INITIALIZED = True
+
+
+def dropped_log_records() -> int:
+    """
+    Records shed by the async queue handler since it was configured.
+    """
+    return sum(getattr(h, "dropped", 0) for h in logging.getLogger().handlers)
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the async listener, flushing queued records.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# ---------------------------------------------------------------------------
+# Tracing and per-stage metrics
+# ---------------------------------------------------------------------------
+
+TRACE_ENABLED_ENV = "TRACE_ENABLED"
+TRACE_JSONL_ENV = "TRACE_JSONL_PATH"
+TRACE_SLOW_ENV = "TRACE_PROFILE_SLOW_SECONDS"
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+
+class _NoopSpan:
+    """
+    Returned by span() when no trace is active; every operation is a no-op.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def add(self, bytes: int = 0, cache_hits: int = 0) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """
+    One timed stage inside a trace: wall and CPU time, bytes processed and cache hits.
+    """
+
+    __slots__ = ("trace", "name", "bytes", "cache_hits", "wall", "cpu", "_wall0", "_cpu0")
+
+    def __init__(self, trace: "Trace", name: str) -> None:
+        self.trace = trace
+        self.name = name
+        self.bytes = 0
+        self.cache_hits = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def __enter__(self) -> "Span":
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.wall = time.perf_counter() - self._wall0
+        self.cpu = time.thread_time() - self._cpu0
+        self.trace.spans.append(self)
+
+    def add(self, bytes: int = 0, cache_hits: int = 0) -> None:
+        self.bytes += bytes
+        self.cache_hits += cache_hits
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.name,
+            "wall_seconds": self.wall,
+            "cpu_seconds": self.cpu,
+            "bytes": self.bytes,
+            "cache_hits": self.cache_hits,
+        }
+
+
+class Trace:
+    """
+    All spans recorded while handling one request.
+    """
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: Optional[str] = None) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self.wall = 0.0
+        self.profile: Optional[List[Tuple[str, int]]] = None
+        self._samples: Optional[Counter] = None
+
+    def meta(self) -> Dict[str, Any]:
+        """
+        Trace context to carry in AgentMessage.meta.
+        """
+        return {"trace_id": self.trace_id}
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "wall_seconds": self.wall,
+            "spans": [s.to_dict() for s in self.spans],
+        }
+        if self.profile is not None:
+            record["profile"] = [{"stack": stack, "samples": n} for stack, n in self.profile]
+        return record
+
+
+class SamplingProfiler:
+    """
+    Background sampler of the call stacks of threads that are handling traced requests.
+
+    Each profiled trace owns one Counter of stacks; the thread that opened
+    the trace and any thread running work for it (see profiled_thread)
+    add their samples to it. Samples are only attached to a trace that
+    turns out to be slow; fast requests discard theirs.
+    """
+
+    def __init__(self, interval: float = 0.005, depth: int = 12) -> None:
+        self.interval = interval
+        self.depth = depth
+        self._lock = threading.Lock()
+        self._watched: Dict[int, List[Counter]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            # Sampled under the lock so no Counter changes after unwatch().
+            with self._lock:
+                if not self._watched:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, counters in self._watched.items():
+                    frame = frames.get(thread_id)
+                    stack = []
+                    while frame is not None and len(stack) < self.depth:
+                        code = frame.f_code
+                        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                        frame = frame.f_back
+                    if stack:
+                        key = ";".join(reversed(stack))
+                        for counter in counters:
+                            counter[key] += 1
+
+    def watch(self, thread_id: int, samples: Counter) -> None:
+        """
+        Count the stacks of ``thread_id`` into ``samples`` until unwatch().
+        """
+        with self._lock:
+            self._watched.setdefault(thread_id, []).append(samples)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-profiler", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, thread_id: int, samples: Counter) -> None:
+        with self._lock:
+            counters = [c for c in self._watched.get(thread_id, ()) if c is not samples]
+            if counters:
+                self._watched[thread_id] = counters
+            else:
+                self._watched.pop(thread_id, None)
+
+
+@contextmanager
+def profiled_thread() -> Iterator[None]:
+    """
+    Sample the calling thread into the current trace's profile while the
+    block runs, if that trace is being profiled.
+
+    For threads that run work on behalf of a trace whose context they
+    copied, e.g. the StageScheduler's pool threads.
+    """
+    trace = _current_trace.get()
+    profiler = trace.tracer.profiler if trace is not None else None
+    if profiler is None or trace._samples is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    profiler.watch(thread_id, trace._samples)
+    try:
+        yield
+    finally:
+        profiler.unwatch(thread_id, trace._samples)
+
+
+class Tracer:
+    """
+    Collects traces, aggregates per-stage metrics and exports them.
+
+    Disabled by default; span() then costs one ContextVar lookup.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.jsonl_path: Optional[str] = None
+        self.slow_seconds: Optional[float] = None
+        self.slow_hook: Optional[Callable[[Trace], None]] = None
+        self.profiler: Optional[SamplingProfiler] = None
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List[float]] = {}
+        self._requests = 0
+
+    def configure(
+        self,
+        enabled: bool = True,
+        jsonl_path: Optional[str] = None,
+        slow_seconds: Optional[float] = None,
+        slow_hook: Optional[Callable[[Trace], None]] = None,
+        profile_slow: bool = False,
+    ) -> None:
+        """
+        Turn tracing on or off.
+
+        Args:
+            enabled: Record traces at all
+            jsonl_path: Append one JSON line per finished trace to this file
+            slow_seconds: Requests at least this slow are handed to ``slow_hook``
+                and, with ``profile_slow``, get sampled stacks attached
+            slow_hook: Called with each slow Trace
+            profile_slow: Run the sampling profiler while requests are in flight
+        """
+        self.enabled = enabled
+        self.jsonl_path = jsonl_path
+        self.slow_seconds = slow_seconds
+        self.slow_hook = slow_hook
+        self.profiler = SamplingProfiler() if (enabled and profile_slow and slow_seconds is not None) else None
+
+    @contextmanager
+    def trace(self, name: str, meta: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Trace]]:
+        """
+        Record spans for one request; yields None when tracing is disabled.
+
+        Passing the ``meta`` of an incoming AgentMessage continues its trace ID,
+        e.g. when a request hops into a worker process.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        trace = Trace(self, name, (meta or {}).get("trace_id"))
+        token = _current_trace.set(trace)
+        thread_id = threading.get_ident()
+        profiler = self.profiler
+        if profiler is not None:
+            trace._samples = Counter()
+            profiler.watch(thread_id, trace._samples)
+        started = time.perf_counter()
+        try:
+            yield trace
+        finally:
+            trace.wall = time.perf_counter() - started
+            _current_trace.reset(token)
+            samples = None
+            if profiler is not None:
+                profiler.unwatch(thread_id, trace._samples)
+                samples = trace._samples
+            slow = self.slow_seconds is not None and trace.wall >= self.slow_seconds
+            if slow and samples:
+                trace.profile = samples.most_common(20)
+            self._finish(trace, slow)
+
+    def _finish(self, trace: Trace, slow: bool) -> None:
+        with self._lock:
+            self._requests += 1
+            for s in trace.spans:
+                totals = self._stages.setdefault(s.name, [0, 0.0, 0.0, 0, 0])
+                totals[0] += 1
+                totals[1] += s.wall
+                totals[2] += s.cpu
+                totals[3] += s.bytes
+                totals[4] += s.cache_hits
+            if self.jsonl_path:
+                with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(trace.to_dict()) + "\n")
+        if slow and self.slow_hook is not None:
+            self.slow_hook(trace)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._requests = 0
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                stage: {
+                    "count": t[0],
+                    "wall_seconds": t[1],
+                    "cpu_seconds": t[2],
+                    "bytes": t[3],
+                    "cache_hits": t[4],
+                }
+                for stage, t in self._stages.items()
+            }
+
+    def prometheus(self) -> str:
+        """
+        Per-stage metrics in the Prometheus text exposition format.
+        """
+        stages = self.snapshot()
+        with self._lock:
+            requests = self._requests
+        lines = [
+            "# HELP yt_blog_requests_traced_total Requests recorded by the tracer.",
+            "# TYPE yt_blog_requests_traced_total counter",
+            f"yt_blog_requests_traced_total {requests}",
+        ]
+        metrics = (
+            ("stage_calls_total", "count", "Number of times the stage ran."),
+            ("stage_wall_seconds_total", "wall_seconds", "Wall-clock time spent in the stage."),
+            ("stage_cpu_seconds_total", "cpu_seconds", "CPU time spent in the stage."),
+            ("stage_bytes_total", "bytes", "Size of the text processed by the stage, in characters."),
+            ("stage_cache_hits_total", "cache_hits", "Cache hits recorded by the stage."),
+        )
+        for metric, key, help_text in metrics:
+            lines.append(f"# HELP yt_blog_{metric} {help_text}")
+            lines.append(f"# TYPE yt_blog_{metric} counter")
+            for stage, values in sorted(stages.items()):
+                lines.append(f'yt_blog_{metric}{{stage="{stage}"}} {values[key]}')
+        return "\n".join(lines) + "\n"
+
+
+_tracer = Tracer()
+if os.environ.get(TRACE_ENABLED_ENV, "").lower() in ("1", "true", "yes"):
+    _slow = os.environ.get(TRACE_SLOW_ENV)
+    _tracer.configure(
+        jsonl_path=os.environ.get(TRACE_JSONL_ENV) or None,
+        slow_seconds=float(_slow) if _slow else None,
+        profile_slow=bool(_slow),
+    )
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def span(name: str):
+    """
+    Time a stage of the current request.
+
+    Usage:
+        with span("summarization") as s:
+            s.add(bytes=len(text))
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return Span(trace, name)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
@@ -0,0 +1,281 @@
+"""
+Dependency-aware stage scheduler on top of A2AProtocol.
+
+Each Stage names the receiver and task its messages are routed to and
+declares the values it reads and writes. The scheduler runs every stage
+as soon as its inputs exist, independent stages concurrently, and sends
+each one an AgentMessage whose payload holds exactly its inputs.
+"""
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from project.core.a2a_protocol import A2AProtocol, AgentMessage, Handler
+from project.core.observability import get_logger, profiled_thread
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of a pipeline: the ``receiver``/``task`` route that handles it,
+    the values it needs and the values its handler returns (as a dict).
+    """
+    name: str
+    receiver: str
+    task: str
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+
+
+@dataclass
+class ScheduleRun:
+    """
+    Outcome of one run: produced values, per-stage timings, and the failed
+    and cancelled stages if an upstream stage raised.
+    """
+    values: Dict[str, Any]
+    timings: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    dependencies: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    wall: float = 0.0
+    failed: Optional[str] = None
+    error: Optional[BaseException] = None
+    cancelled: List[str] = field(default_factory=list)
+
+    def raise_for_error(self) -> None:
+        """
+        Re-raise the failed stage's exception, if any.
+        """
+        if self.error is not None:
+            raise self.error
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """
+        The chain of dependent stages with the largest total run time, and that time.
+
+        It bounds the request latency however many workers are available.
+        """
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        # Timings are recorded in completion order, which is a topological order.
+        for name, (start, end) in sorted(self.timings.items(), key=lambda item: item[1][1]):
+            ran = [dep for dep in self.dependencies.get(name, ()) if dep in finish]
+            before = max(ran, key=lambda dep: finish[dep]) if ran else None
+            finish[name] = (end - start) + (finish[before] if before else 0.0)
+            previous[name] = before
+        if not finish:
+            return [], 0.0
+        last: Optional[str] = max(finish, key=lambda name: finish[name])
+        total = finish[last]
+        path = []
+        while last is not None:
+            path.append(last)
+            last = previous[last]
+        return path[::-1], total
+
+    def to_dict(self) -> Dict[str, Any]:
+        path, seconds = self.critical_path()
+        return {
+            "wall_seconds": self.wall,
+            "critical_path": path,
+            "critical_path_seconds": seconds,
+            "stages": {name: end - start for name, (start, end) in self.timings.items()},
+            "failed": self.failed,
+            "cancelled": list(self.cancelled),
+        }
+
+
+def _run_stage(handler: Handler, message: AgentMessage) -> Tuple[Any, float, float]:
+    # Module level so it can be shipped to a process pool with its arguments.
+    started = time.perf_counter()
+    result = handler(message)
+    return result, started, time.perf_counter()
+
+
+def _run_pooled_stage(handler: Handler, message: AgentMessage) -> Tuple[Any, float, float]:
+    # Runs in the caller's copied context: the pool thread joins its trace's profile.
+    with profiled_thread():
+        return _run_stage(handler, message)
+
+
+class StageScheduler:
+    """
+    Runs a DAG of stages whose handlers are registered on an A2AProtocol.
+
+    Stages run on ``executor``, by default a thread pool of ``max_workers``
+    created on first use; with threads every stage sees the caller's
+    context (correlation ID, trace), and the calling thread runs one of the
+    ready stages itself. A ProcessPoolExecutor also works when
+    the handlers and values are picklable. When a stage raises, the stages
+    that depend on it, directly or not, are never started; independent
+    stages still finish. Stage order within a run is otherwise unspecified.
+    """
+
+    def __init__(
+        self,
+        protocol: A2AProtocol,
+        stages: Sequence[Stage],
+        executor: Optional[Executor] = None,
+        max_workers: int = 4,
+    ) -> None:
+        self.logger = get_logger("StageScheduler")
+        self.protocol = protocol
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        self.max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._executor_lock = threading.Lock()
+
+        self._producers: Dict[str, str] = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in self._producers:
+                    raise ValueError(f"{output!r} is produced by both {self._producers[output]} and {stage.name}")
+                self._producers[output] = stage.name
+        self.dependencies: Dict[str, Tuple[str, ...]] = {
+            stage.name: tuple(dict.fromkeys(
+                self._producers[name] for name in stage.inputs if name in self._producers
+            ))
+            for stage in stages
+        }
+        self.dependents: Dict[str, List[str]] = {name: [] for name in self.stages}
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                self.dependents[dep].append(name)
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        remaining = {name: len(deps) for name, deps in self.dependencies.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        seen = 0
+        while ready:
+            name = ready.pop()
+            seen += 1
+            for dependent in self.dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if seen != len(self.stages):
+            cycle = sorted(name for name, count in remaining.items() if count)
+            raise ValueError(f"Stages form a cycle: {', '.join(cycle)}")
+
+    @property
+    def executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage")
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._owns_executor and self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _downstream(self, name: str) -> Set[str]:
+        found: Set[str] = set()
+        stack = list(self.dependents[name])
+        while stack:
+            dependent = stack.pop()
+            if dependent not in found:
+                found.add(dependent)
+                stack.extend(self.dependents[dependent])
+        return found
+
+    def _message(self, stage: Stage, values: Dict[str, Any], meta: Optional[Dict[str, Any]]) -> AgentMessage:
+        deps = self.dependencies[stage.name]
+        return self.protocol.build_message(
+            sender=self.stages[deps[0]].receiver if deps else "user",
+            receiver=stage.receiver,
+            task=stage.task,
+            payload={name: values[name] for name in stage.inputs},
+            meta=meta,
+        )
+
+    def run(self, inputs: Dict[str, Any], meta: Optional[Dict[str, Any]] = None) -> ScheduleRun:
+        """
+        Run every stage once, starting from ``inputs``.
+
+        Returns a ScheduleRun; call raise_for_error() on it to propagate a
+        stage failure.
+        """
+        missing = sorted({
+            name for stage in self.stages.values() for name in stage.inputs
+            if name not in self._producers and name not in inputs
+        })
+        if missing:
+            raise ValueError(f"Missing scheduler inputs: {', '.join(missing)}")
+
+        started = time.perf_counter()
+        executor = self.executor
+        # With threads, one ready stage runs on the calling thread (which
+        # would only wait otherwise), so a chain of stages costs no hand-offs.
+        caller_runs = isinstance(executor, ThreadPoolExecutor)
+        run = ScheduleRun(values=dict(inputs), dependencies=self.dependencies)
+        waiting = {name: len(deps) for name, deps in self.dependencies.items()}
+        running: Dict[Future, str] = {}
+        inline: List[str] = []
+
+        def start_ready(names: Sequence[str]) -> None:
+            ready = [name for name in names if waiting.get(name) == 0]
+            for name in ready:
+                del waiting[name]
+            if caller_runs and ready:
+                inline.append(ready.pop(0))
+            for name in ready:
+                stage = self.stages[name]
+                handler = self.protocol.route(stage.receiver, stage.task)
+                message = self._message(stage, run.values, meta)
+                if caller_runs:
+                    # A fresh copy per stage: one Context can't be entered by two threads at once.
+                    future = executor.submit(contextvars.copy_context().run, _run_pooled_stage, handler, message)
+                else:
+                    future = executor.submit(_run_stage, handler, message)
+                running[future] = name
+
+        def fail(name: str, error: Exception) -> None:
+            cancelled = sorted(self._downstream(name) & set(waiting))
+            for dependent in cancelled:
+                del waiting[dependent]
+            run.cancelled.extend(cancelled)
+            if run.error is None:
+                run.failed, run.error = name, error
+            self.logger.warning(
+                "Stage %s failed (%s); cancelled %s.", name, error, ", ".join(cancelled) or "nothing"
+            )
+
+        def finish(name: str, outcome: Callable[[], Tuple[Any, float, float]]) -> None:
+            try:
+                result, stage_start, stage_end = outcome()
+            except Exception as e:
+                fail(name, e)
+                return
+            absent = [output for output in self.stages[name].outputs if output not in result]
+            if absent:
+                fail(name, ValueError(f"Stage {name} did not return {', '.join(absent)}"))
+                return
+            run.values.update((output, result[output]) for output in self.stages[name].outputs)
+            run.timings[name] = (stage_start, stage_end)
+            for dependent in self.dependents[name]:
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+            start_ready(self.dependents[name])
+
+        start_ready(list(waiting))
+        while running or inline:
+            if inline:
+                name = inline.pop()
+                stage = self.stages[name]
+                handler = self.protocol.route(stage.receiver, stage.task)
+                message = self._message(stage, run.values, meta)
+                finish(name, lambda: _run_stage(handler, message))
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(running.pop(future), future.result)
+        run.wall = time.perf_counter() - started
+        return run
@@ -1,80 +1,210 @@
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Iterator, Optional
 
 from project.agents.planner import Planner
 from project.agents.worker import Worker
 from project.agents.evaluator import Evaluator
 from project.memory.session_memory import SessionMemory
-from project.core.observability import get_logger
+from project.memory.stage_cache import StageCache
+from project.core.observability import bind_correlation_id, get_logger, get_tracer, span
 from project.core.a2a_protocol import A2AProtocol, AgentMessage
+from project.core.scheduler import Stage, StageScheduler
+from project.tools.search_index import TranscriptSearchIndex
+from project.tools.tools import Transcript
+
+
+# Agent steps of one request. Timestamp labels only need the plan, so they
+# are computed while the Worker analyzes the transcript.
+PIPELINE = (
+    Stage("planning", "planner", "plan_youtube_to_blog", ("user_input", "transcript", "memory"), ("plan",)),
+    Stage("analysis", "worker", "analyze_transcript", ("plan",), ("meta",)),
+    Stage("time_labels", "worker", "label_timestamps", ("plan",), ("time_labels",)),
+    Stage("drafting", "worker", "generate_blog", ("plan", "meta", "time_labels", "memory"), ("draft",)),
+    Stage("evaluation", "evaluator", "evaluate_blog", ("draft", "plan", "memory"), ("evaluation",)),
+)
+
+# stream_message runs the stages up to drafting and renders the draft itself.
+STREAM_PIPELINE = tuple(stage for stage in PIPELINE if stage.name in ("planning", "analysis", "time_labels"))
 
 
 class MainAgent:
     """
     Orchestrates Planner → Worker → Evaluator for the YouTube → Blog Article Converter.
+
+    handle_message runs PIPELINE on a StageScheduler: every step is an
+    AgentMessage routed to the agent method registered for its receiver and
+    task, and steps whose inputs are ready run concurrently.
     """
 
     def __init__(self) -> None:
         self.logger = get_logger("MainAgent")
-        self.memory = SessionMemory()
-        self.planner = Planner()
-        self.worker = Worker()
+        self.memory = SessionMemory.from_env()
+        self.stage_cache = StageCache()
+        self.planner = Planner(stage_cache=self.stage_cache)
+        self.worker = Worker(stage_cache=self.stage_cache)
         self.evaluator = Evaluator()
+        self.search_index = TranscriptSearchIndex.from_env()
         self.protocol = A2AProtocol()
+        self._register_routes()
+        self.scheduler = StageScheduler(self.protocol, PIPELINE)
+        self.stream_scheduler = StageScheduler(self.protocol, STREAM_PIPELINE)
+
+    def _register_routes(self) -> None:
+        def plan(message: AgentMessage) -> Dict[str, Any]:
+            payload = message.payload
+            return {"plan": self.planner.create_plan(
+                user_input=payload["user_input"],
+                memory=payload["memory"],
+                transcript_data=payload["transcript"],
+            )}
+
+        def analyze(message: AgentMessage) -> Dict[str, Any]:
+            return {"meta": self.worker.analyze(message.payload["plan"])}
+
+        def label(message: AgentMessage) -> Dict[str, Any]:
+            return {"time_labels": self.worker.time_labels(message.payload["plan"])}
+
+        def draft(message: AgentMessage) -> Dict[str, Any]:
+            payload = message.payload
+            return {"draft": self.worker.generate_blog(
+                plan=payload["plan"],
+                memory=payload["memory"],
+                meta=payload["meta"],
+                time_labels=payload["time_labels"],
+            )}
+
+        def evaluate(message: AgentMessage) -> Dict[str, Any]:
+            payload = message.payload
+            return {"evaluation": self.evaluator.evaluate(
+                draft=payload["draft"],
+                plan=payload["plan"],
+                memory=payload["memory"],
+            )}
+
+        self.protocol.register("planner", "plan_youtube_to_blog", plan)
+        self.protocol.register("worker", "analyze_transcript", analyze)
+        self.protocol.register("worker", "label_timestamps", label)
+        self.protocol.register("worker", "generate_blog", draft)
+        self.protocol.register("evaluator", "evaluate_blog", evaluate)
+
+    def _index_transcript(self, plan: Dict[str, Any]) -> None:
+        # Keep the timestamped segments searchable once the article is done.
+        # A failure here must not fail the finished article.
+        if self.search_index is not None:
+            video_id = plan["transcript_data"].video_id
+            try:
+                with span("search_indexing") as s:
+                    self.search_index.add(video_id, plan["timestamped_transcript"])
+                    s.add(bytes=len(plan["transcript"]))
+            except Exception:
+                self.logger.warning("Could not index transcript of %s.", video_id, exc_info=True)
+
+    def handle_message(
+        self,
+        user_input: str,
+        transcript: Optional[Transcript] = None,
+        memory: Optional[SessionMemory] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run one request through the agents.
+
+        Without ``memory`` the request gets a fresh SessionMemory, so a shared
+        agent never carries state from one request into another. Pass
+        ``self.memory`` (configured by SESSION_MEMORY_*) to keep a session.
+        """
+        with bind_correlation_id() as correlation_id:
+            self.logger.info("Handling user input through MainAgent.")
+            memory = memory if memory is not None else SessionMemory()
+
+            with get_tracer().trace("handle_message", {"trace_id": correlation_id}) as trace:
+                meta = trace.meta() if trace is not None else None
+
+                run = self.scheduler.run(
+                    {"user_input": user_input, "transcript": transcript, "memory": memory},
+                    meta=meta,
+                )
+                schedule = run.to_dict()
+                self.logger.info(
+                    "Critical path %s took %.3fs of %.3fs.",
+                    " → ".join(schedule["critical_path"]), schedule["critical_path_seconds"], run.wall,
+                )
+                run.raise_for_error()
+                plan, draft, evaluation = run.values["plan"], run.values["draft"], run.values["evaluation"]
+                self.planner.remember_analysis(plan, run.values["meta"])
+                self._index_transcript(plan)
+
+                response_text = evaluation.get("final_article", "")
+
+                result: Dict[str, Any] = {
+                    "response": response_text,
+                    "plan": plan,
+                    "draft": draft,
+                    "evaluation": evaluation,
+                    "schedule": schedule,
+                }
+
+            if trace is not None:
+                result["trace"] = trace.to_dict()
+
+            self.logger.info("MainAgent finished processing.")
+            return result
+
+    def stream_message(
+        self,
+        user_input: str,
+        transcript: Optional[Transcript] = None,
+        memory: Optional[SessionMemory] = None,
+    ) -> Iterator[str]:
+        """
+        Like handle_message, but yield the Markdown article in fragments as
+        the Worker renders it: header and summary first, then the timestamped
+        transcript. The draft and evaluation are stored in memory once the
+        last fragment has been produced; the draft holds the body's "length"
+        and "sha256" instead of the body. ``memory`` defaults to a fresh
+        SessionMemory, as in handle_message.
+        """
+        memory = memory if memory is not None else SessionMemory()
+
+        # The trace covers the scheduled stages only: the generator below
+        # may be resumed from different threads, which context-bound state
+        # cannot follow.
+        with bind_correlation_id() as correlation_id, \
+                get_tracer().trace("stream_message", {"trace_id": correlation_id}) as trace:
+            self.logger.info("Streaming user input through MainAgent.")
+            run = self.stream_scheduler.run(
+                {"user_input": user_input, "transcript": transcript, "memory": memory},
+                meta=trace.meta() if trace is not None else None,
+            )
+            run.raise_for_error()
+            plan, meta = run.values["plan"], run.values["meta"]
+            self._index_transcript(plan)
+
+        draft = yield from self.worker.stream_blog(plan, memory, meta, run.values["time_labels"])
+        self.evaluator.evaluate(draft=draft, plan=plan, memory=memory)
+        self.planner.remember_analysis(plan, meta)
+        self.logger.info("MainAgent finished streaming.")
+
+
+_shared_agent: Optional[MainAgent] = None
+_shared_agent_lock = threading.Lock()
+
+
+def get_agent() -> MainAgent:
+    """
+    Return the process-wide MainAgent, creating it on first use.
 
-    def handle_message(self, user_input: str) -> Dict[str, Any]:
-        self.logger.info("Handling user input through MainAgent.")
-
-        plan_msg: AgentMessage = self.protocol.build_message(
-            sender="user",
-            receiver="planner",
-            task="plan_youtube_to_blog",
-            payload={"user_input": user_input},
-        )
-
-        plan = self.planner.create_plan(
-            user_input=plan_msg.payload["user_input"],
-            memory=self.memory,
-        )
-
-        worker_msg: AgentMessage = self.protocol.build_message(
-            sender="planner",
-            receiver="worker",
-            task="generate_blog",
-            payload={"plan": plan},
-        )
-
-        draft = self.worker.generate_blog(
-            plan=worker_msg.payload["plan"],
-            memory=self.memory,
-        )
-
-        evaluator_msg: AgentMessage = self.protocol.build_message(
-            sender="worker",
-            receiver="evaluator",
-            task="evaluate_blog",
-            payload={"draft": draft, "plan": plan},
-        )
-
-        evaluation = self.evaluator.evaluate(
-            draft=evaluator_msg.payload["draft"],
-            plan=evaluator_msg.payload["plan"],
-            memory=self.memory,
-        )
-
-        response_text = evaluation.get("final_article", "")
-
-        result: Dict[str, Any] = {
-            "response": response_text,
-            "plan": plan,
-            "draft": draft,
-            "evaluation": evaluation,
-        }
-
-        self.logger.info("MainAgent finished processing.")
-        return result
+    The Planner, Worker and Evaluator keep no per-request state, and each
+    request gets its own SessionMemory, so one instance can serve
+    concurrent requests.
+    """
+    global _shared_agent
+    if _shared_agent is None:
+        with _shared_agent_lock:
+            if _shared_agent is None:
+                _shared_agent = MainAgent()
+    return _shared_agent
 
 
 def run_agent(user_input: str):
-    agent = MainAgent()
-    result = agent.handle_message(user_input)
+    result = get_agent().handle_message(user_input, memory=SessionMemory())
     return result["response"]
@@ -0,0 +1,247 @@
+"""
+Storage backends for SessionMemory.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from typing import Any, Dict, List, Optional, Tuple
+
+from project.memory.stage_cache import estimate_size
+
+
+class MemoryBackend:
+    """
+    Interface implemented by SessionMemory storage backends.
+
+    Besides plain key/value storage, backends keep reference-counted blobs
+    so large values can be stored once by content hash and shared between
+    keys (see SessionMemory's store-by-reference mode). ``blobs`` passed to
+    set() maps each digest the value points at to its content; content
+    already stored under a digest is kept, and references are released
+    when the key is overwritten, deleted or evicted.
+    """
+
+    def get(self, key: str) -> Any:
+        """
+        Return the value for ``key``; raise KeyError if absent.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, blobs: Optional[Dict[str, Any]] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def keys(self) -> List[str]:
+        raise NotImplementedError
+
+    def get_blob(self, digest: str) -> Any:
+        raise NotImplementedError
+
+
+class InProcessBackend(MemoryBackend):
+    """
+    Dict-backed store with optional LRU limits on entry count and size.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, int, Tuple[str, ...]]]" = OrderedDict()
+        self._bytes = 0
+        self._blobs: Dict[str, Tuple[Any, int]] = {}
+        self._blob_refs: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            value, _, _ = self._entries[key]
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, blobs: Optional[Dict[str, Any]] = None) -> None:
+        blobs = blobs or {}
+        refs = tuple(blobs)
+        size = estimate_size(value) if self.max_bytes is not None else 0
+        with self._lock:
+            for digest, blob in blobs.items():
+                if digest not in self._blobs:
+                    blob_size = estimate_size(blob) if self.max_bytes is not None else 0
+                    self._blobs[digest] = (blob, blob_size)
+                    self._bytes += blob_size
+                self._blob_refs[digest] = self._blob_refs.get(digest, 0) + 1
+            self._drop(key)
+            self._entries[key] = (value, size, refs)
+            self._bytes += size
+            self._enforce_limits(keep=key)
+
+    def _drop(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        _, size, refs = entry
+        self._bytes -= size
+        for digest in refs:
+            self._release(digest)
+        return True
+
+    def _release(self, digest: str) -> None:
+        remaining = self._blob_refs.get(digest, 0) - 1
+        if remaining > 0:
+            self._blob_refs[digest] = remaining
+            return
+        self._blob_refs.pop(digest, None)
+        blob = self._blobs.pop(digest, None)
+        if blob is not None:
+            self._bytes -= blob[1]
+
+    def _enforce_limits(self, keep: str) -> None:
+        def over() -> bool:
+            if self.max_entries is not None and len(self._entries) > self.max_entries:
+                return True
+            return self.max_bytes is not None and self._bytes > self.max_bytes
+
+        while over():
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._drop(oldest)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def get_blob(self, digest: str) -> Any:
+        with self._lock:
+            return self._blobs[digest][0]
+
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS session_entries (
+        session_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value BLOB NOT NULL,
+        refs TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (session_id, key)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS session_blobs (
+        digest TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        refcount INTEGER NOT NULL
+    )
+    """,
+)
+
+
+class SQLiteBackend(MemoryBackend):
+    """
+    Persistent backend storing pickled values in SQLite, shared across processes.
+
+    Each SessionMemory picks a ``session_id``; reopening the same file and
+    session after a restart sees the previously stored values. Blobs are
+    shared by every session in the file and deleted when no entry refers
+    to them.
+    """
+
+    def __init__(self, path: str, session_id: str = "default") -> None:
+        self.path = path
+        self.session_id = session_id
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+
+    def get(self, key: str) -> Any:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value FROM session_entries WHERE session_id = ? AND key = ?",
+                (self.session_id, key),
+            ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return pickle.loads(row[0])
+
+    def _release_refs(self, conn: sqlite3.Connection, key: str) -> None:
+        row = conn.execute(
+            "SELECT refs FROM session_entries WHERE session_id = ? AND key = ?",
+            (self.session_id, key),
+        ).fetchone()
+        if not row or not row[0]:
+            return
+        for digest in row[0].split(","):
+            conn.execute("UPDATE session_blobs SET refcount = refcount - 1 WHERE digest = ?", (digest,))
+        conn.execute("DELETE FROM session_blobs WHERE refcount <= 0")
+
+    def set(self, key: str, value: Any, blobs: Optional[Dict[str, Any]] = None) -> None:
+        blobs = blobs or {}
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for digest, blob in blobs.items():
+                    updated = conn.execute(
+                        "UPDATE session_blobs SET refcount = refcount + 1 WHERE digest = ?", (digest,)
+                    ).rowcount
+                    if not updated:
+                        conn.execute(
+                            "INSERT INTO session_blobs (digest, value, refcount) VALUES (?, ?, 1)",
+                            (digest, pickle.dumps(blob, protocol=pickle.HIGHEST_PROTOCOL)),
+                        )
+                self._release_refs(conn, key)
+                conn.execute(
+                    "INSERT OR REPLACE INTO session_entries (session_id, key, value, refs, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.session_id, key, payload, ",".join(blobs), time.time()),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._release_refs(conn, key)
+                conn.execute(
+                    "DELETE FROM session_entries WHERE session_id = ? AND key = ?",
+                    (self.session_id, key),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def keys(self) -> List[str]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT key FROM session_entries WHERE session_id = ? ORDER BY key",
+                (self.session_id,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_blob(self, digest: str) -> Any:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM session_blobs WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        return pickle.loads(row[0])
@@ -1,19 +1,210 @@
-from typing import Any, Dict
+import hashlib
+import os
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+from project.memory.backends import InProcessBackend, MemoryBackend, SQLiteBackend
+from project.tools.text_analysis import TextAnalysis
+from project.tools.transcript import Transcript
+
+MEMORY_PATH_ENV = "SESSION_MEMORY_PATH"
+MEMORY_SESSION_ENV = "SESSION_MEMORY_SESSION_ID"
+MEMORY_MAX_ENTRIES_ENV = "SESSION_MEMORY_MAX_ENTRIES"
+MEMORY_MAX_BYTES_ENV = "SESSION_MEMORY_MAX_BYTES"
+MEMORY_BY_REFERENCE_ENV = "SESSION_MEMORY_BY_REFERENCE"
+
+
+class BlobRef:
+    """
+    Placeholder for a large value stored once in the backend's blob store.
+
+    ``kind`` is "text" (a string), "lines" (a list of strings), "transcript"
+    (Transcript columns whose text lives under ``text_digest``) or
+    "analysis" (a TextAnalysis rebuilt lazily from its text).
+    """
+
+    __slots__ = ("digest", "kind", "text_digest")
+
+    def __init__(self, digest: str, kind: str, text_digest: Optional[str] = None) -> None:
+        self.digest = digest
+        self.kind = kind
+        self.text_digest = text_digest
+
+    def __getstate__(self):
+        return (self.digest, self.kind, self.text_digest)
+
+    def __setstate__(self, state) -> None:
+        self.digest, self.kind, self.text_digest = state
+
+    def __repr__(self) -> str:
+        return f"BlobRef({self.kind}:{self.digest[:12]})"
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class MemoryView(Mapping):
+    """
+    Read-only mapping over a SessionMemory; values are fetched on access.
+    """
+
+    def __init__(self, memory: "SessionMemory") -> None:
+        self._memory = memory
+
+    def __getitem__(self, key: str) -> Any:
+        missing = object()
+        value = self._memory.get(key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._memory.keys())
+
+    def __len__(self) -> int:
+        return len(self._memory.keys())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._memory.keys()
+
+    def __repr__(self) -> str:
+        return f"MemoryView(keys={self._memory.keys()!r})"
 
 
 class SessionMemory:
     """
-    Simple in-memory key-value store for agent sessions.
+    Key-value store for agent sessions on top of a pluggable backend.
+
+    The default InProcessBackend keeps values as-is, like the original
+    dict-based store. Pass ``InProcessBackend(max_entries=..., max_bytes=...)``
+    to bound a long-lived agent's memory, or ``SQLiteBackend(path, session_id)``
+    to keep it across restarts.
+
+    With ``store_by_reference`` set, transcripts, TextAnalysis objects and
+    strings (or lists of strings) larger than ``blob_threshold`` characters
+    are stored once in the backend's blob store under a content hash, and
+    snapshots such as ``last_plan`` and ``last_draft`` only hold references.
+    get() resolves them transparently.
     """
 
-    def __init__(self) -> None:
-        self._store: Dict[str, Any] = {}
+    def __init__(
+        self,
+        backend: Optional[MemoryBackend] = None,
+        store_by_reference: bool = False,
+        blob_threshold: int = 4096,
+    ) -> None:
+        self.backend = backend if backend is not None else InProcessBackend()
+        self.store_by_reference = store_by_reference
+        self.blob_threshold = blob_threshold
+
+    @classmethod
+    def from_env(cls) -> "SessionMemory":
+        """
+        Build a memory from SESSION_MEMORY_* environment variables.
+
+        SESSION_MEMORY_PATH selects the SQLite backend; otherwise the
+        in-process backend is bounded by SESSION_MEMORY_MAX_ENTRIES and
+        SESSION_MEMORY_MAX_BYTES when they are set.
+        """
+        path = os.environ.get(MEMORY_PATH_ENV)
+        if path:
+            backend: MemoryBackend = SQLiteBackend(path, os.environ.get(MEMORY_SESSION_ENV, "default"))
+        else:
+            max_entries = os.environ.get(MEMORY_MAX_ENTRIES_ENV)
+            max_bytes = os.environ.get(MEMORY_MAX_BYTES_ENV)
+            backend = InProcessBackend(
+                max_entries=int(max_entries) if max_entries else None,
+                max_bytes=int(max_bytes) if max_bytes else None,
+            )
+        by_reference = os.environ.get(MEMORY_BY_REFERENCE_ENV, "").lower() in ("1", "true", "yes")
+        return cls(backend, store_by_reference=by_reference)
 
     def set(self, key: str, value: Any) -> None:
-        self._store[key] = value
+        if not self.store_by_reference:
+            self.backend.set(key, value)
+            return
+        blobs: Dict[str, Any] = {}
+        stored = self._externalize(value, blobs)
+        self.backend.set(key, stored, blobs)
 
     def get(self, key: str, default: Any = None) -> Any:
-        return self._store.get(key, default)
+        try:
+            value = self.backend.get(key)
+        except KeyError:
+            return default
+        if self.store_by_reference:
+            value = self._resolve(value, {})
+        return value
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def keys(self) -> List[str]:
+        return self.backend.keys()
+
+    def to_dict(self) -> MemoryView:
+        """
+        Lazy read-only view of every key; wrap in dict() for a snapshot.
+        """
+        return MemoryView(self)
+
+    def _text_ref(self, text: str, blobs: Dict[str, Any]) -> BlobRef:
+        digest = "text:" + _sha256(text)
+        blobs[digest] = text
+        return BlobRef(digest, "text")
+
+    def _externalize(self, value: Any, blobs: Dict[str, Any]) -> Any:
+        if isinstance(value, str):
+            if len(value) > self.blob_threshold:
+                return self._text_ref(value, blobs)
+            return value
+        if isinstance(value, Transcript):
+            state = value.__getstate__()
+            text = state.pop("buffer")
+            text_ref = self._text_ref(text, blobs)
+            digest = "transcript:" + value.content_hash
+            blobs[digest] = state
+            return BlobRef(digest, "transcript", text_ref.digest)
+        if isinstance(value, TextAnalysis):
+            text_ref = self._text_ref(value.text, blobs)
+            return BlobRef(text_ref.digest, "analysis")
+        if isinstance(value, dict):
+            return {k: self._externalize(v, blobs) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            if value and all(isinstance(v, str) for v in value):
+                if sum(len(v) for v in value) > self.blob_threshold:
+                    digest = "lines:" + _sha256("\x00".join(value))
+                    blobs[digest] = list(value)
+                    return BlobRef(digest, "lines")
+                return value
+            items = [self._externalize(v, blobs) for v in value]
+            return items if isinstance(value, list) else tuple(items)
+        return value
+
+    def _resolve(self, value: Any, resolved: Dict[str, Any]) -> Any:
+        if isinstance(value, BlobRef):
+            key = value.kind + ":" + value.digest
+            if key not in resolved:
+                resolved[key] = self._load(value, resolved)
+            return resolved[key]
+        if isinstance(value, dict):
+            return {k: self._resolve(v, resolved) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._resolve(v, resolved) for v in value]
+        if isinstance(value, tuple):
+            return tuple(self._resolve(v, resolved) for v in value)
+        return value
 
-    def to_dict(self) -> Dict[str, Any]:
-        return dict(self._store)
+    def _load(self, ref: BlobRef, resolved: Dict[str, Any]) -> Any:
+        if ref.kind == "transcript":
+            state = dict(self.backend.get_blob(ref.digest))
+            state["buffer"] = self._resolve(BlobRef(ref.text_digest, "text"), resolved)
+            transcript = Transcript.__new__(Transcript)
+            transcript.__setstate__(state)
+            return transcript
+        if ref.kind == "analysis":
+            return TextAnalysis(self._resolve(BlobRef(ref.digest, "text"), resolved))
+        if ref.kind == "lines":
+            return list(self.backend.get_blob(ref.digest))
+        return self.backend.get_blob(ref.digest)
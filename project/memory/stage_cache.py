@@ -0,0 +1,88 @@
+"""
+Content-addressed memoization of agent stage outputs.
+"""
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from project.core.observability import get_logger
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Cheap size estimate dominated by the text held in a stage output.
+    """
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value) + 8 * len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values()) + 16 * len(value)
+    if hasattr(value, "__dict__"):
+        return estimate_size(vars(value))
+    return sys.getsizeof(value)
+
+
+def stage_key(stage: str, *parts: Any) -> str:
+    """
+    Hash a stage name and its inputs (content hashes, config, tool versions).
+    """
+    encoded = json.dumps([stage, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class StageCache:
+    """
+    Thread-safe in-process LRU cache for stage outputs, bounded by size.
+
+    Keys come from stage_key(); callers include every tool version and
+    config value the output depends on, so bumping a version or changing a
+    setting simply misses instead of returning stale output.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.logger = get_logger("StageCache")
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], span: Optional[Any] = None) -> Any:
+        """
+        Return the cached value for ``key`` or compute and store it.
+
+        A hit is also counted on ``span`` when one is given.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                if span is not None:
+                    span.add(cache_hits=1)
+                return entry[0]
+            self.stats["misses"] += 1
+
+        value = compute()
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_size
+                    self.stats["evictions"] += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,198 @@
+"""
+HTTP service mode for the YouTube → Blog Article Converter.
+
+Usage:
+    python -m project.server --host 0.0.0.0 --port 8000
+
+Endpoints:
+    GET  /health          liveness probe
+    GET  /metrics         per-stage and transcript fetch metrics in Prometheus text format
+    POST /convert         {"url": ...} → JSON article and evaluation
+    POST /convert/stream  {"url": ...} → Markdown streamed in chunks
+                          (add ?sse=true for text/event-stream framing)
+"""
+import argparse
+import asyncio
+import json
+import math
+from typing import Any, Dict, Iterator, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+from project.core.observability import get_logger, get_tracer
+from project.main_agent import MainAgent, get_agent
+from project.memory.session_memory import SessionMemory
+from project.tools.fetch_resilience import TransientFetchError
+
+STREAM_CHUNK_CHARS = 8192
+
+
+class ConvertRequest(BaseModel):
+    url: str
+
+
+class _InFlightLimiter:
+    """
+    Non-blocking admission control: a request either gets a slot now or is rejected.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+
+    def try_acquire(self) -> bool:
+        # Only touched from the event loop thread, so no lock is needed.
+        if self.active >= self.limit:
+            return False
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+
+
+def _coalesce(fragments: Iterator[str], chunk_chars: int) -> Iterator[str]:
+    """
+    Send the first fragment (the header and summary) right away, then group
+    the remaining per-segment fragments into chunks of about ``chunk_chars``.
+    """
+    first = next(fragments, None)
+    if first is None:
+        return
+    yield first
+
+    buffer = []
+    size = 0
+    for fragment in fragments:
+        buffer.append(fragment)
+        size += len(fragment)
+        if size >= chunk_chars:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _sse(chunks: Iterator[str]) -> Iterator[str]:
+    for chunk in chunks:
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "event: done\ndata: {}\n\n"
+
+
+def create_app(agent: Optional[MainAgent] = None, max_in_flight: int = 8) -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    Args:
+        agent: MainAgent to serve requests with; defaults to the shared agent
+        max_in_flight: Requests processed at once before new ones get HTTP 429
+    """
+    logger = get_logger("Server")
+    agent = agent or get_agent()
+    limiter = _InFlightLimiter(max_in_flight)
+    app = FastAPI(title="YouTube → Blog Article Converter")
+
+    def admit() -> None:
+        if not limiter.try_acquire():
+            logger.warning("Rejecting request: %d requests in flight.", limiter.active)
+            raise HTTPException(status_code=429, detail="Server is busy, retry later.")
+
+    async def fetch(url: str):
+        # Transcript fetching is blocking network I/O; keep it off the event loop.
+        try:
+            transcript = await run_in_threadpool(agent.planner.transcript_fetcher.fetch_transcript, url)
+            # Reject unusable transcripts before a streamed response has started.
+            await run_in_threadpool(agent.planner.check_quality, transcript)
+            return transcript
+        except TransientFetchError as e:
+            # Upstream trouble, not a bad request; tell the client when to retry.
+            headers = {"Retry-After": str(max(1, math.ceil(e.retry_after or 1)))}
+            raise HTTPException(status_code=503, detail=str(e), headers=headers)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+    @app.get("/metrics")
+    async def metrics() -> PlainTextResponse:
+        # Per-stage metrics are only populated while tracing is enabled.
+        body = get_tracer().prometheus()
+        fetcher = agent.planner.transcript_fetcher
+        if hasattr(fetcher, "prometheus"):
+            body += fetcher.prometheus()
+        return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+    @app.get("/health")
+    async def health() -> Dict[str, Any]:
+        return {"status": "ok", "in_flight": limiter.active, "max_in_flight": limiter.limit}
+
+    @app.post("/convert")
+    async def convert(request: ConvertRequest) -> Dict[str, Any]:
+        admit()
+        try:
+            transcript = await fetch(request.url)
+            result = await run_in_threadpool(
+                agent.handle_message, request.url, transcript, SessionMemory()
+            )
+        finally:
+            limiter.release()
+        return {
+            "article": result["response"],
+            "title": result["draft"]["title"],
+            "keywords": result["draft"]["keywords"],
+            "score": result["evaluation"]["score"],
+            "feedback": result["evaluation"]["feedback"],
+        }
+
+    @app.post("/convert/stream")
+    async def convert_stream(request: ConvertRequest, sse: bool = False) -> StreamingResponse:
+        admit()
+        try:
+            transcript = await fetch(request.url)
+        except BaseException:
+            limiter.release()
+            raise
+
+        loop = asyncio.get_running_loop()
+        released = False
+
+        def release_once() -> None:
+            # Runs on the event loop, either when the body finishes or as the
+            # response's background task if the body never started.
+            nonlocal released
+            if not released:
+                released = True
+                limiter.release()
+
+        def body() -> Iterator[str]:
+            # Starlette iterates sync generators in its threadpool.
+            try:
+                fragments = agent.stream_message(request.url, transcript=transcript, memory=SessionMemory())
+                chunks = _coalesce(fragments, STREAM_CHUNK_CHARS)
+                yield from (_sse(chunks) if sse else chunks)
+            finally:
+                loop.call_soon_threadsafe(release_once)
+
+        media_type = "text/event-stream" if sse else "text/markdown; charset=utf-8"
+        return StreamingResponse(body(), media_type=media_type, background=BackgroundTask(release_once))
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the YouTube → Blog converter over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(max_in_flight=args.max_in_flight), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Extractive sentence ranking (centroid and TextRank) over sparse TF-IDF
+sentence vectors, with a bounded-time path for very long transcripts.
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from project.tools.text_analysis import TextAnalysis
+from project.tools.timestamps import _get_numpy
+
+CENTROID = "centroid"
+TEXTRANK = "textrank"
+METHODS = (CENTROID, TEXTRANK)
+
+# Auto-captions often have no punctuation at all; longer "sentences" are
+# cut on whitespace into units of about this many characters.
+MAX_UNIT_CHARS = 300
+
+# Sentences ranked together in one local pass, and how many local passes
+# (evenly spread over the text) feed the global pass at most. Together they
+# bound the ranking work whatever the transcript length.
+WINDOW = 64
+MAX_WINDOWS = 128
+
+_TERM_RE = re.compile(r"[a-z]{4,}")
+_DAMPING = 0.85
+_ITERATIONS = 30
+_TOLERANCE = 1e-6
+
+
+def split_units(text: str, analysis: Optional[TextAnalysis] = None, max_chars: int = MAX_UNIT_CHARS) -> List[str]:
+    """
+    Sentences of ``text``, with over-long ones split on whitespace.
+    """
+    units: List[str] = []
+    for sentence in (analysis or TextAnalysis(text)).sentences():
+        if len(sentence) <= max_chars:
+            units.append(sentence)
+            continue
+        words = sentence.split()
+        start = 0
+        size = 0
+        for i, word in enumerate(words):
+            if i > start and size + 1 + len(word) > max_chars:
+                units.append(" ".join(words[start:i]))
+                start, size = i, 0
+            size += len(word) + (1 if i > start else 0)
+        units.append(" ".join(words[start:]))
+    return units
+
+
+def _vectors(
+    term_lists: Sequence[Counter],
+    idf: Dict[str, float],
+) -> List[Dict[str, float]]:
+    # Sublinear TF-IDF, L2-normalized so dot products are cosines.
+    vectors = []
+    for terms in term_lists:
+        vector = {t: (1.0 + math.log(c)) * idf[t] for t, c in terms.items() if idf[t] > 0.0}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        vectors.append({t: w / norm for t, w in vector.items()} if norm else {})
+    return vectors
+
+
+def _dense(vectors: Sequence[Dict[str, float]], np):
+    columns: Dict[str, int] = {}
+    for vector in vectors:
+        for term in vector:
+            columns.setdefault(term, len(columns))
+    matrix = np.zeros((len(vectors), max(1, len(columns))))
+    for row, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            matrix[row, columns[term]] = weight
+    return matrix
+
+
+def _centroid_scores(vectors: Sequence[Dict[str, float]]) -> List[float]:
+    np = _get_numpy()
+    if np is not None:
+        matrix = _dense(vectors, np)
+        return (matrix @ matrix.sum(axis=0)).tolist()
+    centroid: Counter = Counter()
+    for vector in vectors:
+        centroid.update(vector)
+    return [sum(w * centroid[t] for t, w in vector.items()) for vector in vectors]
+
+
+def _textrank_scores(vectors: Sequence[Dict[str, float]]) -> List[float]:
+    n = len(vectors)
+    np = _get_numpy()
+    if np is not None:
+        matrix = _dense(vectors, np)
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0.0)
+        out = similarity.sum(axis=1)
+        transition = np.divide(similarity, out[:, None], out=np.zeros_like(similarity), where=out[:, None] > 0)
+        rank = np.full(n, 1.0 / n)
+        for _ in range(_ITERATIONS):
+            updated = (1.0 - _DAMPING) / n + _DAMPING * (transition.T @ rank)
+            converged = np.abs(updated - rank).sum() < _TOLERANCE
+            rank = updated
+            if converged:
+                break
+        return rank.tolist()
+
+    # Sparse fallback: the similarity graph via an inverted term index.
+    postings: Dict[str, List[int]] = {}
+    for i, vector in enumerate(vectors):
+        for term in vector:
+            postings.setdefault(term, []).append(i)
+    edges: List[Dict[int, float]] = [{} for _ in range(n)]
+    for i, vector in enumerate(vectors):
+        row = edges[i]
+        for term, weight in vector.items():
+            for j in postings[term]:
+                if j != i:
+                    row[j] = row.get(j, 0.0) + weight * vectors[j][term]
+    out = [sum(row.values()) for row in edges]
+    rank = [1.0 / n] * n
+    for _ in range(_ITERATIONS):
+        incoming = [0.0] * n
+        for i, row in enumerate(edges):
+            if out[i] > 0.0:
+                share = rank[i] / out[i]
+                for j, weight in row.items():
+                    incoming[j] += weight * share
+        updated = [(1.0 - _DAMPING) / n + _DAMPING * value for value in incoming]
+        converged = sum(abs(a - b) for a, b in zip(updated, rank)) < _TOLERANCE
+        rank = updated
+        if converged:
+            break
+    return rank
+
+
+_SCORERS = {CENTROID: _centroid_scores, TEXTRANK: _textrank_scores}
+
+
+def _top(scores: Sequence[float], candidates: Sequence[int], k: int) -> List[int]:
+    # Stable on ties: earlier sentences win.
+    return sorted(candidates, key=lambda i: (-scores[i], i))[:k]
+
+
+def rank_units(
+    units: Sequence[str],
+    count: int,
+    method: str = CENTROID,
+    stopwords: Iterable[str] = (),
+    window: int = WINDOW,
+    max_windows: int = MAX_WINDOWS,
+) -> List[int]:
+    """
+    Indices of the ``count`` most central units, in text order.
+
+    Up to ``window`` units are ranked in one pass. Longer inputs are ranked
+    window by window first (at most ``max_windows`` of them, evenly spread),
+    and each window's best few units go through a final global pass, so the
+    work is bounded by ``window * max_windows`` units whatever the length.
+    """
+    if method not in _SCORERS:
+        raise ValueError(f"Unknown summarization method: {method!r}")
+    if count <= 0 or not units:
+        return []
+    score = _SCORERS[method]
+    stop = stopwords if isinstance(stopwords, (set, frozenset)) else frozenset(stopwords)
+
+    windows = [range(start, min(start + window, len(units))) for start in range(0, len(units), window)]
+    if len(windows) > max_windows:
+        stride = len(windows) / max_windows
+        windows = [windows[int(i * stride)] for i in range(max_windows)]
+
+    # Sentence-level document frequencies over every unit that is ranked.
+    terms: Dict[int, Counter] = {}
+    df: Counter = Counter()
+    for indices in windows:
+        for i in indices:
+            counts = Counter(t for t in _TERM_RE.findall(units[i].lower()) if t not in stop)
+            terms[i] = counts
+            df.update(counts.keys())
+    total = len(terms)
+    idf = {t: math.log(total / d) for t, d in df.items()}
+
+    def rank(indices: Sequence[int], k: int) -> List[int]:
+        ranked = [i for i in indices if terms[i]]
+        if not ranked:
+            return list(indices)[:k]
+        scores = dict(zip(ranked, score(_vectors([terms[i] for i in ranked], idf))))
+        return _top(scores, ranked, k)
+
+    if len(windows) == 1:
+        return sorted(rank(windows[0], count))
+    keep = max(2, count)
+    candidates = [i for indices in windows for i in rank(indices, keep)]
+    return sorted(rank(candidates, count))
@@ -0,0 +1,201 @@
+"""
+Typed fetch errors, retry with jittered backoff, a circuit breaker and a
+pooled HTTP session for talking to YouTube.
+"""
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+
+class TranscriptFetchError(ValueError):
+    """
+    Base class for transcript fetch failures.
+
+    Subclasses ValueError so callers written against the old string-wrapped
+    errors keep working.
+    """
+
+    def __init__(self, message: str, video_id: Optional[str] = None) -> None:
+        super().__init__(message)
+        self.video_id = video_id
+
+
+class InvalidVideoURL(TranscriptFetchError):
+    """
+    No video ID could be extracted from the input.
+    """
+
+
+class TranscriptUnavailable(TranscriptFetchError):
+    """
+    The video has no usable transcript (disabled, missing, private or removed).
+    Retrying will not help.
+    """
+
+
+class TransientFetchError(TranscriptFetchError):
+    """
+    A failure worth retrying: rate limiting, upstream 5xx or a network error.
+    """
+
+    def __init__(self, message: str, video_id: Optional[str] = None, retry_after: Optional[float] = None) -> None:
+        super().__init__(message, video_id)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(TransientFetchError):
+    """
+    Raised without contacting YouTube while the circuit breaker is open.
+    """
+
+
+def classify_error(error: BaseException, video_id: str) -> TranscriptFetchError:
+    """
+    Map a youtube_transcript_api or requests exception onto the typed errors above.
+    """
+    if isinstance(error, TranscriptFetchError):
+        return error
+    import requests
+    from youtube_transcript_api import _errors as yt
+
+    if isinstance(error, (yt.TranscriptsDisabled, yt.NoTranscriptFound)):
+        return TranscriptUnavailable(f"No transcript available for video: {video_id}", video_id)
+    if isinstance(error, (yt.VideoUnavailable, yt.InvalidVideoId, yt.AgeRestricted, yt.VideoUnplayable)):
+        return TranscriptUnavailable(f"Video is unavailable: {video_id}", video_id)
+    if isinstance(error, (yt.IpBlocked, yt.RequestBlocked)):
+        return TransientFetchError(f"YouTube is rate limiting requests for video: {video_id}", video_id)
+    if isinstance(error, yt.YouTubeRequestFailed):
+        status = error.reason.split(" ", 1)[0]
+        if status.isdigit() and 400 <= int(status) < 500 and status != "408":
+            return TranscriptFetchError(f"Error fetching transcript: {error.reason}", video_id)
+        return TransientFetchError(f"YouTube request failed: {error.reason}", video_id)
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return TransientFetchError(f"Network error fetching transcript: {error}", video_id)
+    return TranscriptFetchError(f"Error fetching transcript: {error}", video_id)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: attempt n waits a random time in
+    [0, min(max_delay, base_delay * 2**n)].
+    """
+
+    def __init__(
+        self,
+        attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        delay = self._rng.uniform(0.0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream for ``reset_timeout`` seconds after
+    ``failure_threshold`` consecutive transient failures.
+
+    After the timeout one probe request is let through (half-open); its
+    success closes the circuit and its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._stats: Dict[str, int] = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def retry_after(self) -> float:
+        with self._lock:
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def allow(self) -> bool:
+        """
+        Whether a request may go out now; counts a rejection when not.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._stats["successes"] += 1
+            self._failures = 0
+            self._state = self.CLOSED
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._stats["failures"] += 1
+            self._failures += 1
+            state = self._current_state()
+            if state == self.HALF_OPEN or (state == self.CLOSED and self._failures >= self.failure_threshold):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+                self._stats["opened"] += 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, state=self._current_state())
+
+
+def create_session(pool_size: int = 16) -> "requests.Session":
+    """
+    One requests.Session with a connection pool sized for concurrent fetches.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,323 @@
+"""
+Corpus document-frequency index for TF-IDF keyword ranking.
+
+The index lives in one compact binary file that is memory-mapped on load,
+so opening even a large index costs no parsing and its pages are shared
+between processes:
+
+    magic   b"KWI1"
+    u64     documents in the corpus
+    u64     number of terms
+    u32[n+1] byte offsets of each term in the term blob (native byte order)
+    u32[n]  document frequency of each term (native byte order)
+    bytes   UTF-8 terms, sorted, concatenated
+
+Lookups binary-search the sorted terms directly in the mapping. New
+documents are counted in memory and merged into the file by flush(),
+which rewrites it atomically and re-maps it. Flushes happen every
+``flush_every`` documents, once pending documents are ``flush_seconds``
+old, and when the process exits.
+
+Usage:
+    python -m project.tools.keyword_index build corpus.kwi articles/*.md
+"""
+import argparse
+import atexit
+import math
+import mmap
+import multiprocessing.util
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import weakref
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from project.tools.text_analysis import TextAnalysis
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, keep one writer per file
+    fcntl = None
+
+KEYWORD_INDEX_ENV = "KEYWORD_INDEX_PATH"
+
+_MAGIC = b"KWI1"
+_HEADER = struct.Struct("=4sQQ")
+_PHRASE_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def phrase_counts(text: str, stopwords: Iterable[str]) -> Counter:
+    """
+    Counts of two-word phrases whose words are both keyword terms
+    (4+ ASCII letters, not stopwords) and adjacent in the text.
+    """
+    stop = stopwords if isinstance(stopwords, (set, frozenset)) else frozenset(stopwords)
+    counts: Counter = Counter()
+    previous = None
+    for token in _PHRASE_TOKEN_RE.findall(text.lower()):
+        if len(token) >= 4 and token.isascii() and token.isalpha() and token not in stop:
+            if previous is not None:
+                counts[previous + " " + token] += 1
+            previous = token
+        else:
+            previous = None
+    return counts
+
+
+def _flush_at_exit(ref: "weakref.ref[CorpusIndex]") -> None:
+    index = ref()
+    if index is not None:
+        index.flush()
+
+
+def document_terms(text: str, stopwords: Iterable[str], analysis: Optional[TextAnalysis] = None) -> Set[str]:
+    """
+    Distinct unigram and phrase terms of one document, as counted in the index.
+    """
+    analysis = analysis or TextAnalysis(text)
+    terms = {term for term in analysis.term_counts if term not in stopwords}
+    terms.update(phrase_counts(text, stopwords))
+    return terms
+
+
+class CorpusIndex:
+    """
+    Memory-mapped document frequencies plus not-yet-flushed updates.
+
+    Scores are computed from the flushed snapshot only, so ``generation``
+    (the snapshot's document count) identifies the statistics a ranking was
+    based on; add_document() becomes visible after the next flush().
+    Flushing is safe across threads and, where fcntl is available, across
+    processes: flush() merges into the file as it is on disk, under an
+    exclusive lock, so writers sharing KEYWORD_INDEX_PATH keep each other's
+    documents.
+
+    Pending documents are flushed every ``flush_every`` documents, on the
+    first add_document() once the oldest is ``flush_seconds`` old (None
+    disables either), and at interpreter or worker-process exit.
+    """
+
+    def __init__(self, path: str, flush_every: int = 100, flush_seconds: Optional[float] = 30.0) -> None:
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._pending: Counter = Counter()
+        self._pending_documents = 0
+        self._pending_since = 0.0
+        self._seen: Set[str] = set()
+        self._mmap: Optional[mmap.mmap] = None
+        self._load()
+        # atexit does not run in multiprocessing children (e.g. batch render
+        # workers), which run their Finalize callbacks instead.
+        ref = weakref.ref(self)
+        atexit.register(_flush_at_exit, ref)
+        multiprocessing.util.Finalize(None, _flush_at_exit, args=(ref,), exitpriority=10)
+
+    @classmethod
+    def from_env(cls) -> Optional["CorpusIndex"]:
+        """
+        Open the index named by KEYWORD_INDEX_PATH, or None if unset.
+        """
+        path = os.environ.get(KEYWORD_INDEX_ENV)
+        return cls(path) if path else None
+
+    def _unmap(self) -> None:
+        if self._mmap is not None:
+            self._offsets.release()
+            self._frequencies.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def _load(self) -> None:
+        self._unmap()
+        self.documents = 0
+        self._count = 0
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < _HEADER.size:
+            return
+        with open(self.path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, documents, count = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC:
+            mapped.close()
+            raise ValueError(f"Not a keyword index: {self.path}")
+        view = memoryview(mapped)
+        position = _HEADER.size
+        self._offsets = view[position:position + 4 * (count + 1)].cast("I")
+        position += 4 * (count + 1)
+        self._frequencies = view[position:position + 4 * count].cast("I")
+        self._blob_start = position + 4 * count
+        self._mmap = mapped
+        self.documents = documents
+        self._count = count
+
+    @property
+    def generation(self) -> int:
+        return self.documents
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _term(self, i: int) -> bytes:
+        start = self._blob_start
+        return self._mmap[start + self._offsets[i]:start + self._offsets[i + 1]]
+
+    def df(self, term: str) -> int:
+        """
+        Number of corpus documents containing ``term`` in the flushed snapshot.
+        """
+        # Under the lock: a flush in another thread unmaps the old snapshot.
+        with self._lock:
+            return self._df(term)
+
+    def _df(self, term: str) -> int:
+        key = term.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._term(lo) == key:
+            return self._frequencies[lo]
+        return 0
+
+    def idf(self, term: str) -> float:
+        """
+        Smoothed inverse document frequency, log((N + 1) / (df + 0.5)).
+
+        Terms found in every document get close to zero weight; with an
+        empty corpus every term gets the same positive weight.
+        """
+        with self._lock:
+            return math.log((self.documents + 1) / (self._df(term) + 0.5))
+
+    def add_document(self, terms: Iterable[str], doc_id: Optional[str] = None) -> None:
+        """
+        Count one document's distinct terms; ``doc_id`` (e.g. a content hash)
+        skips documents already added by this process.
+        """
+        with self._lock:
+            if doc_id is not None:
+                if doc_id in self._seen:
+                    return
+                self._seen.add(doc_id)
+            if not self._pending_documents:
+                self._pending_since = time.monotonic()
+            self._pending.update(set(terms))
+            self._pending_documents += 1
+            due = (
+                (self.flush_every and self._pending_documents >= self.flush_every)
+                or (self.flush_seconds is not None and time.monotonic() - self._pending_since >= self.flush_seconds)
+            )
+        if due:
+            self.flush()
+
+    def _items(self) -> Dict[str, int]:
+        return {
+            self._term(i).decode("utf-8"): self._frequencies[i]
+            for i in range(self._count)
+        }
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path + ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def flush(self) -> None:
+        """
+        Merge pending documents into the file and re-map it.
+        """
+        with self._lock:
+            if not self._pending_documents:
+                return
+            with self._file_lock():
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        # Other processes may have flushed since our last look.
+        self._load()
+        merged = Counter(self._items()) if self._count else Counter()
+        merged.update(self._pending)
+        documents = self.documents + self._pending_documents
+        self._write(merged, documents)
+        self._pending = Counter()
+        self._pending_documents = 0
+        self._load()
+
+    def _write(self, frequencies: Dict[str, int], documents: int) -> None:
+        encoded = sorted((term.encode("utf-8"), df) for term, df in frequencies.items())
+        offsets = array("I", [0])
+        dfs = array("I")
+        position = 0
+        for term, df in encoded:
+            position += len(term)
+            offsets.append(position)
+            dfs.append(df)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, documents, len(encoded)))
+            f.write(offsets.tobytes())
+            f.write(dfs.tobytes())
+            f.write(b"".join(term for term, _ in encoded))
+        # Drop our mapping first so the old file can be replaced on every platform.
+        self._unmap()
+        os.replace(temporary, self.path)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._unmap()
+
+    @classmethod
+    def build(cls, path: str, texts: Iterable[str], stopwords: Iterable[str]) -> "CorpusIndex":
+        """
+        Create (or extend) an index from many documents in one flush.
+        """
+        index = cls(path, flush_every=0, flush_seconds=None)
+        for text in texts:
+            index.add_document(document_terms(text, stopwords))
+        index.flush()
+        return index
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from project.tools.tools import SEO_STOPWORDS
+
+    parser = argparse.ArgumentParser(description="Build a keyword corpus index from text files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Add documents to an index (created if missing)")
+    build.add_argument("index", help="Index file to write")
+    build.add_argument("files", nargs="+", help="Articles or transcripts, one document per file")
+    args = parser.parse_args(argv)
+
+    def texts() -> Iterable[str]:
+        for name in args.files:
+            with open(name, "r", encoding="utf-8") as f:
+                yield f.read()
+
+    index = CorpusIndex.build(args.index, texts(), SEO_STOPWORDS)
+    print(f"{args.index}: {index.documents} documents, {len(index)} terms")
+    index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Near-duplicate transcript detection with MinHash signatures and an LSH
+index, so re-uploads and mirrors of an already converted video can reuse
+its analysis.
+
+Signatures use one-permutation MinHash over 5-word shingles: every shingle
+is hashed once and the minimum is kept per bin (empty bins borrow from a
+neighbor), which costs one pass over the text instead of one per hash
+function. Only the low byte of each bin is stored (b-bit MinHash), 128
+bytes per transcript; LSH band keys are computed from the full values.
+
+The index is one SQLite file (WAL, a connection per call) so several
+processes can share it:
+
+    documents  video ID, 1-byte-per-bin signature, analysis metadata
+    bands      (band key, document) pairs, clustered by band key
+"""
+import json
+import os
+import re
+import sqlite3
+import time
+import zlib
+from array import array
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from project.core.observability import get_logger
+from project.tools.timestamps import _get_numpy
+
+NEAR_DUPLICATE_INDEX_ENV = "NEAR_DUPLICATE_INDEX_PATH"
+NEAR_DUPLICATE_THRESHOLD_ENV = "NEAR_DUPLICATE_THRESHOLD"
+
+NUM_BINS = 128
+SHINGLE_WORDS = 5
+
+_WORD_RE = re.compile(r"\w+")
+_MASK32 = 0xFFFFFFFF
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_SHINGLE_PRIME = 0x01000193
+_EMPTY = _MASK64
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    """
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY,
+        video_id TEXT NOT NULL UNIQUE,
+        signature BLOB NOT NULL,
+        meta TEXT,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS bands (
+        key INTEGER NOT NULL,
+        document INTEGER NOT NULL,
+        PRIMARY KEY (key, document)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def _mix(x: int) -> int:
+    # splitmix64 finalizer; the NumPy path below computes the same in uint64.
+    z = (x + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _token_hashes(text: str) -> List[int]:
+    cache: Dict[str, int] = {}
+    hashes = []
+    for token in _WORD_RE.findall(text.lower()):
+        value = cache.get(token)
+        if value is None:
+            value = cache[token] = zlib.crc32(token.encode("utf-8"))
+        hashes.append(value)
+    return hashes
+
+
+def minhash(text: str, num_bins: int = NUM_BINS) -> Optional[array]:
+    """
+    One-permutation MinHash signature of ``text`` (``num_bins`` 64-bit
+    values), or None for text without words. ``num_bins`` must be a power
+    of two. NumPy is used when available; results are identical without it.
+    """
+    tokens = _token_hashes(text)
+    if not tokens:
+        return None
+    shift = 64 - (num_bins.bit_length() - 1)
+    low = (1 << shift) - 1
+    width = min(SHINGLE_WORDS, len(tokens))
+    windows = len(tokens) - width + 1
+
+    np = _get_numpy()
+    if np is not None:
+        t = np.asarray(tokens, dtype=np.uint64)
+        shingles = t[:windows].copy()
+        for i in range(1, width):
+            shingles = (shingles * np.uint64(_SHINGLE_PRIME) + t[i:i + windows]) & np.uint64(_MASK32)
+        z = np.unique(shingles) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+        bins = np.full(num_bins, _EMPTY, dtype=np.uint64)
+        np.minimum.at(bins, (z >> np.uint64(shift)).astype(np.intp), z & np.uint64(low))
+        signature = array("Q", bins.tobytes())
+    else:
+        shingles = set()
+        for start in range(windows):
+            h = tokens[start]
+            for i in range(1, width):
+                h = (h * _SHINGLE_PRIME + tokens[start + i]) & _MASK32
+            shingles.add(h)
+        signature = array("Q", [_EMPTY]) * num_bins
+        for shingle in shingles:
+            z = _mix(shingle)
+            b = z >> shift
+            value = z & low
+            if value < signature[b]:
+                signature[b] = value
+
+    # Densify: an empty bin takes the next filled bin's value (circularly),
+    # offset by the distance so borrowed values stay distinct.
+    filled = [i for i in range(num_bins) if signature[i] != _EMPTY]
+    if len(filled) < num_bins:
+        source = filled[0]
+        for i in range(num_bins - 1, -1, -1):
+            if signature[i] != _EMPTY:
+                source = i
+            else:
+                distance = (source - i) % num_bins
+                signature[i] = signature[source] + (distance << shift)
+    return signature
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """
+    Estimated Jaccard similarity of two stored (1 byte per bin) signatures.
+
+    Unequal bins collide in their low byte 1 time in 256; the estimate
+    corrects for that.
+    """
+    matches = sum(x == y for x, y in zip(a, b)) / len(a)
+    return max(0.0, (matches - 1 / 256) / (1 - 1 / 256))
+
+
+def band_rows(threshold: float, num_bins: int = NUM_BINS) -> int:
+    """
+    Rows per LSH band for a similarity ``threshold``: the most selective
+    banding whose S-curve midpoint, (1/bands)^(1/rows), stays at least 0.05
+    below the threshold so true matches are almost always candidates.
+    """
+    rows = 1
+    r = 1
+    while r <= num_bins:
+        if num_bins % r == 0 and (r / num_bins) ** (1.0 / r) <= threshold - 0.05:
+            rows = r
+        r *= 2
+    return rows
+
+
+def band_keys(signature: Sequence[int], rows: int) -> List[int]:
+    """
+    One signed 64-bit key per band of ``rows`` consecutive values.
+    """
+    keys = []
+    for band, start in enumerate(range(0, len(signature), rows)):
+        h = 0xCBF29CE484222325 ^ band
+        for value in signature[start:start + rows]:
+            h = ((h ^ value) * 0x100000001B3) & _MASK64
+        keys.append(h - (1 << 64) if h >= 1 << 63 else h)
+    return keys
+
+
+def pack_signature(signature: Sequence[int]) -> bytes:
+    return bytes(value & 0xFF for value in signature)
+
+
+@dataclass
+class NearDuplicate:
+    """
+    An indexed video similar to the one looked up, and its stored analysis.
+    """
+    video_id: str
+    similarity: float
+    meta: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"video_id": self.video_id, "similarity": self.similarity, "meta": self.meta}
+
+
+SignatureLike = Union[str, Sequence[int]]
+
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash/LSH index of transcripts, keyed by video ID.
+
+    ``threshold`` is the estimated Jaccard similarity of 5-word shingles at
+    which two transcripts count as near-duplicates. The LSH banding is
+    chosen from it when the index file is created and kept afterwards; a
+    different threshold later still works, with somewhat lower recall when
+    it is far below the original.
+    """
+
+    def __init__(self, path: str, threshold: float = 0.9) -> None:
+        self.logger = get_logger("NearDuplicateIndex")
+        self.path = path
+        self.threshold = threshold
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT OR IGNORE INTO settings (name, value) VALUES ('rows', ?), ('bins', ?)",
+                (str(band_rows(threshold)), str(NUM_BINS)),
+            )
+            settings = dict(conn.execute("SELECT name, value FROM settings").fetchall())
+        self.rows = int(settings["rows"])
+        self.num_bins = int(settings["bins"])
+
+    @classmethod
+    def from_env(cls) -> Optional["NearDuplicateIndex"]:
+        """
+        Open the index named by NEAR_DUPLICATE_INDEX_PATH, or None if unset.
+        """
+        path = os.environ.get(NEAR_DUPLICATE_INDEX_ENV)
+        if not path:
+            return None
+        threshold = os.environ.get(NEAR_DUPLICATE_THRESHOLD_ENV)
+        return cls(path, float(threshold)) if threshold else cls(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+
+    def signature(self, text_or_signature: SignatureLike) -> Optional[Sequence[int]]:
+        if isinstance(text_or_signature, str):
+            return minhash(text_or_signature, self.num_bins)
+        return text_or_signature
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def add(self, video_id: str, text_or_signature: SignatureLike, meta: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Index one transcript; a video already in the index is left as is.
+        """
+        self.add_many([(video_id, text_or_signature, meta)])
+
+    def add_many(self, items: Iterable[Tuple[str, SignatureLike, Optional[Dict[str, Any]]]]) -> int:
+        """
+        Index many transcripts in one transaction; returns how many were new.
+        """
+        now = time.time()
+        added = 0
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for video_id, text_or_signature, meta in items:
+                signature = self.signature(text_or_signature)
+                if signature is None:
+                    continue
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO documents (video_id, signature, meta, created_at) VALUES (?, ?, ?, ?)",
+                    (video_id, pack_signature(signature), json.dumps(meta) if meta is not None else None, now),
+                )
+                if not cursor.rowcount:
+                    continue
+                document = cursor.lastrowid
+                conn.executemany(
+                    "INSERT OR IGNORE INTO bands (key, document) VALUES (?, ?)",
+                    [(key, document) for key in band_keys(signature, self.rows)],
+                )
+                added += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return added
+
+    def set_meta(self, video_id: str, meta: Dict[str, Any]) -> None:
+        """
+        Attach the analysis produced for ``video_id`` for later reuse.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE documents SET meta = ? WHERE video_id = ?", (json.dumps(meta), video_id))
+
+    def find(
+        self,
+        text_or_signature: SignatureLike,
+        exclude: Optional[str] = None,
+        threshold: Optional[float] = None,
+    ) -> Optional[NearDuplicate]:
+        """
+        The most similar indexed video at or above the threshold, other
+        than ``exclude``, or None.
+        """
+        signature = self.signature(text_or_signature)
+        if signature is None:
+            return None
+        threshold = self.threshold if threshold is None else threshold
+        packed = pack_signature(signature)
+        keys = band_keys(signature, self.rows)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT video_id, signature, meta FROM documents WHERE id IN "
+                f"(SELECT document FROM bands WHERE key IN ({','.join('?' * len(keys))}))",
+                keys,
+            ).fetchall()
+
+        best: Optional[NearDuplicate] = None
+        best_meta = None
+        for video_id, stored, meta in rows:
+            if video_id == exclude:
+                continue
+            score = similarity(packed, stored)
+            if score >= threshold and (best is None or score > best.similarity):
+                best, best_meta = NearDuplicate(video_id, score), meta
+        if best is not None and best_meta is not None:
+            best.meta = json.loads(best_meta)
+        return best
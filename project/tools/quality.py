@@ -0,0 +1,294 @@
+"""
+Cheap transcript quality metrics, computed on the raw segments right
+after fetching so unusable transcripts (music videos, "[Music]"-only
+captions, looping or garbled auto-captions) are rejected before any
+analysis runs. The Evaluator turns the same metrics into its score.
+
+Metrics:
+    lexical_diversity    mean share of distinct words per 100-word window
+                         (at most 256 windows, spread over the transcript)
+    non_speech_ratio     share of tokens that are caption tags ("[Music]", "(applause)", "♪")
+    repetition_rate      share of segments repeating one of the 8 before them
+    words_per_second     words over the time covered by segments (overlaps counted once)
+    language_confidence  how well common function words of the transcript's
+                         language are represented in the same windows; None
+                         for unlisted languages. It only lowers the score:
+                         terse technical speech ("Segment number 4.") has few
+                         function words but is still worth converting
+
+Words are split on whitespace and punctuation with str.translate rather
+than a regex, which is several times faster on long transcripts.
+"""
+import re
+import string
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from project.tools.fetch_resilience import TranscriptUnavailable
+from project.tools.timestamps import _get_numpy
+from project.tools.transcript import Transcript
+
+WINDOW = 100
+MAX_WINDOWS = 256
+REPEAT_LOOKBACK = 8
+
+# Hard limits: a transcript outside any of them is not worth converting.
+# Statistical checks only apply once there is enough text to judge.
+MIN_LEXICAL_DIVERSITY = 0.1
+MAX_NON_SPEECH_RATIO = 0.5
+MAX_REPETITION_RATE = 0.5
+MIN_WORDS_PER_SECOND = 0.1
+MAX_WORDS_PER_SECOND = 20.0
+MIN_WORDS_TO_JUDGE = 50
+MIN_SEGMENTS_TO_JUDGE = 10
+
+# Square brackets are only used for tags, but parentheses also hold spoken
+# asides ("(see the docs)"), so only the usual caption sounds count there,
+# optionally qualified as in "(upbeat music)" or "(crowd cheering)".
+_PAREN_TAGS = (
+    "music", "music playing", "applause", "laughter", "laughs", "laughing", "cheering", "cheers",
+    "inaudible", "silence", "foreign", "sighs", "coughs", "noise", "static",
+)
+_NON_SPEECH_RE = re.compile(
+    r"\[[^\]]*\]|\((?:[a-z]+ ){0,2}(?:%s)\)|[♪♫♬]+" % "|".join(sorted(_PAREN_TAGS, key=len, reverse=True))
+)
+_NON_SPEECH_MARKS = "[(♪♫♬"
+_PUNCTUATION = str.maketrans({c: " " for c in string.punctuation + "‘’“”«»„…–—¿¡"})
+
+# Expected share of these words in ordinary speech, at which confidence is 1.
+_FUNCTION_WORD_SHARE = 0.3
+_FUNCTION_WORDS = {
+    "en": frozenset(
+        "the and to of a i you it in that is we this so for on be with have are was "
+        "but not what just like they do can if or as at my your all about there "
+        "he she one going know get here how when from an".split()
+    ),
+    "es": frozenset(
+        "de la que el en y a los se no un por con una las lo para es al como más "
+        "pero sus le ya o este sí porque esta cuando muy sin sobre también me hay "
+        "yo todo eso bueno tu te".split()
+    ),
+    "fr": frozenset(
+        "de la le et les des en un une du que est pour qui dans ce pas sur au plus "
+        "il elle on je vous nous ne se avec mais ou ça c est tout fait bien là "
+        "aussi comme".split()
+    ),
+    "de": frozenset(
+        "der die und in den von zu das mit sich des auf für ist im dem nicht ein "
+        "eine als auch es an er hat aus bei sie nach wir ich du so aber wie was "
+        "noch dann ja oder".split()
+    ),
+    "pt": frozenset(
+        "de a o que e do da em um para é com não uma os no se na por mais as dos "
+        "como mas foi ao ele das tem à seu sua ou ser quando muito nos já eu "
+        "também só isso".split()
+    ),
+}
+
+
+class LowQualityTranscript(TranscriptUnavailable):
+    """
+    The transcript exists but fails the quality gate (see QualityReport.issues).
+    """
+
+    def __init__(self, report: "QualityReport", video_id: Optional[str] = None) -> None:
+        super().__init__(f"Transcript is not usable: {'; '.join(report.issues)}", video_id)
+        self.report = report
+
+    def __reduce__(self):
+        # Rebuilt from the report, not the message, when crossing a process pool.
+        return type(self), (self.report, self.video_id)
+
+
+def _ramp(value: float, bad: float, good: float) -> float:
+    # 0 at ``bad``, 1 at ``good``, linear in between (either direction).
+    return min(1.0, max(0.0, (value - bad) / (good - bad)))
+
+
+@dataclass
+class QualityReport:
+    """
+    Quality metrics of one transcript and the hard limits it violates.
+    """
+    words: int
+    segments: int
+    lexical_diversity: float
+    non_speech_ratio: float
+    repetition_rate: float
+    words_per_second: float
+    language_confidence: Optional[float]
+    issues: List[str] = field(default_factory=list)
+
+    @property
+    def usable(self) -> bool:
+        return not self.issues
+
+    def components(self) -> Dict[str, float]:
+        """
+        Each metric mapped onto 0..1, where 1 is typical of clear speech.
+        """
+        wps = self.words_per_second
+        scores = {
+            "lexical_diversity": _ramp(self.lexical_diversity, 0.15, 0.4),
+            "non_speech_ratio": _ramp(self.non_speech_ratio, 0.5, 0.05),
+            "repetition_rate": _ramp(self.repetition_rate, 0.5, 0.05),
+            "words_per_second": min(_ramp(wps, 0.2, 1.0), _ramp(wps, 8.0, 4.5)),
+        }
+        if self.language_confidence is not None:
+            scores["language_confidence"] = _ramp(self.language_confidence, 0.2, 0.8)
+        return scores
+
+    @property
+    def score(self) -> float:
+        """
+        Mean of the component scores; 0 for transcripts without speech.
+        """
+        if not self.words:
+            return 0.0
+        scores = self.components()
+        return sum(scores.values()) / len(scores)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "words": self.words,
+            "segments": self.segments,
+            "lexical_diversity": self.lexical_diversity,
+            "non_speech_ratio": self.non_speech_ratio,
+            "repetition_rate": self.repetition_rate,
+            "words_per_second": self.words_per_second,
+            "language_confidence": self.language_confidence,
+            "score": self.score,
+            "usable": self.usable,
+            "issues": list(self.issues),
+        }
+
+
+def _windows(tokens: List[str]) -> List[List[str]]:
+    count = len(tokens) // WINDOW
+    if count == 0:
+        return [tokens] if tokens else []
+    picked = range(count) if count <= MAX_WINDOWS else (i * count // MAX_WINDOWS for i in range(MAX_WINDOWS))
+    return [tokens[i * WINDOW:(i + 1) * WINDOW] for i in picked]
+
+
+def _lexical_diversity(windows: List[List[str]], np) -> float:
+    if not windows:
+        return 0.0
+    if np is not None and len(windows) > 1:
+        # Token hashes stand in for the tokens: sorting each window puts equal ones side by side.
+        flat = [token for window in windows for token in window]
+        ids = np.fromiter(map(hash, flat), dtype=np.int64, count=len(flat))
+        rows = np.sort(ids.reshape(len(windows), WINDOW), axis=1)
+        distinct = 1 + np.count_nonzero(np.diff(rows, axis=1), axis=1)
+        return int(distinct.sum()) / len(flat)
+    return sum(len(set(window)) for window in windows) / sum(len(window) for window in windows)
+
+
+def _repetition_rate(lines: List[str], np) -> float:
+    lines = [line for line in lines if line]
+    if len(lines) < 2:
+        return 0.0
+    if np is not None:
+        keys = np.fromiter(map(hash, lines), dtype=np.int64, count=len(lines))
+        repeated = np.zeros(len(keys), dtype=bool)
+        for lag in range(1, min(REPEAT_LOOKBACK, len(keys) - 1) + 1):
+            repeated[lag:] |= keys[lag:] == keys[:-lag]
+        return int(repeated.sum()) / len(lines)
+    repeated = sum(
+        1 for i, line in enumerate(lines) if line in lines[max(0, i - REPEAT_LOOKBACK):i]
+    )
+    return repeated / len(lines)
+
+
+def _covered_seconds(starts, durations, np) -> float:
+    # Auto-generated captions overlap; count every second of video once.
+    if not len(starts):
+        return 0.0
+    if np is not None:
+        begin = np.frombuffer(starts, dtype=np.float64)
+        end = begin + np.frombuffer(durations, dtype=np.float64)
+        order = np.argsort(begin, kind="stable")
+        begin, end = begin[order], end[order]
+        reached = np.maximum.accumulate(end)
+        previous = np.concatenate(([begin[0]], reached[:-1]))
+        return float(np.clip(end - np.maximum(begin, previous), 0, None).sum())
+    covered = 0.0
+    reached = None
+    for begin, length in sorted(zip(starts, durations)):
+        end = begin + length
+        start = begin if reached is None else max(begin, reached)
+        covered += max(0.0, end - start)
+        reached = end if reached is None else max(reached, end)
+    return covered
+
+
+def _language_confidence(windows: List[List[str]], language_code: str) -> Optional[float]:
+    function_words = _FUNCTION_WORDS.get(language_code.split("-")[0].lower())
+    sampled = sum(len(window) for window in windows)
+    if function_words is None or not sampled:
+        return None
+    found = sum(1 for window in windows for token in window if token in function_words)
+    return min(1.0, found / sampled / _FUNCTION_WORD_SHARE)
+
+
+def assess_transcript(transcript: Transcript) -> QualityReport:
+    """
+    Compute the quality metrics of ``transcript`` and the hard limits it fails.
+    """
+    np = _get_numpy()
+    starts, durations, buffer, offsets = transcript.columns()
+
+    # One pass over the whole text buffer for tags and words; lowercasing
+    # keeps segment offsets valid unless it changed the length.
+    lowered = buffer.lower()
+    if len(lowered) == len(buffer):
+        lines = [lowered[a:b - 1].strip() for a, b in zip(offsets, offsets[1:])]
+    else:
+        lines = [buffer[a:b - 1].lower() for a, b in zip(offsets, offsets[1:])]
+        lowered = " ".join(lines)
+        lines = [line.strip() for line in lines]
+    non_speech = 0
+    if any(mark in lowered for mark in _NON_SPEECH_MARKS):
+        non_speech = len(_NON_SPEECH_RE.findall(lowered))
+        if non_speech:
+            lowered = _NON_SPEECH_RE.sub(" ", lowered)
+    tokens = lowered.translate(_PUNCTUATION).split()
+    windows = _windows(tokens)
+
+    words = len(tokens)
+    covered = _covered_seconds(starts, durations, np)
+    report = QualityReport(
+        words=words,
+        segments=len(starts),
+        lexical_diversity=_lexical_diversity(windows, np),
+        non_speech_ratio=non_speech / (non_speech + words) if non_speech + words else 0.0,
+        repetition_rate=_repetition_rate(lines, np),
+        words_per_second=words / covered if covered else 0.0,
+        language_confidence=_language_confidence(windows, transcript.language_code or ""),
+    )
+    report.issues = _issues(report, covered)
+    return report
+
+
+def _issues(report: QualityReport, covered: float) -> List[str]:
+    issues = []
+    if not report.words:
+        return ["no speech in the captions"]
+    if report.non_speech_ratio > MAX_NON_SPEECH_RATIO:
+        issues.append(f"{report.non_speech_ratio:.0%} of captions are non-speech tags")
+    if report.segments >= MIN_SEGMENTS_TO_JUDGE and report.repetition_rate > MAX_REPETITION_RATE:
+        issues.append(f"{report.repetition_rate:.0%} of segments repeat earlier ones")
+    if report.words >= MIN_WORDS_TO_JUDGE:
+        if report.lexical_diversity < MIN_LEXICAL_DIVERSITY:
+            issues.append(f"lexical diversity {report.lexical_diversity:.2f} is too low")
+        if covered and not MIN_WORDS_PER_SECOND <= report.words_per_second <= MAX_WORDS_PER_SECOND:
+            issues.append(f"{report.words_per_second:.2f} words per second is not speech")
+    return issues
+
+
+def weakest_metrics(report: QualityReport, limit: int = 2) -> List[Tuple[str, float]]:
+    """
+    The lowest-scoring components below 1, worst first, for feedback.
+    """
+    ranked = sorted((score, name) for name, score in report.components().items() if score < 1.0)
+    return [(name, score) for score, name in ranked[:limit]]
@@ -0,0 +1,748 @@
+"""
+Inverted full-text index over processed transcripts, answering term and
+phrase queries with links to the moment each match is spoken.
+
+The index is a directory of immutable run files plus a manifest naming
+them, oldest first. New videos are tokenized in memory and written as a
+new run by flush(); runs are then merged pairwise while the previous one
+is no larger than the new one, so there are O(log n) runs and each video
+is rewritten O(log n) times. Every run is memory-mapped:
+
+    magic    b"FTI1", u32 documents, u32 terms, u32 reserved
+    u64[t+1] byte offsets of each term in the term blob
+    u64[t+1] byte offsets of each term's postings in the postings blob
+    u64[t]   where each term's positions start within its postings
+    u64[d+1] byte offsets of each document entry in the document blob
+    u32[t]   number of documents containing each term
+    u32[t]   last document containing each term
+    bytes    UTF-8 terms, sorted, concatenated
+    bytes    postings
+    bytes    document entries
+
+A term's postings are a document list of varint triples (document delta,
+occurrences, bytes of positions) followed by the delta-coded word
+positions of each listed document. Positions count words from the start
+of the transcript, so phrases match across segment boundaries; a
+document entry maps them back to segment start times. Because document
+numbers are local to a run, merging two runs only concatenates their
+postings and re-encodes the first document delta of the newer one.
+
+Queries rank videos by number of matches. Candidates are visited in
+order of an upper bound on that number (the occurrence counts in the
+document lists), and position lists are decoded only until no remaining
+candidate can beat the results found so far. With NumPy, phrases are
+counted exactly for all candidates by decoding the phrase words'
+position lists in bulk, since common words make the bound too loose.
+
+Usage:
+    python -m project.tools.search_index search index_dir '"gradient descent" python'
+"""
+import argparse
+import heapq
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from project.core.observability import get_logger
+from project.tools.timestamps import _get_numpy
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, keep one writer per directory
+    fcntl = None
+
+SEARCH_INDEX_ENV = "SEARCH_INDEX_PATH"
+
+_MAGIC = b"FTI1"
+_HEADER = struct.Struct("=4sIII")
+_MANIFEST = "manifest.json"
+_LOCK_FILE = "index.lock"
+_WORD_RE = re.compile(r"\w+")
+_QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def video_link(video_id: str, seconds: float) -> str:
+    """
+    youtu.be link that starts playback at ``seconds`` (whole seconds).
+    """
+    return f"https://youtu.be/{video_id}?t={int(seconds)}"
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def parse_query(query: str) -> List[Tuple[str, ...]]:
+    """
+    Split a query into clauses: each "quoted phrase" or bare word is one
+    clause of one or more tokens, and a video must match every clause.
+    """
+    clauses = []
+    for phrase, word in _QUERY_RE.findall(query):
+        tokens = tuple(tokenize(phrase or word))
+        if tokens:
+            clauses.append(tokens)
+    return clauses
+
+
+def _encode(values: Iterable[int], out: bytearray) -> None:
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+
+def _decode(data: bytes) -> List[int]:
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def _decode_one(data: bytes, position: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+def _decode_numpy(np, data: bytes):
+    raw = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(raw < 0x80)
+    if len(ends) == len(raw):
+        return raw.astype(np.int64)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    shifts = (np.arange(len(raw)) - np.repeat(starts, ends - starts + 1)) * 7
+    parts = (raw & 0x7F).astype(np.int64) << shifts
+    return np.bitwise_or.reduceat(parts, starts)
+
+
+def _positions(data: bytes) -> List[int]:
+    positions = _decode(data)
+    for i in range(1, len(positions)):
+        positions[i] += positions[i - 1]
+    return positions
+
+
+@dataclass
+class SearchResult:
+    """
+    One matching video: its number of matches and the start times (seconds)
+    of the segments they occur in.
+    """
+    video_id: str
+    matches: int
+    starts: List[float]
+
+    @property
+    def url(self) -> str:
+        return video_link(self.video_id, self.starts[0] if self.starts else 0)
+
+    @property
+    def links(self) -> List[str]:
+        return [video_link(self.video_id, start) for start in self.starts]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "video_id": self.video_id,
+            "matches": self.matches,
+            "starts": self.starts,
+            "links": self.links,
+        }
+
+
+class _Run:
+    """
+    One memory-mapped run file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.documents, self.terms, _ = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a search index run: {path}")
+        view = memoryview(self._mmap)
+        position = _HEADER.size
+        t, d = self.terms, self.documents
+        self._views = []
+        for name, count, code in (
+            ("term_offsets", t + 1, "Q"),
+            ("postings_offsets", t + 1, "Q"),
+            ("position_offsets", t, "Q"),
+            ("entry_offsets", d + 1, "Q"),
+            ("df", t, "I"),
+            ("last_doc", t, "I"),
+        ):
+            size = count * (8 if code == "Q" else 4)
+            part = view[position:position + size].cast(code)
+            setattr(self, name, part)
+            self._views.append(part)
+            position += size
+        self.term_blob = position
+        self.postings_blob = self.term_blob + self.term_offsets[t]
+        self.document_blob = self.postings_blob + self.postings_offsets[t]
+
+    def close(self) -> None:
+        for part in self._views:
+            part.release()
+        self._views = []
+        self._mmap.close()
+
+    def term(self, i: int) -> bytes:
+        start = self.term_blob
+        return self._mmap[start + self.term_offsets[i]:start + self.term_offsets[i + 1]]
+
+    def lookup(self, term: str) -> Optional[int]:
+        key = term.encode("utf-8")
+        lo, hi = 0, self.terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.terms and self.term(lo) == key:
+            return lo
+        return None
+
+    def document_list(self, i: int) -> bytes:
+        start = self.postings_blob
+        return self._mmap[start + self.postings_offsets[i]:start + self.position_offsets[i]]
+
+    def position_bytes(self, i: int, start: int, end: int) -> bytes:
+        base = self.postings_blob + self.position_offsets[i]
+        return self._mmap[base + start:base + end]
+
+    def postings(self, i: int) -> Tuple[bytes, bytes]:
+        start = self.postings_blob
+        split = start + self.position_offsets[i]
+        return self._mmap[start + self.postings_offsets[i]:split], \
+            self._mmap[split:start + self.postings_offsets[i + 1]]
+
+    def entry(self, doc: int) -> bytes:
+        start = self.document_blob
+        return self._mmap[start + self.entry_offsets[doc]:start + self.entry_offsets[doc + 1]]
+
+    def video_id(self, doc: int) -> str:
+        data = self.entry(doc)
+        length, position = _decode_one(data, 0)
+        return data[position:position + length].decode("utf-8")
+
+    def segments(self, doc: int) -> Tuple[str, List[int], List[int]]:
+        """
+        Video ID, first word position of each segment, and segment start times (ms).
+        """
+        data = self.entry(doc)
+        length, position = _decode_one(data, 0)
+        video_id = data[position:position + length].decode("utf-8")
+        values = _decode(data[position + length:])
+        count = values[0]
+        offsets = values[1:1 + count]
+        for i in range(1, count):
+            offsets[i] += offsets[i - 1]
+        return video_id, offsets, values[1 + count:1 + 2 * count]
+
+
+class _Postings:
+    """
+    A term's decoded document list within one run.
+    """
+
+    def __init__(self, run: _Run, term: int, np) -> None:
+        self.run = run
+        self.term = term
+        data = run.document_list(term)
+        if np is not None:
+            triples = _decode_numpy(np, data).reshape(-1, 3)
+            self.docs = np.cumsum(triples[:, 0])
+            self.counts = triples[:, 1]
+            self.ends = np.cumsum(triples[:, 2])
+            self._index = None
+        else:
+            values = _decode(data)
+            self.docs, self.counts, self.ends = [], [], []
+            doc = end = 0
+            for i in range(0, len(values), 3):
+                doc += values[i]
+                end += values[i + 2]
+                self.docs.append(doc)
+                self.counts.append(values[i + 1])
+                self.ends.append(end)
+            self._index = {doc: i for i, doc in enumerate(self.docs)}
+
+    def find(self, doc: int) -> int:
+        if self._index is not None:
+            return self._index[doc]
+        return int(self.docs.searchsorted(doc))
+
+    def positions(self, doc: int) -> List[int]:
+        i = self.find(doc)
+        start = int(self.ends[i - 1]) if i else 0
+        return _positions(self.run.position_bytes(self.term, start, int(self.ends[i])))
+
+    def keys(self, np):
+        """
+        Every occurrence as a sorted ``document << 32 | position`` array.
+        """
+        values = _decode_numpy(np, self.run.position_bytes(self.term, 0, int(self.ends[-1])))
+        firsts = np.cumsum(self.counts) - self.counts
+        totals = np.cumsum(values)
+        positions = totals - np.repeat(totals[firsts] - values[firsts], self.counts)
+        return (np.repeat(self.docs, self.counts) << 32) | positions
+
+
+class TranscriptSearchIndex:
+    """
+    Incrementally built inverted index of transcripts, searched by term and
+    phrase.
+
+    add() buffers a video in memory; it becomes searchable after flush(),
+    which runs automatically every ``flush_every`` videos. Searching and
+    flushing are safe across threads and, where fcntl is available, across
+    processes: flush() holds an exclusive lock on the directory and first
+    picks up the runs other writers committed. Readers in other processes
+    see new runs after reload().
+    """
+
+    def __init__(self, path: str, flush_every: int = 1) -> None:
+        self.logger = get_logger("TranscriptSearchIndex")
+        self.path = path
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._runs: List[_Run] = []
+        self._next_run = 1
+        self._videos: Set[str] = set()
+        # Video IDs of each mapped run, so runs this process wrote or merged
+        # never have their document entries decoded again.
+        self._run_videos: Dict[str, Set[str]] = {}
+        self._reset_pending()
+        os.makedirs(path, exist_ok=True)
+        self.reload()
+
+    @classmethod
+    def from_env(cls) -> Optional["TranscriptSearchIndex"]:
+        """
+        Open the index directory named by SEARCH_INDEX_PATH, or None if unset.
+        """
+        path = os.environ.get(SEARCH_INDEX_ENV)
+        return cls(path) if path else None
+
+    def _reset_pending(self) -> None:
+        self._pending_terms: Dict[str, List[Tuple[int, List[int]]]] = {}
+        self._pending_documents: List[bytes] = []
+        self._pending_videos: Set[str] = set()
+
+    def reload(self) -> None:
+        """
+        Re-read the manifest and map the runs it names.
+        """
+        with self._lock, self._directory_lock(exclusive=False):
+            self._load()
+
+    @contextmanager
+    def _directory_lock(self, exclusive: bool) -> Iterator[None]:
+        # Writers in other processes rename and delete runs; hold this while
+        # reading the manifest or changing the directory.
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.path, _LOCK_FILE), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load(self) -> None:
+        manifest = os.path.join(self.path, _MANIFEST)
+        if not os.path.exists(manifest):
+            self._map([])
+            self._videos = set()
+            return
+        with open(manifest, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self._next_run = data["next_run"]
+        self._map([os.path.join(self.path, name) for name in data["runs"]])
+
+    def _map(self, paths: List[str]) -> None:
+        # Runs are immutable, so the ones already mapped are kept and only
+        # runs committed since are opened. Merging never drops a video, so
+        # the set of indexed videos only grows.
+        mapped = {run.path: run for run in self._runs}
+        runs = []
+        for path in paths:
+            run = mapped.pop(path, None)
+            if run is None:
+                run = _Run(path)
+                videos = self._run_videos.get(path)
+                if videos is None:
+                    videos = {run.video_id(doc) for doc in range(run.documents)}
+                    self._run_videos[path] = videos
+                self._videos.update(videos)
+            runs.append(run)
+        for run in mapped.values():
+            run.close()
+        self._runs = runs
+        self._run_videos = {path: self._run_videos[path] for path in paths}
+
+    @property
+    def documents(self) -> int:
+        return sum(run.documents for run in self._runs)
+
+    def __len__(self) -> int:
+        return len(self._videos)
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._videos or video_id in self._pending_videos
+
+    def add(self, video_id: str, segments: Iterable[Dict]) -> bool:
+        """
+        Index one video's timestamped segments ({'start', 'text'} dicts, or a
+        Transcript). Returns False if the video is already indexed.
+        """
+        with self._lock:
+            if video_id in self:
+                return False
+            doc = len(self._pending_documents)
+            positions: Dict[str, List[int]] = {}
+            offsets, starts = [], []
+            position = 0
+            for segment in segments:
+                offsets.append(position)
+                starts.append(int(round(segment["start"] * 1000)))
+                for token in tokenize(segment["text"]):
+                    positions.setdefault(token, []).append(position)
+                    position += 1
+            for token, found in positions.items():
+                self._pending_terms.setdefault(token, []).append((doc, found))
+
+            encoded = video_id.encode("utf-8")
+            entry = bytearray()
+            _encode((len(encoded),), entry)
+            entry += encoded
+            _encode([len(offsets)] + [b - a for a, b in zip([0] + offsets, offsets)] + starts, entry)
+            self._pending_documents.append(bytes(entry))
+            self._pending_videos.add(video_id)
+            due = self.flush_every and len(self._pending_documents) >= self.flush_every
+        if due:
+            self.flush()
+        return True
+
+    def flush(self) -> None:
+        """
+        Write pending videos as a new run, then merge runs as needed.
+        """
+        with self._lock:
+            if not self._pending_documents:
+                return
+            with self._directory_lock(exclusive=True):
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        # Start from the runs committed since our last look, so run numbers
+        # and merges never collide with another writer's.
+        self._load()
+        runs = [run.path for run in self._runs]
+        try:
+            runs.append(self._write_pending())
+            runs = self._merge_tail(runs)
+            self._commit(runs)
+        except BaseException:
+            # Another writer may reuse the numbers of runs that were never committed.
+            self._run_videos = {run.path: self._run_videos[run.path] for run in self._runs}
+            raise
+        self._reset_pending()
+
+    def _run_path(self) -> str:
+        name = f"run-{self._next_run:06d}.fti"
+        self._next_run += 1
+        return os.path.join(self.path, name)
+
+    def _write_pending(self) -> str:
+        terms = []
+        for term in sorted(self._pending_terms, key=lambda t: t.encode("utf-8")):
+            listing = bytearray()
+            positions = bytearray()
+            previous = 0
+            for doc, found in self._pending_terms[term]:
+                block = bytearray()
+                _encode([found[0]] + [b - a for a, b in zip(found, found[1:])], block)
+                _encode((doc - previous, len(found), len(block)), listing)
+                positions += block
+                previous = doc
+            docs = self._pending_terms[term]
+            terms.append((term.encode("utf-8"), bytes(listing), bytes(positions), len(docs), docs[-1][0]))
+        path = self._run_path()
+        _write_run(path, len(self._pending_documents), terms, [self._pending_documents])
+        self._run_videos[path] = set(self._pending_videos)
+        return path
+
+    def _merge_tail(self, paths: List[str]) -> List[str]:
+        runs = [_Run(path) for path in paths]
+        try:
+            while len(runs) > 1 and runs[-2].documents <= runs[-1].documents:
+                older, newer = runs[-2], runs[-1]
+                path = self._run_path()
+                _merge_runs(older, newer, path)
+                self._run_videos[path] = self._run_videos[older.path] | self._run_videos[newer.path]
+                merged = _Run(path)
+                for run in (older, newer):
+                    if run.path not in [r.path for r in self._runs]:
+                        run.close()
+                        os.remove(run.path)
+                runs[-2:] = [merged]
+            return [run.path for run in runs]
+        finally:
+            for run in runs:
+                run.close()
+
+    def _commit(self, paths: List[str]) -> None:
+        manifest = os.path.join(self.path, _MANIFEST)
+        temporary = manifest + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"runs": [os.path.basename(p) for p in paths], "next_run": self._next_run}, f)
+        os.replace(temporary, manifest)
+        obsolete = [run.path for run in self._runs if run.path not in paths]
+        self._map(paths)
+        for path in obsolete:
+            try:
+                os.remove(path)
+            except OSError:
+                # Still mapped by another process on platforms that lock open files.
+                self.logger.warning("Could not remove merged run %s.", path)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._map([])
+
+    def search(self, query: str, limit: int = 10) -> List[SearchResult]:
+        """
+        Videos matching every clause of ``query`` (see parse_query), most
+        matches first, with the start times of the segments that match.
+        """
+        clauses = parse_query(query)
+        if not clauses or limit <= 0:
+            return []
+        np = _get_numpy()
+        with self._lock:
+            candidates = self._candidates(clauses, np)
+            best: List[Tuple[int, int, Tuple[_Run, int, List[int]]]] = []
+            for bound, order, (run, doc, postings) in candidates:
+                if len(best) == limit and bound <= best[0][0]:
+                    break
+                positions = self._matches(clauses, postings, doc)
+                if not positions:
+                    continue
+                item = (len(positions), -order, (run, doc, positions))
+                if len(best) < limit:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+
+            results = []
+            for matches, _, (run, doc, positions) in sorted(best, reverse=True):
+                video_id, offsets, starts = run.segments(doc)
+                segments = sorted({bisect_right(offsets, p) - 1 for p in positions})
+                results.append(SearchResult(video_id, matches, [starts[s] / 1000 for s in segments]))
+        return results
+
+    def _candidates(self, clauses: Sequence[Tuple[str, ...]], np) -> Iterator[Tuple[int, int, Tuple]]:
+        # Yields (upper bound on matches, tie-breaker, (run, doc, postings by token)),
+        # largest bound first; earlier videos win ties.
+        tokens = sorted({token for clause in clauses for token in clause})
+        found = []
+        for run in self._runs:
+            postings = {}
+            for token in tokens:
+                term = run.lookup(token)
+                if term is None:
+                    break
+                postings[token] = _Postings(run, term, np)
+            else:
+                found.append((run, postings))
+
+        if np is not None:
+            bounds, owners, docs = [], [], []
+            for owner, (run, postings) in enumerate(found):
+                common = None
+                for p in sorted(postings.values(), key=lambda p: len(p.docs)):
+                    common = p.docs if common is None else np.intersect1d(common, p.docs, assume_unique=True)
+                bound = np.zeros(len(common), dtype=np.int64)
+                for clause in clauses:
+                    if len(clause) == 1:
+                        p = postings[clause[0]]
+                        bound += p.counts[p.docs.searchsorted(common)]
+                    else:
+                        bound += self._phrase_counts(np, clause, postings, common)
+                # Bounds are exact here, so documents without a match can be dropped.
+                keep = bound > 0
+                bounds.append(bound[keep])
+                owners.append(np.full(int(keep.sum()), owner))
+                docs.append(common[keep])
+            if not bounds:
+                return
+            bounds, owners, docs = np.concatenate(bounds), np.concatenate(owners), np.concatenate(docs)
+            for order, i in enumerate(np.argsort(-bounds, kind="stable")):
+                run, postings = found[owners[i]]
+                yield int(bounds[i]), order, (run, int(docs[i]), postings)
+            return
+
+        ranked = []
+        for owner, (run, postings) in enumerate(found):
+            common = set.intersection(*(set(p.docs) for p in postings.values()))
+            for doc in sorted(common):
+                bound = sum(
+                    min(postings[token].counts[postings[token].find(doc)] for token in clause)
+                    for clause in clauses
+                )
+                ranked.append((-bound, owner, doc))
+        ranked.sort()
+        for order, (bound, owner, doc) in enumerate(ranked):
+            run, postings = found[owner]
+            yield -bound, order, (run, doc, postings)
+
+    @staticmethod
+    def _phrase_counts(np, clause: Tuple[str, ...], postings: Dict[str, "_Postings"], docs):
+        # Occurrences of the phrase in each of ``docs``, from whole position lists at once.
+        hits = postings[clause[0]].keys(np)
+        for offset, token in enumerate(clause[1:], 1):
+            keys = postings[token].keys(np)
+            wanted = hits + offset
+            found = keys.searchsorted(wanted)
+            found[found == len(keys)] = 0
+            hits = hits[keys[found] == wanted] if len(keys) else hits[:0]
+        owners = docs.searchsorted(hits >> 32)
+        inside = owners < len(docs)
+        owners = owners[inside]
+        owners = owners[docs[owners] == (hits[inside] >> 32)]
+        return np.bincount(owners, minlength=len(docs))
+
+    @staticmethod
+    def _matches(clauses: Sequence[Tuple[str, ...]], postings: Dict[str, _Postings], doc: int) -> List[int]:
+        # Word positions where each clause matches; empty unless every clause does.
+        positions: Dict[str, List[int]] = {}
+        matched = []
+        for clause in clauses:
+            for token in clause:
+                if token not in positions:
+                    positions[token] = postings[token].positions(doc)
+            hits = positions[clause[0]]
+            for offset, token in enumerate(clause[1:], 1):
+                following = set(positions[token])
+                hits = [p for p in hits if p + offset in following]
+            if not hits:
+                return []
+            matched.extend(hits)
+        return matched
+
+
+def _write_run(path: str, documents: int, terms: Sequence[Tuple], entries: Sequence[Sequence[bytes]]) -> None:
+    # terms: sorted (term bytes, document list, positions, df, last document);
+    # entries: document entries in order, possibly split across several lists.
+    term_offsets, postings_offsets, position_offsets = array("Q", [0]), array("Q", [0]), array("Q")
+    df, last_doc = array("I"), array("I")
+    for term, listing, positions, count, last in terms:
+        term_offsets.append(term_offsets[-1] + len(term))
+        position_offsets.append(postings_offsets[-1] + len(listing))
+        postings_offsets.append(position_offsets[-1] + len(positions))
+        df.append(count)
+        last_doc.append(last)
+    entry_offsets = array("Q", [0])
+    for part in entries:
+        for entry in part:
+            entry_offsets.append(entry_offsets[-1] + len(entry))
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, documents, len(terms), 0))
+        for column in (term_offsets, postings_offsets, position_offsets, entry_offsets, df, last_doc):
+            f.write(column.tobytes())
+        for term, _, _, _, _ in terms:
+            f.write(term)
+        for _, listing, positions, _, _ in terms:
+            f.write(listing)
+            f.write(positions)
+        for part in entries:
+            for entry in part:
+                f.write(entry)
+    os.replace(temporary, path)
+
+
+def _merge_runs(older: _Run, newer: _Run, path: str) -> None:
+    # Newer documents are renumbered after the older ones: its postings are
+    # copied as they are, except for the first document delta.
+    def merged_terms() -> Iterator[Tuple]:
+        i = j = 0
+        while i < older.terms or j < newer.terms:
+            a = older.term(i) if i < older.terms else None
+            b = newer.term(j) if j < newer.terms else None
+            if b is None or (a is not None and a < b):
+                listing, positions = older.postings(i)
+                yield a, listing, positions, older.df[i], older.last_doc[i]
+                i += 1
+                continue
+            listing, positions = newer.postings(j)
+            first, rest = _decode_one(listing, 0)
+            count, last = newer.df[j], newer.last_doc[j] + older.documents
+            if a == b:
+                head = bytearray()
+                _encode((first + older.documents - older.last_doc[i],), head)
+                old_listing, old_positions = older.postings(i)
+                yield (a, old_listing + bytes(head) + listing[rest:], old_positions + positions,
+                       older.df[i] + count, last)
+                i += 1
+            else:
+                head = bytearray()
+                _encode((first + older.documents,), head)
+                yield b, bytes(head) + listing[rest:], positions, count, last
+            j += 1
+
+    entries = [[older.entry(d) for d in range(older.documents)], [newer.entry(d) for d in range(newer.documents)]]
+    _write_run(path, older.documents + newer.documents, list(merged_terms()), entries)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Search an index of processed transcripts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    search = sub.add_parser("search", help="Print the videos and moments matching a query")
+    search.add_argument("index", help="Index directory")
+    search.add_argument("query", help='Words and "quoted phrases", all of which must match')
+    search.add_argument("-n", "--limit", type=int, default=10, help="Maximum number of videos")
+    args = parser.parse_args(argv)
+
+    index = TranscriptSearchIndex(args.index)
+    for result in index.search(args.query, limit=args.limit):
+        print(f"{result.video_id}  {result.matches} matches")
+        for link in result.links:
+            print(f"    {link}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Per-section analysis of Planner chunks and the map-reduce merge into
+article-level summary, keywords and reading time.
+"""
+import os
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from project.tools.text_analysis import TextAnalysis
+from project.tools.tools import SEOKeywordGenerator, SimpleSummarizer
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# Bump when analyze_section output changes so memoized analyses are recomputed.
+SECTION_VERSION = "2"
+
+SECTION_WORKERS_ENV = "SECTION_WORKERS"
+
+# Below this many characters in total, sections are analyzed inline:
+# starting and feeding a pool costs more than it saves.
+PARALLEL_MIN_CHARS = 512 * 1024
+
+# Sentences kept per section for the merged summary.
+_LEAD_SENTENCES = 3
+
+# Spoken filler that ranks high in chatty sections but makes no heading.
+_HEADING_FILLER = frozenset({
+    "yeah", "like", "okay", "right", "just", "really", "know", "mean", "think", "well",
+    "gonna", "wanna", "gotta", "kind", "sort", "actually", "basically", "literally",
+    "thing", "things", "stuff", "something", "going", "saying", "said", "getting",
+    "pretty", "maybe", "anyway", "totally", "guys", "here", "some", "very", "even",
+    "much", "other", "only", "because", "these", "those", "were", "want", "make",
+})
+
+
+def section_heading(keywords: Sequence[str]) -> str:
+    """
+    "First and Second" from the top two keywords that are not spoken
+    filler; empty when none are left, so callers use a neutral heading.
+    """
+    topical = [k for k in keywords if k not in _HEADING_FILLER][:2]
+    return " and ".join(k.capitalize() for k in topical)
+
+
+_keyword_gen: Optional[SEOKeywordGenerator] = None
+
+
+def _get_keyword_gen() -> SEOKeywordGenerator:
+    # One generator (and corpus index mapping) per process, not per section.
+    global _keyword_gen
+    if _keyword_gen is None:
+        _keyword_gen = SEOKeywordGenerator()
+    return _keyword_gen
+
+
+def analyze_section(text: str, max_keywords: int = 5) -> Dict[str, Any]:
+    """
+    Map step: summary, keywords and sub-heading for one section, plus the
+    raw facets (word count, term counts, leading sentences) for the merge.
+    """
+    analysis = TextAnalysis(text)
+    keywords = _get_keyword_gen().generate(text, max_keywords, analysis=analysis)
+    return {
+        "heading": section_heading(keywords),
+        "summary": SimpleSummarizer().summarize(text, 1, analysis=analysis),
+        "keywords": keywords,
+        "word_count": analysis.word_count,
+        "term_counts": analysis.term_counts,
+        "sentences": analysis.sentences(_LEAD_SENTENCES),
+    }
+
+
+def merge_sections(text: str, results: Sequence[Dict[str, Any]]) -> TextAnalysis:
+    """
+    Reduce step: combine per-section facets into one TextAnalysis of ``text``.
+
+    Sections are merged in order, so term counts keep first-occurrence order
+    and ties in keyword ranking break exactly as a whole-text pass would,
+    provided the sections split ``text`` on whitespace. The summary also
+    matches when sections end on sentence boundaries, which the chunker
+    prefers.
+    """
+    word_count = 0
+    term_counts: Counter = Counter()
+    sentences: List[str] = []
+    for result in results:
+        word_count += result["word_count"]
+        term_counts.update(result["term_counts"])
+        if len(sentences) < _LEAD_SENTENCES:
+            sentences.extend(result["sentences"][:_LEAD_SENTENCES - len(sentences)])
+    return TextAnalysis.from_facets(text, word_count, term_counts, sentences)
+
+
+class SectionProcessor:
+    """
+    Runs analyze_section over a plan's sections, on a process pool when the
+    input is large enough to benefit.
+
+    Results always come back in section order, so the merged output is the
+    same whatever the worker count. The pool is created on first use and
+    reused; inside a pool worker (e.g. a batch run) sections are processed
+    inline rather than nesting pools.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_parallel_chars: int = PARALLEL_MIN_CHARS) -> None:
+        if workers is None:
+            configured = os.environ.get(SECTION_WORKERS_ENV)
+            workers = int(configured) if configured else min(4, os.cpu_count() or 1)
+        self.workers = max(1, workers)
+        self.min_parallel_chars = min_parallel_chars
+        self._pool: Optional["ProcessPoolExecutor"] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> "ProcessPoolExecutor":
+        # multiprocessing is only imported once sections are large enough to need it.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self._pool_lock:
+            if self._pool is None:
+                # Stages run on scheduler threads; forking then can copy a lock
+                # another thread holds, so workers come from a clean process.
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._pool
+
+    def _parallel(self, sections: Sequence[str]) -> bool:
+        if self.workers <= 1 or len(sections) <= 1:
+            return False
+        if sum(len(section) for section in sections) < self.min_parallel_chars:
+            return False
+        import multiprocessing
+
+        return multiprocessing.parent_process() is None
+
+    def process(self, sections: Sequence[str]) -> List[Dict[str, Any]]:
+        if not self._parallel(sections):
+            return [analyze_section(section) for section in sections]
+        # A few tasks per worker keeps the pool busy without per-section IPC.
+        chunksize = max(1, len(sections) // (self.workers * 4))
+        return list(self._get_pool().map(analyze_section, sections, chunksize=chunksize))
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
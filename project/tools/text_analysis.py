@@ -0,0 +1,121 @@
+"""
+Shared text analytics for the summarizer, keyword generator and reading-time estimate.
+"""
+import re
+from collections import Counter
+from typing import Iterator, List, Optional
+
+_WORD_RE = re.compile(r"\w+")
+_TERM_RE = re.compile(r"[a-zA-Z]{4,}")
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+class TextAnalysis:
+    """
+    Tokenizes a text once and serves every tool from the same result.
+
+    - ``word_count`` and ``term_counts`` come from a single ``\\w+`` scan.
+      Terms (lowercased runs of 4+ ASCII letters, as SEOKeywordGenerator
+      has always used) are derived from the distinct words rather than by
+      re-scanning the text.
+    - Sentences are split incrementally, so asking for the first three does
+      not split a multi-megabyte transcript to the end.
+
+    Each facet is computed on first access and cached.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._word_count: Optional[int] = None
+        self._term_counts: Optional[Counter] = None
+        self._sentences: List[str] = []
+        self._sentence_iter: Optional[Iterator[str]] = None
+        self._sentences_done = False
+
+    def _scan_words(self) -> None:
+        tokens = _WORD_RE.findall(self.text)
+        self._word_count = len(tokens)
+
+        # Counter keeps first-occurrence order, so most_common() breaks ties
+        # exactly like counting the full token stream would.
+        terms: Counter = Counter()
+        for token, count in Counter(tokens).items():
+            lowered = token.lower()
+            if lowered.isascii() and lowered.isalpha():
+                if len(lowered) >= 4:
+                    terms[lowered] += count
+            else:
+                for term in _TERM_RE.findall(lowered):
+                    terms[term] += count
+        self._term_counts = terms
+
+    @property
+    def word_count(self) -> int:
+        if self._word_count is None:
+            self._scan_words()
+        return self._word_count
+
+    @property
+    def term_counts(self) -> Counter:
+        """
+        Frequency of every lowercased 4+ letter term, stopwords included.
+        """
+        if self._term_counts is None:
+            self._scan_words()
+        return self._term_counts
+
+    @classmethod
+    def from_facets(
+        cls,
+        text: str,
+        word_count: int,
+        term_counts: Counter,
+        sentences: List[str],
+    ) -> "TextAnalysis":
+        """
+        Analysis of ``text`` assembled from precomputed facets, e.g. merged
+        per-section results. ``sentences`` are the leading sentences of
+        ``text``; any further ones are split on demand.
+        """
+        analysis = cls(text)
+        analysis._word_count = word_count
+        analysis._term_counts = term_counts
+        analysis._sentences = list(sentences)
+        return analysis
+
+    def __getstate__(self) -> dict:
+        # The sentence generator can't be pickled; a restored copy resumes
+        # splitting after the sentences already cached.
+        state = self.__dict__.copy()
+        state["_sentence_iter"] = None
+        state["_sentences"] = list(self._sentences)
+        return state
+
+    def _iter_sentences(self) -> Iterator[str]:
+        stripped = self.text.strip()
+        start = 0
+        for match in _SENTENCE_BREAK_RE.finditer(stripped):
+            sentence = stripped[start:match.start()].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+        sentence = stripped[start:].strip()
+        if sentence:
+            yield sentence
+
+    def sentences(self, limit: Optional[int] = None) -> List[str]:
+        """
+        Non-empty sentences split on '.', '!' and '?', up to ``limit`` of them.
+        """
+        if self._sentence_iter is None:
+            self._sentence_iter = self._iter_sentences()
+            # Skip sentences already known (restored or precomputed ones).
+            for _ in range(len(self._sentences)):
+                next(self._sentence_iter, None)
+        while not self._sentences_done and (limit is None or len(self._sentences) < limit):
+            sentence = next(self._sentence_iter, None)
+            if sentence is None:
+                self._sentences_done = True
+                break
+            self._sentences.append(sentence)
+        return self._sentences if limit is None else self._sentences[:limit]
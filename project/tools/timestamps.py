@@ -0,0 +1,118 @@
+"""
+Batched MM:SS / HH:MM:SS label formatting for timestamped transcripts.
+"""
+import math
+import threading
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+_NUMPY_CHECKED = False
+_numpy = None
+
+# Beyond this many seconds labels are formatted individually instead of
+# growing the shared lookup tables.
+_TABLE_LIMIT = 48 * 3600
+
+_tables = {False: [], True: []}
+_tables_lock = threading.Lock()
+
+
+def _get_numpy():
+    """
+    Import NumPy on first use; None when it is not installed.
+    """
+    global _NUMPY_CHECKED, _numpy
+    if not _NUMPY_CHECKED:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+        _NUMPY_CHECKED = True
+    return _numpy
+
+
+def format_seconds(total: int, hours: bool = False) -> str:
+    """
+    Format whole seconds as MM:SS, or HH:MM:SS when ``hours`` is set.
+    """
+    minutes, seconds = divmod(total, 60)
+    if hours:
+        h, minutes = divmod(minutes, 60)
+        return f"{h:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def _label_table(upto: int, hours: bool) -> List[str]:
+    """
+    Shared, grow-only table mapping whole seconds to labels.
+    """
+    table = _tables[hours]
+    if len(table) <= upto:
+        with _tables_lock:
+            table = _tables[hours]
+            if len(table) <= upto:
+                grown = table + [format_seconds(s, hours) for s in range(len(table), upto + 1)]
+                _tables[hours] = grown
+                table = grown
+    return table
+
+
+def format_time_labels(
+    starts: Sequence[float],
+    durations: Sequence[float],
+    hours: Optional[bool] = None,
+) -> Tuple[List[str], List[str]]:
+    """
+    Compute every segment's start and end label in one pass.
+
+    Seconds are floored exactly like ``int(t // 60)`` / ``int(t % 60)`` so
+    MM:SS output matches the previous per-segment formatting byte for byte.
+    When ``hours`` is None, HH:MM:SS is used for transcripts that run an
+    hour or longer and MM:SS otherwise. NumPy is used when available.
+    """
+    if not len(starts):
+        return [], []
+
+    np = _get_numpy()
+    if np is not None:
+        start_arr = np.asarray(starts, dtype=np.float64)
+        end_arr = start_arr + np.asarray(durations, dtype=np.float64)
+        start_secs = np.floor(start_arr).astype(np.int64)
+        end_secs = np.floor(end_arr).astype(np.int64)
+        lowest = int(start_secs.min())
+        last = int(max(start_secs.max(), end_secs.max()))
+        start_secs = start_secs.tolist()
+        end_secs = end_secs.tolist()
+    else:
+        floor = math.floor
+        start_secs = [floor(s) for s in starts]
+        end_secs = [floor(s + d) for s, d in zip(starts, durations)]
+        lowest = min(start_secs)
+        last = max(max(start_secs), max(end_secs))
+
+    if hours is None:
+        hours = last >= 3600
+
+    if lowest < 0 or min(end_secs) < 0 or last > _TABLE_LIMIT:
+        # Out-of-range input; format individually rather than via the table.
+        return (
+            [format_seconds(s, hours) for s in start_secs],
+            [format_seconds(e, hours) for e in end_secs],
+        )
+
+    table = _label_table(last, hours)
+    return [table[s] for s in start_secs], [table[e] for e in end_secs]
+
+
+def columns_of(segments) -> Tuple[Sequence[float], Sequence[float]]:
+    """
+    Start and duration columns for a Transcript or a list of segment dicts.
+    """
+    if hasattr(segments, "columns"):
+        starts, durations, _, _ = segments.columns()
+        return starts, durations
+    return (
+        array("d", (entry["start"] for entry in segments)),
+        array("d", (entry["duration"] for entry in segments)),
+    )
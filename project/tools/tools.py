@@ -1,15 +1,269 @@
-from typing import List, Dict, Optional
-import re
+from typing import TYPE_CHECKING, Any, Iterable, List, Dict, Optional, Set
+import math
+import os
+import threading
 from collections import Counter
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound, VideoUnavailable
+
+from project.core.observability import get_logger, span
+from project.tools.fetch_resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    InvalidVideoURL,
+    RetryPolicy,
+    TranscriptFetchError,
+    TranscriptUnavailable,
+    TransientFetchError,
+    classify_error,
+    create_session,
+)
+from project.tools import extractive
+from project.tools.keyword_index import CorpusIndex, document_terms, phrase_counts
+from project.tools.text_analysis import TextAnalysis
+from project.tools.transcript import Transcript
+from project.tools.transcript_cache import TranscriptCache
+from project.tools.video_id import extract_video_id
+
+if TYPE_CHECKING:
+    import requests
+
+# Imported on the first fetch: youtube_transcript_api pulls in requests and
+# urllib3, which dominate startup time for jobs that never go to YouTube.
+YouTubeTranscriptApi = None
+
+
+def _transcript_api_class():
+    global YouTubeTranscriptApi
+    if YouTubeTranscriptApi is None:
+        from youtube_transcript_api import YouTubeTranscriptApi as api_class
+        YouTubeTranscriptApi = api_class
+    return YouTubeTranscriptApi
 
 
 class TranscriptFetcher:
     """
     Real YouTube transcript fetcher using youtube-transcript-api.
+
+    When a TranscriptCache is configured (explicitly or through the
+    TRANSCRIPT_CACHE_PATH environment variable) transcripts are served from
+    it and only misses go to YouTube.
+
+    All requests share one pooled HTTP session. Transient failures (rate
+    limiting, 5xx, network errors) are retried with jittered exponential
+    backoff, and a circuit breaker stops calling YouTube for a while once
+    they keep failing. Pass ``session`` to swap the transport, e.g. a
+    requests.Session with a local stand-in adapter mounted in tests.
     """
 
+    language = "en"
+
+    def __init__(
+        self,
+        cache: Optional[TranscriptCache] = None,
+        session: Optional[Any] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.logger = get_logger("TranscriptFetcher")
+        self.cache = cache if cache is not None else TranscriptCache.from_env()
+        self._session = session
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._api = None
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {"requests": 0, "retries": 0, "errors": 0}
+        self._refreshing: Set[str] = set()
+        self._refresh_lock = threading.Lock()
+
+    def fetch_transcript(self, url_or_query: str) -> Transcript:
+        """
+        Fetch the transcript of a YouTube video in one list + fetch round trip.
+
+        Args:
+            url_or_query: YouTube URL or video ID
+
+        Returns:
+            A Transcript with timestamped segments and a lazy full-text view
+
+        Raises:
+            InvalidVideoURL: If no video ID can be extracted
+            TranscriptUnavailable: If the video has no usable transcript
+            TransientFetchError: If YouTube kept failing after all retries
+                (CircuitOpenError when the circuit breaker is open)
+        """
+        video_id = self._extract_video_id(url_or_query)
+
+        if not video_id:
+            raise InvalidVideoURL(f"Could not extract video ID from: {url_or_query}")
+
+        with span("transcript_fetch") as s:
+            if self.cache is None:
+                transcript = self._fetch_remote(video_id)
+                s.add(bytes=len(transcript.text))
+                return transcript
+
+            cached = self.cached_transcript(video_id)
+            if cached is not None:
+                s.add(bytes=len(cached.text), cache_hits=1)
+                return cached
+
+            transcript = self._fetch_remote(video_id)
+            self.cache.put(self.language, transcript)
+            s.add(bytes=len(transcript.text))
+            return transcript
+
+    def cached_transcript(self, url_or_query: str) -> Optional[Transcript]:
+        """
+        The cached transcript of a video, without calling YouTube; None
+        without a cache, for an unparseable URL, or on a miss.
+
+        Stale entries are returned and refreshed in the background, as
+        fetch_transcript does.
+        """
+        video_id = self._extract_video_id(url_or_query)
+        if self.cache is None or not video_id:
+            return None
+        entry = self.cache.get(video_id, self.language)
+        if entry is None:
+            return None
+        if not entry.fresh:
+            self._schedule_refresh(video_id)
+        return entry.transcript
+
+    def _schedule_refresh(self, video_id: str) -> None:
+        """
+        Re-fetch a stale cached transcript in the background, once per video.
+        """
+        with self._refresh_lock:
+            if video_id in self._refreshing:
+                return
+            self._refreshing.add(video_id)
+
+        def refresh() -> None:
+            try:
+                transcript = self._fetch_remote(video_id)
+                self.cache.put(self.language, transcript)
+            except TranscriptFetchError as e:
+                self.logger.warning("Background refresh of %s failed: %s", video_id, e)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(video_id)
+
+        threading.Thread(target=refresh, name=f"transcript-refresh-{video_id}", daemon=True).start()
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        The pooled HTTP session, created on first use.
+        """
+        if self._session is None:
+            self._session = create_session()
+        return self._session
+
+    @property
+    def api(self) -> Any:
+        """
+        The YouTubeTranscriptApi client, created once on top of the shared session.
+        """
+        if self._api is None:
+            self._api = _transcript_api_class()(http_client=self.session)
+        return self._api
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        stats["breaker"] = self.breaker.stats
+        return stats
+
+    def prometheus(self) -> str:
+        """
+        Fetch and circuit breaker counters in the Prometheus text exposition format.
+        """
+        stats = self.stats
+        breaker = stats.pop("breaker")
+        lines = []
+        for name, value in sorted(stats.items()):
+            lines.append(f"# TYPE yt_blog_transcript_fetch_{name}_total counter")
+            lines.append(f"yt_blog_transcript_fetch_{name}_total {value}")
+        for name in ("successes", "failures", "rejected", "opened"):
+            lines.append(f"# TYPE yt_blog_transcript_breaker_{name}_total counter")
+            lines.append(f"yt_blog_transcript_breaker_{name}_total {breaker[name]}")
+        lines.append("# TYPE yt_blog_transcript_breaker_open gauge")
+        lines.append(f"yt_blog_transcript_breaker_open {int(breaker['state'] != CircuitBreaker.CLOSED)}")
+        return "\n".join(lines) + "\n"
+
+    def _fetch_remote(self, video_id: str) -> Transcript:
+        """
+        Fetch a transcript from YouTube, bypassing the cache, with retries.
+        """
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(
+                    f"YouTube is failing; not fetching {video_id} for now",
+                    video_id,
+                    retry_after=self.breaker.retry_after(),
+                )
+            self._count("requests")
+            try:
+                transcript = self._fetch_once(video_id)
+            except Exception as e:
+                error = classify_error(e, video_id)
+                if not isinstance(error, TransientFetchError):
+                    # The upstream answered; the video itself is the problem.
+                    self.breaker.record_success()
+                    self._count("errors")
+                    raise error from e
+                self.breaker.record_failure()
+                attempt += 1
+                if attempt >= self.retry.attempts:
+                    self._count("errors")
+                    raise error from e
+                delay = self.retry.backoff(attempt - 1, error.retry_after)
+                self.logger.warning(
+                    "Transient error fetching %s (attempt %d/%d), retrying in %.2fs: %s",
+                    video_id, attempt, self.retry.attempts, delay, error,
+                )
+                self._count("retries")
+                self.retry.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return transcript
+
+    def _fetch_once(self, video_id: str) -> Transcript:
+        """
+        One list + fetch round trip; exceptions are classified by the caller.
+        """
+        from youtube_transcript_api._errors import NoTranscriptFound
+
+        api = self.api
+        transcript_list = api.list(video_id)
+
+        # Prefer the configured language, otherwise use the first available transcript
+        try:
+            transcript = transcript_list.find_transcript([self.language])
+        except NoTranscriptFound:
+            available = list(transcript_list)
+            if not available:
+                raise TranscriptUnavailable(f"No transcripts available for video: {video_id}", video_id)
+            transcript = available[0]
+
+        transcript_result = api.fetch(transcript.video_id, [transcript.language_code])
+
+        segments = (
+            {
+                'start': snippet.start,
+                'duration': snippet.duration,
+                'text': snippet.text
+            }
+            for snippet in transcript_result
+        )
+        return Transcript(video_id, transcript.language_code, segments)
+
     def fetch(self, url_or_query: str) -> str:
         """
         Fetch the actual transcript from a YouTube video.
@@ -21,77 +275,21 @@ class TranscriptFetcher:
             The complete transcript as a single string
             
         Raises:
-            ValueError: If video ID cannot be extracted or transcript is unavailable
+            InvalidVideoURL: If no video ID can be extracted
+            TranscriptUnavailable: If the video has no usable transcript
+            TransientFetchError: If YouTube kept failing after all retries
+            CircuitOpenError: If the circuit breaker is open; a
+                TransientFetchError with ``retry_after`` set
+            All of them subclass TranscriptFetchError, itself a ValueError.
         """
-        video_id = self._extract_video_id(url_or_query)
-        
-        if not video_id:
-            raise ValueError(f"Could not extract video ID from: {url_or_query}")
-        
-        try:
-            # Fetch the transcript
-            api = YouTubeTranscriptApi()
-            
-            # List available transcripts
-            transcript_list = api.list(video_id)
-            
-            # Try to find English transcript, or use first available
-            try:
-                transcript = transcript_list.find_transcript(['en'])
-            except:
-                # If English not available, use the first available transcript
-                transcript = transcript_list.find_generated_transcript(['en']) if transcript_list else None
-                if not transcript:
-                    available = list(transcript_list)
-                    if available:
-                        transcript = available[0]
-                    else:
-                        raise ValueError("No transcripts available")
-            
-            # Fetch the actual transcript data
-            transcript_result = api.fetch(transcript.video_id, [transcript.language_code])
-            
-            # Combine all transcript segments into a single string
-            full_transcript = " ".join([snippet.text for snippet in transcript_result])
-            
-            return full_transcript
-            
-        except TranscriptsDisabled:
-            raise ValueError(f"Transcripts are disabled for video: {video_id}")
-        except NoTranscriptFound:
-            raise ValueError(f"No transcript found for video: {video_id}")
-        except VideoUnavailable:
-            raise ValueError(f"Video is unavailable: {video_id}")
-        except Exception as e:
-            raise ValueError(f"Error fetching transcript: {str(e)}")
+        return self.fetch_transcript(url_or_query).text
     
     def _extract_video_id(self, url_or_query: str) -> Optional[str]:
         """
-        Extract video ID from various YouTube URL formats.
-        
-        Supports:
-        - https://www.youtube.com/watch?v=VIDEO_ID
-        - https://youtu.be/VIDEO_ID
-        - https://www.youtube.com/embed/VIDEO_ID
-        - https://www.youtube.com/v/VIDEO_ID
-        - Just the video ID itself
-        """
-        # Pattern for youtube.com/watch?v=
-        pattern1 = r'(?:youtube\.com\/watch\?v=)([a-zA-Z0-9_-]{11})'
-        # Pattern for youtu.be/
-        pattern2 = r'(?:youtu\.be\/)([a-zA-Z0-9_-]{11})'
-        # Pattern for youtube.com/embed/ or youtube.com/v/
-        pattern3 = r'(?:youtube\.com\/(?:embed|v)\/)([a-zA-Z0-9_-]{11})'
-        # Pattern for just the video ID (11 characters)
-        pattern4 = r'^([a-zA-Z0-9_-]{11})$'
-        
-        for pattern in [pattern1, pattern2, pattern3, pattern4]:
-            match = re.search(pattern, url_or_query)
-            if match:
-                return match.group(1)
-        
-        return None
-    
+        Extract video ID from a YouTube URL or bare ID (see extract_video_id).
+        """
+        return extract_video_id(url_or_query)
+
     def fetch_with_timestamps(self, url_or_query: str) -> List[Dict]:
         """
         Fetch transcript with timestamp information.
@@ -99,94 +297,170 @@ class TranscriptFetcher:
         Returns:
             List of dicts with 'start', 'duration', 'text' keys
         """
-        video_id = self._extract_video_id(url_or_query)
-        
-        if not video_id:
-            raise ValueError(f"Could not extract video ID from: {url_or_query}")
-        
-        try:
-            api = YouTubeTranscriptApi()
-            
-            # List available transcripts
-            transcript_list = api.list(video_id)
-            
-            # Try to find English transcript, or use first available
-            try:
-                transcript = transcript_list.find_transcript(['en'])
-            except:
-                # If English not available, use the first available transcript
-                transcript = transcript_list.find_generated_transcript(['en']) if transcript_list else None
-                if not transcript:
-                    available = list(transcript_list)
-                    if available:
-                        transcript = available[0]
-                    else:
-                        raise ValueError("No transcripts available")
-            
-            # Fetch the actual transcript data
-            transcript_result = api.fetch(transcript.video_id, [transcript.language_code])
-            
-            # Return list of timestamped segments
-            return [
-                {
-                    'start': snippet.start,
-                    'duration': snippet.duration,
-                    'text': snippet.text
-                }
-                for snippet in transcript_result
-            ]
-            
-        except TranscriptsDisabled:
-            raise ValueError(f"Transcripts are disabled for video: {video_id}")
-        except NoTranscriptFound:
-            raise ValueError(f"No transcript found for video: {video_id}")
-        except VideoUnavailable:
-            raise ValueError(f"Video is unavailable: {video_id}")
-        except Exception as e:
-            raise ValueError(f"Error fetching transcript: {str(e)}")
+        return list(self.fetch_transcript(url_or_query))
+
+
+SUMMARIZER_MODE_ENV = "SUMMARIZER_MODE"
 
 
 class SimpleSummarizer:
     """
-    Very simple extractive summarizer based on sentence splitting.
+    Extractive summarizer based on sentence splitting.
+
+    The default "lead" mode returns the first sentences, the original and
+    fastest behavior. "centroid" and "textrank" pick the most central
+    sentences by TF-IDF similarity instead (see project.tools.extractive),
+    which skips the greeting most videos open with. The mode comes from
+    SUMMARIZER_MODE when not given.
     """
 
-    def summarize(self, text: str, max_sentences: int = 3) -> str:
+    VERSION = "1"
+    EXTRACTIVE_VERSION = "1"
+    LEAD = "lead"
+    MODES = (LEAD,) + extractive.METHODS
+
+    def __init__(self, mode: Optional[str] = None) -> None:
+        mode = (mode or os.environ.get(SUMMARIZER_MODE_ENV) or self.LEAD).lower()
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown summarizer mode {mode!r}; expected one of {', '.join(self.MODES)}")
+        self.mode = mode
+
+    @property
+    def cache_version(self) -> str:
+        """
+        Identifies the summary output for memoization, including the mode.
+        """
+        if self.mode == self.LEAD:
+            return self.VERSION
+        return f"{self.VERSION}/{self.mode}{self.EXTRACTIVE_VERSION}"
+
+    def summarize(self, text: str, max_sentences: int = 3, analysis: Optional[TextAnalysis] = None) -> str:
         if not text:
             return ""
-        # Split on '.', '!', '?'
-        sentences = re.split(r'(?<=[.!?])\s+', text.strip())
-        sentences = [s.strip() for s in sentences if s.strip()]
-        return " ".join(sentences[:max_sentences])
+        analysis = analysis or TextAnalysis(text)
+        if self.mode == self.LEAD:
+            return " ".join(analysis.sentences(max_sentences))
+        units = extractive.split_units(text, analysis)
+        chosen = extractive.rank_units(units, max_sentences, self.mode, SEO_STOPWORDS)
+        return " ".join(units[i] for i in chosen)
+
+
+SEO_STOPWORDS = frozenset({
+    "this", "that", "with", "from", "your", "will", "into", "about",
+    "have", "there", "their", "which", "such", "also", "been", "they",
+    "them", "then", "than", "when", "where", "what", "would", "could",
+    "should", "video", "youtube", "using"
+})
 
 
 class SEOKeywordGenerator:
     """
-    Naive keyword extractor based on word frequency.
+    Keyword extractor.
+
+    Without a corpus index keywords are ranked by raw frequency (the
+    original, fastest behavior). With a CorpusIndex (explicitly or through
+    KEYWORD_INDEX_PATH) single terms and two-word phrases are ranked by
+    TF-IDF against the document frequencies of the whole article corpus, so
+    words every video uses stop crowding out the topical ones.
     """
 
-    def generate(self, text: str, max_keywords: int = 8) -> List[str]:
+    VERSION = "1"
+    TFIDF_VERSION = "1"
+    # Phrases are more specific than their words, so they win ties against them.
+    PHRASE_BOOST = 1.5
+
+    def __init__(self, index: Optional[CorpusIndex] = None) -> None:
+        self.index = index if index is not None else CorpusIndex.from_env()
+
+    @property
+    def cache_version(self) -> str:
+        """
+        Identifies the ranking for memoization, including the corpus snapshot used.
+        """
+        if self.index is None:
+            return self.VERSION
+        return f"{self.VERSION}/tfidf{self.TFIDF_VERSION}/{self.index.generation}"
+
+    def generate(self, text: str, max_keywords: int = 8, analysis: Optional[TextAnalysis] = None) -> List[str]:
         if not text:
             return []
-        # Lowercase and keep simple words
-        tokens = re.findall(r"[a-zA-Z]{4,}", text.lower())
-        stopwords = {
-            "this", "that", "with", "from", "your", "will", "into", "about",
-            "have", "there", "their", "which", "such", "also", "been", "they",
-            "them", "then", "than", "when", "where", "what", "would", "could",
-            "should", "video", "youtube", "using"
-        }
-        tokens = [t for t in tokens if t not in stopwords]
-        freq = Counter(tokens)
+        analysis = analysis or TextAnalysis(text)
+        if self.index is not None:
+            return self._rank_tfidf(text, analysis, max_keywords, {})
+        freq = Counter({
+            term: count
+            for term, count in analysis.term_counts.items()
+            if term not in SEO_STOPWORDS
+        })
         most_common = [w for w, _ in freq.most_common(max_keywords)]
         return most_common
 
+    def generate_batch(self, texts: Iterable[str], max_keywords: int = 8) -> List[List[str]]:
+        """
+        Keywords for many transcripts at once, sharing corpus lookups between them.
+        """
+        if self.index is None:
+            return [self.generate(text, max_keywords) for text in texts]
+        idf_cache: Dict[str, float] = {}
+        return [
+            self._rank_tfidf(text, TextAnalysis(text), max_keywords, idf_cache) if text else []
+            for text in texts
+        ]
+
+    def observe(self, text: str, analysis: Optional[TextAnalysis] = None, doc_id: Optional[str] = None) -> None:
+        """
+        Add a processed transcript to the corpus index, if one is configured.
+        """
+        if self.index is not None and text:
+            self.index.add_document(document_terms(text, SEO_STOPWORDS, analysis), doc_id=doc_id)
+
+    def _rank_tfidf(
+        self,
+        text: str,
+        analysis: TextAnalysis,
+        max_keywords: int,
+        idf_cache: Dict[str, float],
+    ) -> List[str]:
+        candidates: Dict[str, int] = {
+            term: count for term, count in analysis.term_counts.items() if term not in SEO_STOPWORDS
+        }
+        # Phrases must repeat to count as keywords.
+        for phrase, count in phrase_counts(text, SEO_STOPWORDS).items():
+            if count >= 2:
+                candidates[phrase] = count
+
+        def score(term: str) -> float:
+            idf = idf_cache.get(term)
+            if idf is None:
+                idf = idf_cache[term] = self.index.idf(term)
+            weight = (1.0 + math.log(candidates[term])) * idf
+            return weight * self.PHRASE_BOOST if " " in term else weight
+
+        # sorted() is stable, so ties keep first-occurrence order.
+        ranked = sorted(candidates, key=score, reverse=True)
+        keywords: List[str] = []
+        covered = set()
+        for term in ranked:
+            if term in covered:
+                continue
+            keywords.append(term)
+            if " " in term:
+                # A chosen phrase stands in for its words.
+                covered.update(term.split(" "))
+            if len(keywords) == max_keywords:
+                break
+        return keywords
+
 
-def estimate_reading_time(text: str, words_per_minute: int = 200) -> float:
+def estimate_reading_time(
+    text: str,
+    words_per_minute: int = 200,
+    analysis: Optional[TextAnalysis] = None,
+) -> float:
     """
     Rough estimate of reading time in minutes.
     """
-    words = re.findall(r"\w+", text)
-    if not words:
+    analysis = analysis or TextAnalysis(text)
+    if not analysis.word_count:
         return 0.0
-    return max(0.1, len(words) / float(words_per_minute))
+    return max(0.1, analysis.word_count / float(words_per_minute))
@@ -0,0 +1,209 @@
+"""
+Compact columnar transcript container.
+"""
+import hashlib
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+
+class Transcript:
+    """
+    Structured transcript returned by a single TranscriptFetcher round trip.
+
+    Segments are stored column-wise: starts and durations in array('d'),
+    and all segment texts in one space-joined buffer with an offsets array.
+    That buffer *is* the full-text view, so no second copy of the
+    transcript text is kept. Iterating yields the familiar
+    {'start', 'duration', 'text'} dicts one at a time for existing callers.
+
+    Slicing by index or by time (``between``) returns a Transcript that
+    shares the parent's columns and buffer instead of copying them.
+    """
+
+    def __init__(self, video_id: str, language_code: str, segments: Iterable[Dict]) -> None:
+        starts = array("d")
+        durations = array("d")
+        offsets = array("L", [0])
+        texts = []
+        position = 0
+        for segment in segments:
+            starts.append(segment["start"])
+            durations.append(segment["duration"])
+            texts.append(segment["text"])
+            position += len(segment["text"]) + 1
+            offsets.append(position)
+        self._init(video_id, language_code, starts, durations, " ".join(texts), offsets, 0, len(starts))
+
+    @classmethod
+    def from_columns(
+        cls,
+        video_id: str,
+        language_code: str,
+        starts: array,
+        durations: array,
+        buffer: str,
+        offsets: array,
+    ) -> "Transcript":
+        """
+        Build a transcript directly from its columns.
+
+        ``offsets`` has one entry per segment plus a final sentinel of
+        ``len(buffer) + 1``; segment i spans ``buffer[offsets[i]:offsets[i + 1] - 1]``.
+        """
+        transcript = cls.__new__(cls)
+        transcript._init(video_id, language_code, starts, durations, buffer, offsets, 0, len(starts))
+        return transcript
+
+    def _init(self, video_id, language_code, starts, durations, buffer, offsets, lo, hi) -> None:
+        self.video_id = video_id
+        self.language_code = language_code
+        self.starts = starts
+        self.durations = durations
+        self._buffer = buffer
+        self._offsets = offsets
+        self._lo = lo
+        self._hi = hi
+        self._text: Optional[str] = buffer if (lo == 0 and hi == len(starts)) else None
+        self._content_hash: Optional[str] = None
+
+    def _view(self, lo: int, hi: int) -> "Transcript":
+        view = Transcript.__new__(Transcript)
+        view._init(
+            self.video_id, self.language_code, self.starts, self.durations,
+            self._buffer, self._offsets, lo, hi,
+        )
+        return view
+
+    @property
+    def text(self) -> str:
+        """
+        The complete transcript as a single space-joined string.
+        """
+        if self._text is None:
+            if self._lo == self._hi:
+                self._text = ""
+            else:
+                self._text = self._buffer[self._offsets[self._lo]:self._offsets[self._hi] - 1]
+        return self._text
+
+    @property
+    def content_hash(self) -> str:
+        """
+        SHA-256 over the segment timings and text; identical transcripts
+        share a hash whatever video ID they were fetched under.
+        """
+        if self._content_hash is None:
+            starts, durations, buffer, offsets = self.columns()
+            digest = hashlib.sha256()
+            digest.update(starts.tobytes())
+            digest.update(durations.tobytes())
+            digest.update(array("Q", offsets).tobytes())
+            digest.update(buffer.encode("utf-8"))
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    @property
+    def segments(self) -> "Transcript":
+        """
+        Backwards-compatible alias: the transcript itself iterates as segment dicts.
+        """
+        return self
+
+    def segment_text(self, index: int) -> str:
+        i = self._lo + index
+        return self._buffer[self._offsets[i]:self._offsets[i + 1] - 1]
+
+    def text_span(self, index: int) -> Tuple[int, int]:
+        """
+        Character span of segment ``index`` within this transcript's ``text``.
+        """
+        base = self._offsets[self._lo]
+        i = self._lo + index
+        return self._offsets[i] - base, self._offsets[i + 1] - 1 - base
+
+    def between(self, start: float, end: float) -> "Transcript":
+        """
+        Segments overlapping the time range [start, end), found by binary search.
+
+        Assumes segments are ordered by start time, as YouTube returns them.
+        """
+        lo = bisect_right(self.starts, start, self._lo, self._hi) - 1
+        if lo < self._lo or self.starts[lo] + self.durations[lo] <= start:
+            lo += 1
+        lo = max(lo, self._lo)
+        hi = max(lo, bisect_left(self.starts, end, lo, self._hi))
+        return self._view(lo, hi)
+
+    @property
+    def duration(self) -> float:
+        """
+        End time of the last segment, in seconds.
+        """
+        if self._lo == self._hi:
+            return 0.0
+        last = self._hi - 1
+        return self.starts[last] + self.durations[last]
+
+    def __len__(self) -> int:
+        return self._hi - self._lo
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict, "Transcript"]:
+        if isinstance(index, slice):
+            lo, hi, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Transcript slices do not support steps")
+            return self._view(self._lo + lo, self._lo + max(lo, hi))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        i = self._lo + index
+        return {
+            'start': self.starts[i],
+            'duration': self.durations[i],
+            'text': self._buffer[self._offsets[i]:self._offsets[i + 1] - 1],
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        starts, durations, buffer, offsets = self.starts, self.durations, self._buffer, self._offsets
+        for i in range(self._lo, self._hi):
+            yield {
+                'start': starts[i],
+                'duration': durations[i],
+                'text': buffer[offsets[i]:offsets[i + 1] - 1],
+            }
+
+    def columns(self) -> Tuple[array, array, str, array]:
+        """
+        Starts, durations, text buffer and offsets for exactly this transcript.
+
+        Full transcripts return their own columns; views return re-based copies.
+        """
+        if self._lo == 0 and self._hi == len(self.starts):
+            return self.starts, self.durations, self._buffer, self._offsets
+        base = self._offsets[self._lo]
+        return (
+            self.starts[self._lo:self._hi],
+            self.durations[self._lo:self._hi],
+            self.text,
+            array("L", (o - base for o in self._offsets[self._lo:self._hi + 1])),
+        )
+
+    def __getstate__(self) -> Dict:
+        # Pickle only this view's rows so process pools don't ship the parent.
+        starts, durations, buffer, offsets = self.columns()
+        return {
+            "video_id": self.video_id,
+            "language_code": self.language_code,
+            "starts": starts,
+            "durations": durations,
+            "buffer": buffer,
+            "offsets": offsets,
+        }
+
+    def __setstate__(self, state: Dict) -> None:
+        self._init(
+            state["video_id"], state["language_code"], state["starts"], state["durations"],
+            state["buffer"], state["offsets"], 0, len(state["starts"]),
+        )
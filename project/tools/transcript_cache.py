@@ -0,0 +1,248 @@
+"""
+Persistent on-disk transcript cache backed by SQLite.
+"""
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from array import array
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from project.core.observability import get_logger
+from project.tools.transcript import Transcript
+
+CACHE_PATH_ENV = "TRANSCRIPT_CACHE_PATH"
+CACHE_TTL_ENV = "TRANSCRIPT_CACHE_TTL"
+CACHE_MAX_BYTES_ENV = "TRANSCRIPT_CACHE_MAX_BYTES"
+CACHE_SWR_ENV = "TRANSCRIPT_CACHE_STALE_WHILE_REVALIDATE"
+
+_HEADER = struct.Struct("<4sI")
+_FORMAT = b"TSC2"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    video_id TEXT NOT NULL,
+    language TEXT NOT NULL,
+    language_code TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (video_id, language)
+)
+"""
+
+
+def encode_transcript(transcript: Transcript) -> bytes:
+    """
+    Pack a transcript's columns into a compressed blob.
+
+    Layout: format tag, segment count, start/duration doubles, text offsets
+    and the UTF-8 full-text buffer, all zlib-compressed together.
+    """
+    starts, durations, buffer, offsets = transcript.columns()
+    raw = (
+        _HEADER.pack(_FORMAT, len(starts))
+        + starts.tobytes()
+        + durations.tobytes()
+        + array("Q", offsets).tobytes()
+        + buffer.encode("utf-8")
+    )
+    return zlib.compress(raw)
+
+
+def decode_transcript(video_id: str, language_code: str, payload: bytes) -> Transcript:
+    """
+    Inverse of encode_transcript; raises ValueError for unknown payload formats.
+    """
+    try:
+        raw = zlib.decompress(payload)
+        tag, count = _HEADER.unpack_from(raw)
+    except (zlib.error, struct.error) as e:
+        raise ValueError(f"Unreadable cache payload: {e}")
+    if tag != _FORMAT:
+        raise ValueError(f"Unknown cache payload format: {tag!r}")
+    pos = _HEADER.size
+
+    starts = array("d")
+    starts.frombytes(raw[pos:pos + 8 * count])
+    pos += 8 * count
+    durations = array("d")
+    durations.frombytes(raw[pos:pos + 8 * count])
+    pos += 8 * count
+    wide = array("Q")
+    wide.frombytes(raw[pos:pos + 8 * (count + 1)])
+    pos += 8 * (count + 1)
+
+    return Transcript.from_columns(
+        video_id, language_code, starts, durations,
+        raw[pos:].decode("utf-8"), array("L", wide),
+    )
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached transcript and whether it is still within its TTL.
+    """
+    transcript: Transcript
+    fresh: bool
+
+
+class TranscriptCache:
+    """
+    SQLite-backed transcript cache keyed by (video_id, language).
+
+    Entries expire after ``ttl_seconds``; once the stored payloads exceed
+    ``max_bytes`` the least recently accessed rows are evicted. Every call
+    opens its own connection and the database runs in WAL mode, so several
+    worker processes can share one cache file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+        stale_while_revalidate: bool = False,
+    ) -> None:
+        self.logger = get_logger("TranscriptCache")
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "stale_hits": 0, "evictions": 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["TranscriptCache"]:
+        """
+        Build a cache from TRANSCRIPT_CACHE_* environment variables, or None if unset.
+        """
+        path = os.environ.get(CACHE_PATH_ENV)
+        if not path:
+            return None
+        kwargs = {}
+        if os.environ.get(CACHE_TTL_ENV):
+            kwargs["ttl_seconds"] = float(os.environ[CACHE_TTL_ENV])
+        if os.environ.get(CACHE_MAX_BYTES_ENV):
+            kwargs["max_bytes"] = int(os.environ[CACHE_MAX_BYTES_ENV])
+        swr = os.environ.get(CACHE_SWR_ENV, "").lower() in ("1", "true", "yes")
+        return cls(path, stale_while_revalidate=swr, **kwargs)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+
+    def _bump(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def get(self, video_id: str, language: str) -> Optional[CacheEntry]:
+        """
+        Look up a transcript.
+
+        Expired rows are returned with ``fresh=False`` only in
+        stale-while-revalidate mode; otherwise they count as a miss.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT language_code, payload, created_at FROM transcripts "
+                "WHERE video_id = ? AND language = ?",
+                (video_id, language),
+            ).fetchone()
+            if row is None:
+                self._bump("misses")
+                return None
+
+            language_code, payload, created_at = row
+            fresh = now - created_at <= self.ttl_seconds
+            if not fresh and not self.stale_while_revalidate:
+                self._bump("misses")
+                return None
+
+            conn.execute(
+                "UPDATE transcripts SET accessed_at = ? WHERE video_id = ? AND language = ?",
+                (now, video_id, language),
+            )
+        finally:
+            conn.close()
+
+        try:
+            transcript = decode_transcript(video_id, language_code, payload)
+        except ValueError:
+            # Written by an older cache format; refetch and overwrite.
+            self._bump("misses")
+            return None
+
+        self._bump("hits" if fresh else "stale_hits")
+        return CacheEntry(transcript, fresh)
+
+    def put(self, language: str, transcript: Transcript) -> None:
+        """
+        Store a transcript and evict least recently used rows over the byte cap.
+        """
+        video_id = transcript.video_id
+        language_code = transcript.language_code
+        payload = encode_transcript(transcript)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO transcripts "
+                "(video_id, language, language_code, payload, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (video_id, language, language_code, payload, len(payload), now, now),
+            )
+            evicted = self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        if evicted:
+            self._bump("evictions", evicted)
+            self.logger.info("Evicted %d transcripts from cache.", evicted)
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()
+        if total <= self.max_bytes:
+            return 0
+
+        victims: List[Tuple[str, str]] = []
+        for video_id, language, size in conn.execute(
+            "SELECT video_id, language, size FROM transcripts ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            victims.append((video_id, language))
+            total -= size
+
+        conn.executemany(
+            "DELETE FROM transcripts WHERE video_id = ? AND language = ?",
+            victims,
+        )
+        return len(victims)
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM transcripts")
@@ -0,0 +1,87 @@
+"""
+Single-pass YouTube video ID extraction for single URLs and bulk URL lists.
+"""
+import re
+from typing import Iterable, Iterator, List, Optional
+
+# Hosts and path prefixes that are followed directly by an 11-character ID.
+# Subdomains (www., m., music.) are covered by matching on the registered name.
+_ID_HOSTS = ("youtube.com", "youtube-nocookie.com")
+_ID_PATHS = ("embed/", "v/", "e/", "shorts/", "live/")
+_SHORT_HOSTS = ("youtu.be",)
+
+_ID = r"([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+
+# Every supported host starts with this, so str.find (which runs in C)
+# locates candidates and the host pattern is only matched there.
+_HOST_MARKER = "youtu"
+
+
+def _build_host_pattern() -> "re.Pattern[str]":
+    hosts = "|".join(re.escape(host) for host in _ID_HOSTS)
+    paths = "|".join(re.escape(path) for path in _ID_PATHS)
+    short_hosts = "|".join(re.escape(host) for host in _SHORT_HOSTS)
+    # watch?v=ID anywhere in the query string, /<prefix>/ID, or youtu.be/ID
+    return re.compile(
+        rf"(?:(?:{hosts})/(?:watch/?\?(?:v=|[^#\s]*?&v=)|(?:{paths}))|(?:{short_hosts})/){_ID}"
+    )
+
+
+_HOST_RE = _build_host_pattern()
+_BARE_ID_RE = re.compile(r"\s*([A-Za-z0-9_-]{11})\s*\Z")
+
+
+def extract_video_id(url_or_query: str) -> Optional[str]:
+    """
+    Extract the video ID from a YouTube URL, or accept a bare 11-character ID.
+
+    Supports watch URLs (with ``v`` anywhere in the query string), youtu.be,
+    embed/, v/, e/, shorts/ and live/ links on www., m., music. and
+    youtube-nocookie.com hosts. Returns None when no ID is found.
+    """
+    find = url_or_query.find
+    match_host = _HOST_RE.match
+    pos = find(_HOST_MARKER)
+    while pos != -1:
+        before = url_or_query[pos - 1] if pos else "/"
+        if not (before.isalnum() or before in "_-"):
+            match = match_host(url_or_query, pos)
+            if match is not None:
+                return match.group(1)
+        pos = find(_HOST_MARKER, pos + 1)
+    match = _BARE_ID_RE.match(url_or_query)
+    return match.group(1) if match is not None else None
+
+
+def extract_video_ids(urls: Iterable[str]) -> List[str]:
+    """
+    Distinct video IDs from ``urls`` in first-seen order; unparseable entries are skipped.
+    """
+    extract = extract_video_id
+    seen = set()
+    add = seen.add
+    ids = []
+    append = ids.append
+    for url in urls:
+        video_id = extract(url)
+        if video_id is not None and video_id not in seen:
+            add(video_id)
+            append(video_id)
+    return ids
+
+
+def dedupe_urls(urls: Iterable[str]) -> Iterator[str]:
+    """
+    Yield each URL whose video ID has not been seen yet.
+
+    URLs without a recognizable ID are passed through so callers can
+    report them instead of dropping them silently.
+    """
+    seen = set()
+    for url in urls:
+        video_id = extract_video_id(url)
+        if video_id is None:
+            yield url
+        elif video_id not in seen:
+            seen.add(video_id)
+            yield url
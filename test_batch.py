@@ -0,0 +1,145 @@
+"""
+Tests for batch conversion against a stubbed transcript source.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import project.batch
+
+from project.batch import CHECKPOINT_FILENAME, HostRateLimiter, load_checkpoint, run_batch
+from project.tools.fetch_resilience import InvalidVideoURL, TranscriptUnavailable
+from project.tools.tools import TranscriptFetcher
+from project.tools.transcript import Transcript
+from project.tools.transcript_cache import TranscriptCache
+from project.tools.video_id import extract_video_id
+
+SPEECH = ("So today we are going to look at how attention works in a transformer, "
+          "and why every token can look at all the other tokens in the input.")
+
+
+class StubFetcher:
+    def __init__(self, unavailable=(), music=()):
+        self.unavailable = set(unavailable)
+        self.music = set(music)
+        self.fetched = []
+
+    def fetch_transcript(self, url_or_query):
+        video_id = extract_video_id(url_or_query)
+        if video_id is None:
+            raise InvalidVideoURL(f"Could not extract video ID from: {url_or_query}")
+        self.fetched.append(video_id)
+        if video_id in self.unavailable:
+            raise TranscriptUnavailable("Transcripts are disabled for this video", video_id)
+        if video_id in self.music:
+            return Transcript(video_id, "en", [{"start": 2.0 * i, "duration": 2.0, "text": "[Music]"} for i in range(30)])
+        return Transcript(video_id, "en", [
+            {"start": 4.0 * i, "duration": 4.0, "text": f"{SPEECH} Part {i} of video {video_id}."}
+            for i in range(5)
+        ])
+
+
+def checkpoint(tmp_path):
+    with open(tmp_path / CHECKPOINT_FILENAME, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_inline_batch_dedupes_and_records_failures(tmp_path):
+    fetcher = StubFetcher(unavailable={"bbbbbbbbbbb"})
+    urls = [
+        "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+        "https://youtu.be/aaaaaaaaaaa",
+        "bbbbbbbbbbb",
+        "not a video",
+        "https://m.youtube.com/watch?v=ccccccccccc",
+    ]
+    stats = run_batch(urls, str(tmp_path), processes=0, rate_limit=0, fetcher=fetcher)
+
+    assert (stats["converted"], stats["failed"], stats["skipped"]) == (2, 2, 0)
+    assert sorted(fetcher.fetched) == ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]
+    assert "Part 4 of video aaaaaaaaaaa" in (tmp_path / "aaaaaaaaaaa.md").read_text(encoding="utf-8")
+    errors = {entry["url"]: entry["error"] for entry in checkpoint(tmp_path) if entry["status"] == "error"}
+    assert "Transcripts are disabled" in errors["bbbbbbbbbbb"]
+    assert "Could not extract" in errors["not a video"]
+
+
+def test_resume_skips_converted_videos_in_any_url_form(tmp_path):
+    run_batch(["aaaaaaaaaaa", "bbbbbbbbbbb"], str(tmp_path), processes=0, rate_limit=0,
+              fetcher=StubFetcher(unavailable={"bbbbbbbbbbb"}))
+    assert load_checkpoint(str(tmp_path / CHECKPOINT_FILENAME)) == {"aaaaaaaaaaa"}
+    # A torn last line from a crash is ignored.
+    with open(tmp_path / CHECKPOINT_FILENAME, "a", encoding="utf-8") as f:
+        f.write('{"url": "ccccccccccc", "sta')
+
+    fetcher = StubFetcher()
+    stats = run_batch(["https://youtu.be/aaaaaaaaaaa", "bbbbbbbbbbb"], str(tmp_path),
+                      processes=0, rate_limit=0, fetcher=fetcher)
+    assert fetcher.fetched == ["bbbbbbbbbbb"]
+    assert (stats["converted"], stats["failed"], stats["skipped"]) == (1, 0, 1)
+
+
+def test_process_pool_batch_survives_rejected_transcripts(tmp_path):
+    urls = [f"https://youtu.be/video{i:06d}" for i in range(4)]
+    stats = run_batch(urls, str(tmp_path), processes=2, rate_limit=0, fetcher=StubFetcher(music={"video000001"}))
+
+    assert (stats["converted"], stats["failed"]) == (3, 1)
+    assert sorted(p.name for p in tmp_path.glob("*.md")) == [f"video{i:06d}.md" for i in (0, 2, 3)]
+    errors = [entry["error"] for entry in checkpoint(tmp_path) if entry["status"] == "error"]
+    assert errors == ["Transcript is not usable: no speech in the captions"]
+
+
+class GatedRenderPool(ThreadPoolExecutor):
+    """
+    Stands in for the render process pool; renders wait until the gate opens.
+    """
+    gate = threading.Event()
+
+    def __init__(self, max_workers, mp_context=None):
+        super().__init__(max_workers=max_workers)
+
+    def submit(self, fn, *args, **kwargs):
+        def gated():
+            self.gate.wait(10)
+            return fn(*args, **kwargs)
+        return super().submit(gated)
+
+
+def test_fetching_pauses_while_renders_are_backed_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(project.batch, "ProcessPoolExecutor", GatedRenderPool)
+    GatedRenderPool.gate.clear()
+    fetcher = StubFetcher()
+    urls = [f"backlog{i:04d}" for i in range(20)]
+    runner = threading.Thread(target=run_batch, args=(urls, str(tmp_path)),
+                              kwargs={"concurrency": 2, "processes": 1, "rate_limit": 0, "fetcher": fetcher})
+    runner.start()
+    try:
+        time.sleep(0.5)
+        # Two renders pending (2 × processes), plus the fetches that were already in flight.
+        assert len(fetcher.fetched) <= 4
+    finally:
+        GatedRenderPool.gate.set()
+        runner.join()
+    assert len(fetcher.fetched) == 20 and len(list(tmp_path.glob("*.md"))) == 20
+
+
+def test_cached_transcripts_skip_the_rate_limit(tmp_path):
+    cache = TranscriptCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60)
+    ids = [f"cached{i:05d}" for i in range(6)]
+    for video_id in ids:
+        cache.put("en", StubFetcher().fetch_transcript(video_id))
+
+    started = time.monotonic()
+    stats = run_batch(ids, str(tmp_path / "out"), processes=0, rate_limit=2, fetcher=TranscriptFetcher(cache=cache))
+    assert stats["converted"] == 6
+    assert time.monotonic() - started < 2.0  # five waits at 2/s would take 2.5s
+
+
+def test_rate_limit_is_shared_by_every_form_of_youtube_url():
+    limiter = HostRateLimiter(rate=20)
+    started = time.monotonic()
+    for url in ("https://youtu.be/aaaaaaaaaaa", "https://m.youtube.com/watch?v=bbbbbbbbbbb",
+                "ccccccccccc", "https://www.youtube.com/watch?v=ddddddddddd"):
+        limiter.wait(url)
+    assert time.monotonic() - started >= 0.14
+    assert list(limiter._next_slot) == ["www.youtube.com"]
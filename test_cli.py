@@ -0,0 +1,30 @@
+"""
+Tests for the console entry point and lazy loading of heavy dependencies.
+"""
+import subprocess
+import sys
+
+from project import cli, main_agent
+
+
+def test_agents_import_without_the_transcript_api():
+    code = (
+        "import sys, project.main_agent; "
+        "print(' '.join(m for m in ('youtube_transcript_api', 'requests', 'numpy') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_converts_a_url_and_writes_the_article(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(main_agent, "run_agent", lambda url: f"# Article for {url}")
+    output = tmp_path / "article.md"
+
+    assert cli.main(["dQw4w9WgXcQ", "-q", "-o", str(output)]) == 0
+    assert capsys.readouterr().out.startswith("# Article for dQw4w9WgXcQ")
+    assert output.read_text(encoding="utf-8") == "# Article for dQw4w9WgXcQ"
+
+
+def test_fetch_errors_exit_non_zero(capsys):
+    assert cli.main(["not a video"]) == 1
+    assert "Could not extract video ID" in capsys.readouterr().err
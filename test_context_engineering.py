@@ -0,0 +1,54 @@
+from project.core.context_engineering import chunk_text, chunk_transcript, compact_context
+from project.tools.transcript import Transcript
+
+
+def make_transcript():
+    segments = []
+    start = 0.0
+    for i in range(200):
+        text = f"segment {i} about agents" + ("." if i % 5 == 4 else "")
+        segments.append({"start": start, "duration": 2.0, "text": text})
+        start += 2.0 + (3.0 if i % 37 == 36 else 0.0)
+    return Transcript("dQw4w9WgXcQ", "en", segments)
+
+
+def test_chunks_partition_transcript_with_times():
+    transcript = make_transcript()
+    chunks = chunk_transcript(transcript, max_chars=300)
+    assert " ".join(chunk.text for chunk in chunks) == transcript.text
+    assert all(len(chunk.text) <= 300 for chunk in chunks)
+    for chunk in chunks:
+        assert chunk.start == transcript.starts[chunk.first]
+        assert chunk.end == transcript.starts[chunk.last - 1] + transcript.durations[chunk.last - 1]
+    # Every chunk but the last ends on a sentence or a pause.
+    assert all(
+        chunk.text.endswith(".") or transcript.starts[chunk.last] - chunk.end >= 1.5
+        for chunk in chunks[:-1]
+    )
+    assert chunk_transcript(list(transcript), max_chars=300) == chunks
+
+
+def test_token_budget_and_overlap():
+    transcript = make_transcript()
+    chunks = chunk_transcript(transcript, max_tokens=40, count_tokens=lambda t: len(t.split()))
+    assert all(len(chunk.text.split()) <= 40 for chunk in chunks)
+
+    overlapping = chunk_transcript(transcript, max_chars=300, overlap=2)
+    assert all(b.first < a.last for a, b in zip(overlapping, overlapping[1:]))
+    assert overlapping[-1].last == len(transcript)
+
+
+def test_chunk_text_cuts_on_sentences():
+    text = "First sentence here. Second one!\nThird line " + "word " * 100
+    chunks = chunk_text(text, max_chars=40)
+    assert chunks[0] == "First sentence here. Second one!"
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_compact_context_keeps_important_chunks_in_order():
+    filler = "okay well right okay well right " * 5
+    chunks = [filler, "gradient descent optimizer learning rate schedules", filler,
+              "attention heads transformer layers embeddings", filler]
+    compacted = compact_context(chunks, max_chunks=2)
+    assert compacted == chunks[1] + "\n\n" + chunks[3]
@@ -0,0 +1,51 @@
+"""
+Tests for the centroid / TextRank summarizer modes.
+"""
+import pytest
+
+from project.tools import extractive
+from project.tools.tools import SimpleSummarizer
+
+TEXT = (
+    "Hey everyone, welcome back to the channel. "
+    "Gradient descent updates model weights using the loss gradient. "
+    "Don't forget to subscribe. "
+    "The learning rate scales each gradient descent step on the weights. "
+    "A smaller learning rate makes gradient descent slower but more stable. "
+    "Thanks for watching, see you next time."
+)
+
+
+@pytest.mark.parametrize("mode", extractive.METHODS)
+def test_extractive_modes_skip_the_intro(monkeypatch, mode):
+    summary = SimpleSummarizer(mode).summarize(TEXT, 2)
+    assert "welcome" not in summary and "gradient descent" in summary.lower()
+
+    monkeypatch.setattr(extractive, "_get_numpy", lambda: None)
+    assert SimpleSummarizer(mode).summarize(TEXT, 2) == summary
+
+
+def test_lead_mode_is_the_default_and_unchanged(monkeypatch):
+    monkeypatch.delenv("SUMMARIZER_MODE", raising=False)
+    summarizer = SimpleSummarizer()
+    assert summarizer.summarize(TEXT, 1) == "Hey everyone, welcome back to the channel."
+    assert summarizer.cache_version == SimpleSummarizer.VERSION
+
+    monkeypatch.setenv("SUMMARIZER_MODE", "textrank")
+    assert SimpleSummarizer().cache_version != summarizer.cache_version
+    with pytest.raises(ValueError):
+        SimpleSummarizer("abstractive")
+
+
+def test_long_inputs_rank_a_bounded_sample_in_text_order():
+    topics = ["gradient descent", "attention heads", "token embeddings", "learning rate"]
+    units = [f"Today we discuss {topics[i % 4]} and {topics[i * 7 % 4]} again." for i in range(5000)]
+    chosen = extractive.rank_units(units, 3, window=16, max_windows=64)
+    assert len(chosen) == 3 and chosen == sorted(chosen)
+    # Only the 64 evenly spread windows of 16 units are ranked.
+    sampled = {int(i * 313 / 64) for i in range(64)}  # 313 windows in all
+    assert all(i // 16 in sampled for i in chosen)
+
+    # Unpunctuated captions are cut into bounded units.
+    pieces = extractive.split_units("word " * 1000, max_chars=100)
+    assert len(pieces) > 1 and all(len(p) <= 100 for p in pieces)
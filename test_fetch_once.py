@@ -0,0 +1,43 @@
+"""
+Checks that converting a video makes exactly one list and one fetch call.
+"""
+from types import SimpleNamespace
+
+from project.tools import tools
+from project.main_agent import MainAgent
+
+
+class StubTranscriptApi:
+    """
+    Stand-in for YouTubeTranscriptApi that counts calls instead of hitting the network.
+    """
+
+    calls = {"list": 0, "fetch": 0}
+
+    def __init__(self, http_client=None):
+        self.http_client = http_client
+
+    def list(self, video_id):
+        StubTranscriptApi.calls["list"] += 1
+        transcript = SimpleNamespace(video_id=video_id, language_code="en")
+        return SimpleNamespace(find_transcript=lambda languages: transcript)
+
+    def fetch(self, video_id, languages):
+        StubTranscriptApi.calls["fetch"] += 1
+        return [
+            SimpleNamespace(start=0.0, duration=2.5, text="Welcome to the stubbed video."),
+            SimpleNamespace(start=2.5, duration=3.0, text="Transcripts are fetched once."),
+        ]
+
+
+def test_single_list_and_fetch_per_video(monkeypatch):
+    StubTranscriptApi.calls = {"list": 0, "fetch": 0}
+    monkeypatch.setattr(tools, "YouTubeTranscriptApi", StubTranscriptApi)
+
+    result = MainAgent().handle_message("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+    assert StubTranscriptApi.calls == {"list": 1, "fetch": 1}
+    assert result["plan"]["transcript"] == (
+        "Welcome to the stubbed video. Transcripts are fetched once."
+    )
+    assert "00:00 - 00:02: Welcome to the stubbed video." in result["response"]
@@ -0,0 +1,105 @@
+"""
+Retry, circuit breaker and typed errors, exercised through a local stand-in
+HTTP transport instead of the network.
+"""
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from project.tools.fetch_resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    InvalidVideoURL,
+    RetryPolicy,
+    TranscriptUnavailable,
+    TransientFetchError,
+)
+from project.tools.tools import TranscriptFetcher
+
+
+class StandInTransport(BaseAdapter):
+    """
+    Answers every request with a fixed status code and records it.
+    """
+
+    def __init__(self, status: int) -> None:
+        super().__init__()
+        self.status = status
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request.url)
+        response = requests.Response()
+        response.status_code = self.status
+        response.reason = "Stand-in"
+        response.url = request.url
+        response.request = request
+        response._content = b""
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_fetcher(status, attempts=3, threshold=5, clock=None):
+    transport = StandInTransport(status)
+    session = requests.Session()
+    session.mount("https://", transport)
+    sleeps = []
+    fetcher = TranscriptFetcher(
+        session=session,
+        retry=RetryPolicy(attempts=attempts, base_delay=0.1, sleep=sleeps.append),
+        breaker=CircuitBreaker(failure_threshold=threshold, reset_timeout=30.0, clock=clock or Clock()),
+    )
+    fetcher.cache = None  # ignore TRANSCRIPT_CACHE_PATH from the environment
+    return fetcher, transport, sleeps
+
+
+def test_rate_limited_fetch_is_retried_with_jittered_backoff():
+    fetcher, transport, sleeps = make_fetcher(429, attempts=3)
+    with pytest.raises(TransientFetchError):
+        fetcher.fetch_transcript("dQw4w9WgXcQ")
+    assert len(transport.requests) == 3
+    assert len(sleeps) == 2 and 0.0 <= sleeps[0] <= 0.1 and 0.0 <= sleeps[1] <= 0.2
+    assert fetcher.stats["retries"] == 2
+
+
+def test_breaker_opens_then_probes_after_timeout():
+    clock = Clock()
+    fetcher, transport, _ = make_fetcher(503, attempts=2, threshold=2, clock=clock)
+    with pytest.raises(TransientFetchError):
+        fetcher.fetch_transcript("dQw4w9WgXcQ")
+    sent = len(transport.requests)
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        fetcher.fetch_transcript("dQw4w9WgXcQ")
+    assert excinfo.value.retry_after == 30.0
+    assert len(transport.requests) == sent
+    assert fetcher.breaker.stats["rejected"] == 1
+
+    clock.now = 31.0
+    assert fetcher.breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        # The half-open probe fails, so the retry finds the circuit open again.
+        fetcher.fetch_transcript("dQw4w9WgXcQ")
+    assert fetcher.breaker.state == CircuitBreaker.OPEN
+    assert "yt_blog_transcript_breaker_open 1" in fetcher.prometheus()
+
+
+def test_permanent_errors_are_typed_and_not_retried():
+    fetcher, transport, sleeps = make_fetcher(404)
+    with pytest.raises(InvalidVideoURL):
+        fetcher.fetch_transcript("not a video")
+    with pytest.raises(ValueError):
+        fetcher.fetch_transcript("dQw4w9WgXcQ")
+    assert len(transport.requests) == 1 and sleeps == []
+    assert fetcher.breaker.state == CircuitBreaker.CLOSED
+    assert issubclass(TranscriptUnavailable, ValueError)
@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+from project.tools.keyword_index import CorpusIndex, phrase_counts
+from project.tools.tools import SEO_STOPWORDS, SEOKeywordGenerator
+
+CORPUS = [
+    "welcome back everyone today cooking pasta sauce recipes welcome back",
+    "welcome back everyone today gardening tomato plants welcome back",
+    "welcome back everyone today guitar chords practice welcome back",
+]
+TEXT = ("welcome back everyone today. " * 4 +
+        "neural networks explained: neural networks learn weights, neural networks generalize")
+
+
+def test_phrase_counts_respect_punctuation_and_stopwords():
+    counts = phrase_counts("Machine learning. Learning rates with machine learning", SEO_STOPWORDS)
+    assert counts == {"machine learning": 2, "learning rates": 1}
+
+
+def test_tfidf_ranks_topical_terms_over_filler():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.kwi")
+        index = CorpusIndex.build(path, CORPUS, SEO_STOPWORDS)
+        assert index.documents == 3 and index.df("welcome") == 3 and index.df("tomato") == 1
+
+        reopened = CorpusIndex(path)
+        assert reopened.df("welcome back") == 3
+        frequency = SEOKeywordGenerator()
+        frequency.index = None  # ignore KEYWORD_INDEX_PATH from the environment
+        assert frequency.generate(TEXT, 2) == ["welcome", "back"]
+
+        tfidf = SEOKeywordGenerator(index=reopened)
+        assert tfidf.generate(TEXT, 2) == ["neural networks", "explained"]
+        assert tfidf.generate_batch([TEXT, ""], 2) == [tfidf.generate(TEXT, 2), []]
+        reopened.close()
+        index.close()
+
+
+def test_incremental_updates_are_flushed_and_versioned():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.kwi")
+        index = CorpusIndex(path, flush_every=2)
+        generator = SEOKeywordGenerator(index=index)
+        before = generator.cache_version
+
+        generator.observe(CORPUS[0], doc_id="a")
+        generator.observe(CORPUS[0], doc_id="a")
+        assert index.documents == 0
+        generator.observe(CORPUS[1], doc_id="b")
+        assert index.documents == 2 and index.df("welcome") == 2
+        assert generator.cache_version != before
+        assert CorpusIndex(path).df("pasta") == 1
+        index.close()
+
+
+_worker_index = None
+
+
+def observe_one(path, text):
+    # Kept alive until the worker exits, like the index of a batch worker's shared agent.
+    global _worker_index
+    _worker_index = CorpusIndex(path)
+    _worker_index.add_document(text.split())
+
+
+def test_pending_documents_are_flushed_on_time_and_at_exit(tmp_path):
+    path = str(tmp_path / "corpus.kwi")
+    index = CorpusIndex(path, flush_seconds=0.0)
+    index.add_document(CORPUS[0].split())
+    assert index.documents == 1
+
+    # Neither a plain interpreter nor a multiprocessing worker flushes explicitly.
+    code = f"from project.tools.keyword_index import CorpusIndex; index = CorpusIndex({path!r}); index.add_document(['tomato'])"
+    subprocess.run([sys.executable, "-c", code], check=True)
+    worker = multiprocessing.get_context("spawn").Process(target=observe_one, args=(path, CORPUS[2]))
+    worker.start()
+    worker.join()
+    assert worker.exitcode == 0
+
+    reopened = CorpusIndex(path)
+    assert reopened.documents == 3 and reopened.df("tomato") == 1 and reopened.df("guitar") == 1
+    reopened.close()
+    index.close()
+
+
+def observe_many(path, writer):
+    index = CorpusIndex(path, flush_every=1)
+    for i in range(5):
+        index.add_document([f"writer{writer}", f"term{i}", "shared"])
+
+
+def test_writers_in_several_processes_keep_each_others_documents(tmp_path):
+    path = str(tmp_path / "corpus.kwi")
+    context = multiprocessing.get_context("spawn")
+    writers = [context.Process(target=observe_many, args=(path, writer)) for writer in range(3)]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join()
+    assert [process.exitcode for process in writers] == [0, 0, 0]
+
+    index = CorpusIndex(path)
+    assert index.documents == 15 and index.df("shared") == 15
+    assert [index.df(f"writer{writer}") for writer in range(3)] == [5, 5, 5]
+    index.close()
+
+
+def test_lookups_survive_flushes_in_other_threads(tmp_path):
+    index = CorpusIndex(str(tmp_path / "corpus.kwi"), flush_every=1)
+    index.add_document(CORPUS[0].split())
+    errors = []
+    done = threading.Event()
+
+    def look_up():
+        while not done.is_set():
+            try:
+                assert index.df("welcome") >= 1 and index.idf("pasta") > 0
+            except Exception as e:  # ValueError/BufferError from an unmapped snapshot
+                errors.append(e)
+                return
+
+    readers = [threading.Thread(target=look_up) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    for i in range(200):
+        index.add_document(["welcome", f"term{i}"])
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert errors == [] and index.documents == 201
+    index.close()
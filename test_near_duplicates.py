@@ -0,0 +1,105 @@
+"""
+Tests for MinHash/LSH near-duplicate detection and analysis reuse.
+"""
+import random
+
+import pytest
+
+from project.main_agent import MainAgent
+from project.memory.session_memory import SessionMemory
+from project.tools import near_duplicates
+from project.tools.near_duplicates import NearDuplicateIndex, minhash
+from project.tools.transcript import Transcript
+
+WORDS = ("neural network gradient descent attention token embedding layer loss optimizer "
+         "batch epoch inference training data model weights python tensor").split()
+
+
+def talk(seed, words=600):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def transcript(video_id, text, offset=0.0):
+    words = text.split()
+    return Transcript(video_id, "en", [
+        {"start": offset + 3.0 * i, "duration": 3.0, "text": " ".join(words[i * 12:(i + 1) * 12]) + "."}
+        for i in range((len(words) + 11) // 12)
+    ])
+
+
+def test_signatures_match_with_and_without_numpy(monkeypatch):
+    text = talk(1)
+    expected = minhash(text)
+    monkeypatch.setattr(near_duplicates, "_get_numpy", lambda: None)
+    assert minhash(text) == expected
+    assert minhash("...") is None
+
+
+def test_finds_reuploads_but_not_other_videos(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "dups.db"), threshold=0.8)
+    original = talk(1)
+    index.add_many([("original0000", original, {"title": "Original"})] +
+                   [(f"other{i:07d}", talk(100 + i), None) for i in range(20)])
+
+    reupload = "Welcome back! " + original + " Thanks for watching."
+    match = index.find(reupload)
+    assert match.video_id == "original0000" and match.similarity >= 0.8
+    assert match.meta == {"title": "Original"}
+
+    assert index.find(talk(2)) is None
+    assert index.find(original, exclude="original0000") is None
+    assert index.find(reupload, threshold=1.01) is None
+
+
+def test_planner_reuses_the_analysis_of_a_reupload(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEAR_DUPLICATE_INDEX_PATH", str(tmp_path / "dups.db"))
+    agent = MainAgent()
+    text = talk(3)
+    first = agent.handle_message("aaaaaaaaaaa", transcript=transcript("aaaaaaaaaaa", text), memory=SessionMemory())
+    assert first["plan"]["near_duplicate"] is None
+
+    second = agent.handle_message("bbbbbbbbbbb", transcript=transcript("bbbbbbbbbbb", text + " bye"),
+                                  memory=SessionMemory())
+    assert second["plan"]["near_duplicate"]["video_id"] == "aaaaaaaaaaa"
+    assert second["draft"]["duplicate_of"] == "aaaaaaaaaaa"
+    assert second["draft"]["title"] == first["draft"]["title"]
+    assert second["draft"]["keywords"] == first["draft"]["keywords"]
+
+
+def test_reused_sections_are_timed_against_the_reupload(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEAR_DUPLICATE_INDEX_PATH", str(tmp_path / "dups.db"))
+    agent = MainAgent()
+    text = talk(4, words=1500)
+    agent.handle_message("aaaaaaaaaaa", transcript=transcript("aaaaaaaaaaa", text), memory=SessionMemory())
+    # The same talk after a 30-second intro without captions.
+    plan = agent.handle_message("bbbbbbbbbbb", transcript=transcript("bbbbbbbbbbb", text, offset=30.0),
+                                memory=SessionMemory())["plan"]
+
+    sections = agent.worker.analyze(plan)["sections"]
+    assert len(sections) == len(plan["chunks"]) > 1
+    assert [s["start"] for s in sections] == [chunk.start for chunk in plan["chunks"]]
+    assert sections[0]["start"] == 30.0
+
+    plan["chunks"] = plan["chunks"][:1]
+    assert agent.worker.analyze(plan)["sections"] == []
+
+
+def test_failed_articles_are_not_offered_as_originals(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEAR_DUPLICATE_INDEX_PATH", str(tmp_path / "dups.db"))
+    agent = MainAgent()
+    text = talk(5)
+
+    def broken(**kwargs):
+        raise RuntimeError("evaluation failed")
+
+    with monkeypatch.context() as m:
+        m.setattr(agent.evaluator, "evaluate", broken)
+        with pytest.raises(RuntimeError):
+            agent.handle_message("aaaaaaaaaaa", transcript=transcript("aaaaaaaaaaa", text), memory=SessionMemory())
+        with pytest.raises(RuntimeError):
+            list(agent.stream_message("aaaaaaaaaaa", transcript=transcript("aaaaaaaaaaa", text)))
+    assert len(agent.planner.duplicate_index) == 0
+
+    result = agent.handle_message("bbbbbbbbbbb", transcript=transcript("bbbbbbbbbbb", text), memory=SessionMemory())
+    assert result["plan"]["near_duplicate"] is None and len(agent.planner.duplicate_index) == 1
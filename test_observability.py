@@ -0,0 +1,119 @@
+"""
+Tests for request tracing and per-stage metrics.
+"""
+import io
+import json
+import logging
+import queue
+import time
+
+from project.core.observability import (
+    Tracer,
+    _make_queue_handler,
+    bind_correlation_id,
+    configure_logging,
+    get_tracer,
+    shutdown_logging,
+    span,
+)
+from project.core.a2a_protocol import A2AProtocol
+from project.core.scheduler import Stage, StageScheduler
+from project.main_agent import MainAgent
+from project.memory.session_memory import SessionMemory
+from project.tools.transcript import Transcript
+
+TRANSCRIPT = Transcript("dQw4w9WgXcQ", "en", [
+    {"start": 0.0, "duration": 3.0, "text": "Tracing shows where the time goes."},
+    {"start": 3.0, "duration": 3.0, "text": "Every stage gets its own span."},
+])
+
+
+def test_span_is_noop_without_trace():
+    with span("anything") as s:
+        s.add(bytes=10)
+    assert get_tracer().snapshot() == {}
+
+
+def test_stages_are_traced_and_exported(tmp_path, monkeypatch):
+    tracer = Tracer()
+    tracer.configure(jsonl_path=str(tmp_path / "traces.jsonl"))
+    monkeypatch.setattr("project.main_agent.get_tracer", lambda: tracer)
+
+    result = MainAgent().handle_message("dQw4w9WgXcQ", transcript=TRANSCRIPT, memory=SessionMemory())
+
+    # Summarization and keyword extraction run concurrently, so their spans may close in either order.
+    stages = [s["stage"] for s in result["trace"]["spans"]]
+    assert stages[:3] == ["quality_gate", "chunking", "section_analysis"]
+    assert sorted(stages[3:5]) == ["keyword_extraction", "summarization"]
+    assert stages[5:] == ["analysis", "rendering", "evaluation"]
+    schedule = result["schedule"]
+    assert schedule["critical_path"][0] == "planning" and schedule["critical_path"][-1] == "evaluation"
+    record = json.loads((tmp_path / "traces.jsonl").read_text().splitlines()[0])
+    assert record["trace_id"] == result["trace"]["trace_id"]
+    assert 'yt_blog_stage_calls_total{stage="rendering"} 1' in tracer.prometheus()
+
+
+def first_stage_work(message):
+    time.sleep(0.1)
+    return {"a": 1}
+
+
+def second_stage_work(message):
+    time.sleep(0.1)
+    return {"b": 2}
+
+
+def test_slow_trace_profile_includes_stage_threads():
+    tracer = Tracer()
+    tracer.configure(slow_seconds=0.0, profile_slow=True)
+    protocol = A2AProtocol()
+    protocol.register("worker", "a", first_stage_work)
+    protocol.register("worker", "b", second_stage_work)
+    # Independent stages: one runs on the calling thread, the other on the pool.
+    scheduler = StageScheduler(protocol, [Stage("a", "worker", "a", (), ("a",)), Stage("b", "worker", "b", (), ("b",))])
+    try:
+        with tracer.trace("request") as trace:
+            scheduler.run({}, meta=trace.meta()).raise_for_error()
+    finally:
+        scheduler.shutdown()
+
+    stacks = " ".join(stack for stack, _ in trace.profile)
+    assert "first_stage_work" in stacks and "second_stage_work" in stacks
+
+
+def test_async_json_logging_carries_correlation_id():
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    stream = io.StringIO()
+    configure_logging(async_mode=True, json_format=True, stream=stream)
+    try:
+        with bind_correlation_id("req-42"):
+            logging.getLogger("Test").info("hello %s", "world")
+        shutdown_logging()
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+    record = json.loads(stream.getvalue().splitlines()[0])
+    assert record["message"] == "hello world"
+    assert record["correlation_id"] == "req-42"
+
+
+def test_full_queue_sheds_info_records_before_formatting():
+    log_queue = queue.Queue(maxsize=1)
+    handler = _make_queue_handler(log_queue, high_watermark=1.0, sample_every=10)
+    formatted = []
+    handler.prepare = lambda record: formatted.append(record) or record
+    logger = logging.getLogger("Shedding")
+
+    def record(level, msg):
+        return logger.makeRecord("Shedding", level, __file__, 0, msg, (), None)
+
+    handler.handle(record(logging.INFO, "first"))
+    handler.handle(record(logging.INFO, "shed"))
+    handler.handle(record(logging.WARNING, "waits, then dropped"))
+    assert [r.msg for r in formatted] == ["first", "waits, then dropped"]
+    assert handler.dropped == 2 and log_queue.get_nowait().msg == "first"
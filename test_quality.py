@@ -0,0 +1,97 @@
+"""
+Tests for the transcript quality gate and the Evaluator's score.
+"""
+import pickle
+
+import pytest
+
+from project.core.observability import Tracer
+from project.main_agent import MainAgent
+from project.memory.session_memory import SessionMemory
+from project.tools import quality
+from project.tools.quality import LowQualityTranscript, assess_transcript
+from project.tools.transcript import Transcript
+
+SPEECH = ("So today we are going to look at how attention works in a transformer. "
+          "The idea is that every token can look at all the other tokens, and the model "
+          "learns which of them matter for the next word. That is why it scales so well "
+          "with data, but it also means the cost grows with the length of the input.").split()
+
+
+def transcript(texts, step=3.0, language="en"):
+    return Transcript("dQw4w9WgXcQ", language, [
+        {"start": step * i, "duration": step, "text": text} for i, text in enumerate(texts)
+    ])
+
+
+def talk(repeats=4):
+    words = SPEECH * repeats
+    return transcript([" ".join(words[i:i + 8]) for i in range(0, len(words), 8)])
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_metrics_separate_speech_from_music_and_loops(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(quality, "_get_numpy", lambda: None)
+    clean = assess_transcript(talk())
+    assert clean.usable and clean.score > 0.9
+    assert 1.5 < clean.words_per_second < 4 and clean.language_confidence > 0.8
+
+    music = assess_transcript(transcript(["[Music]", "♪ ♪", "[Applause]", "(upbeat music)", "(LAUGHTER)"] * 12))
+    assert music.issues == ["no speech in the captions"] and music.score == 0.0
+
+    # Parenthesized asides are speech, not caption tags.
+    asides = assess_transcript(transcript(["(as you can see here)", "(this is the important part)"] * 30))
+    assert asides.non_speech_ratio == 0.0
+
+    loop = assess_transcript(transcript(["la la la la la", "oh oh oh"] * 30))
+    assert not loop.usable and loop.repetition_rate > 0.9 and loop.lexical_diversity < 0.1
+
+    # Overlapping auto-caption timings count each second once.
+    overlapping = assess_transcript(Transcript("dQw4w9WgXcQ", "en", [
+        {"start": 0.0, "duration": 3.0, "text": "so today we are"},
+        {"start": 1.0, "duration": 3.0, "text": "going to look at"},
+    ]))
+    assert overlapping.words_per_second == pytest.approx(2.0)
+    assert assess_transcript(transcript(["hola"] * 3, language="xx")).language_confidence is None
+
+
+def test_terse_english_passes_the_gate():
+    # Few function words, but real speech: the language signal only lowers the score.
+    terse = assess_transcript(transcript([f"Streaming segment number {i}." for i in range(300)]))
+    assert terse.usable and terse.language_confidence == 0.0
+    assert 0.5 < terse.score < 1.0
+    jargon = assess_transcript(transcript(
+        [f"Layer {i}: attention heads, token embeddings, batch size {2 ** (i % 8)}." for i in range(60)]
+    ))
+    assert jargon.usable and jargon.language_confidence < 0.2
+
+
+def test_planner_rejects_unusable_transcripts_before_analysis():
+    agent = MainAgent()
+    with pytest.raises(LowQualityTranscript) as excinfo:
+        agent.handle_message("dQw4w9WgXcQ", transcript=transcript(["[Music]"] * 40), memory=SessionMemory())
+    assert excinfo.value.report.non_speech_ratio == 1.0
+    copy = pickle.loads(pickle.dumps(excinfo.value))
+    assert str(copy) == str(excinfo.value) and copy.video_id == "dQw4w9WgXcQ"
+    assert agent.stage_cache.stats["misses"] == 0  # no stage ran
+
+
+def test_gate_is_traced_and_assesses_each_transcript_once():
+    planner = MainAgent().planner
+    fetched = talk()
+    tracer = Tracer()
+    tracer.configure()
+    with tracer.trace("request") as trace:
+        first = planner.check_quality(fetched)
+        assert planner.check_quality(fetched) is first
+    assert [(s.name, s.cache_hits) for s in trace.spans] == [("quality_gate", 0), ("quality_gate", 1)]
+    assert trace.spans[0].bytes == len(fetched.text)
+
+
+def test_evaluator_scores_with_the_gate_metrics():
+    result = MainAgent().handle_message("dQw4w9WgXcQ", transcript=talk(), memory=SessionMemory())
+    evaluation = result["evaluation"]
+    assert evaluation["quality"] == result["plan"]["quality"].to_dict()
+    assert evaluation["score"] == pytest.approx(evaluation["quality"]["score"])
+    assert 0.9 < evaluation["score"] <= 1.0
@@ -0,0 +1,79 @@
+"""
+Tests for the dependency-aware stage scheduler.
+"""
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from project.core.a2a_protocol import A2AProtocol
+from project.core.scheduler import Stage, StageScheduler
+
+
+def double(message):
+    return {"doubled": message.payload["n"] * 2}
+
+
+def make(stages, handlers, **kwargs):
+    protocol = A2AProtocol()
+    for task, handler in handlers.items():
+        protocol.register("agent", task, handler)
+    return StageScheduler(protocol, [Stage(name, "agent", name, inputs, outputs) for name, inputs, outputs in stages], **kwargs)
+
+
+def test_independent_stages_overlap_and_critical_path_follows_dependencies():
+    both_running = threading.Barrier(2, timeout=5)
+
+    def left(message):
+        both_running.wait()
+        return {"a": message.payload["x"] + 1}
+
+    def right(message):
+        both_running.wait()
+        time.sleep(0.05)
+        return {"b": message.payload["x"] * 10}
+
+    scheduler = make(
+        [("left", ("x",), ("a",)), ("right", ("x",), ("b",)), ("join", ("a", "b"), ("total",))],
+        {"left": left, "right": right, "join": lambda m: {"total": m.payload["a"] + m.payload["b"]}},
+    )
+    run = scheduler.run({"x": 2})
+    scheduler.shutdown()
+
+    run.raise_for_error()
+    assert run.values["total"] == 23
+    path, seconds = run.critical_path()
+    assert path == ["right", "join"] and seconds >= 0.05
+
+
+def test_failure_cancels_only_downstream_stages():
+    def broken(message):
+        raise ValueError("no transcript")
+
+    scheduler = make(
+        [("fetch", ("url",), ("plan",)), ("render", ("plan",), ("body",)),
+         ("publish", ("body",), ("done",)), ("labels", ("url",), ("labels",))],
+        {"fetch": broken, "render": lambda m: {"body": ""}, "publish": lambda m: {"done": True},
+         "labels": lambda m: {"labels": [m.payload["url"]]}},
+    )
+    run = scheduler.run({"url": "u"})
+    scheduler.shutdown()
+
+    assert run.failed == "fetch" and run.cancelled == ["publish", "render"]
+    assert run.values["labels"] == ["u"]
+    with pytest.raises(ValueError, match="no transcript"):
+        run.raise_for_error()
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        make([("a", ("y",), ("x",)), ("b", ("x",), ("y",))], {})
+    with pytest.raises(ValueError, match="Missing scheduler inputs"):
+        make([("a", ("x",), ("y",))], {}).run({})
+
+
+def test_runs_on_a_process_pool():
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        run = make([("double", ("n",), ("doubled",))], {"double": double}, executor=pool).run({"n": 21})
+    assert run.values["doubled"] == 42
@@ -0,0 +1,117 @@
+"""
+Tests for the inverted transcript search index.
+"""
+import multiprocessing
+
+import pytest
+
+from project.main_agent import MainAgent
+from project.memory.session_memory import SessionMemory
+from project.tools import search_index
+from project.tools.search_index import TranscriptSearchIndex, parse_query
+from project.tools.transcript import Transcript
+
+VIDEOS = {
+    "aaaaaaaaaaa": ["Today we look at gradient", "descent and why it works.", "Gradient descent again!"],
+    "bbbbbbbbbbb": ["Descent is not gradient", "python notebooks"],
+    "ccccccccccc": ["gradient descent in python"],
+}
+
+
+def segments(texts, step=4.5):
+    return [{"start": step * i, "duration": step, "text": text} for i, text in enumerate(texts)]
+
+
+def test_parse_query_splits_phrases_and_words():
+    assert parse_query('"Gradient  descent" Python x-ray ""') == [
+        ("gradient", "descent"), ("python",), ("x", "ray"),
+    ]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_phrase_and_term_queries_across_merged_runs(tmp_path, monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(search_index, "_get_numpy", lambda: None)
+    index = TranscriptSearchIndex(str(tmp_path / "search"))
+    for video_id, texts in VIDEOS.items():
+        assert index.add(video_id, segments(texts))
+    for i in range(9):
+        index.add(f"filler{i:05d}", segments([f"gradient filler {i}"]))
+    assert not index.add("aaaaaaaaaaa", [])
+    # Twelve single-video flushes end up merged into runs of 8 and 4 videos.
+    assert len(list(tmp_path.joinpath("search").glob("run-*.fti"))) == 2
+
+    # The phrase spans a segment boundary and is reported at its first word.
+    results = index.search('"gradient descent"')
+    assert [(r.video_id, r.matches) for r in results] == [("aaaaaaaaaaa", 2), ("ccccccccccc", 1)]
+    assert results[0].starts == [0.0, 9.0]
+    assert results[0].links == ["https://youtu.be/aaaaaaaaaaa?t=0", "https://youtu.be/aaaaaaaaaaa?t=9"]
+
+    results = index.search('"gradient descent" python')
+    assert [(r.video_id, r.matches) for r in results] == [("ccccccccccc", 2)]
+    assert [r.video_id for r in index.search("gradient", limit=2)] == ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+    assert index.search("gradient unknownword") == []
+
+    reopened = TranscriptSearchIndex(str(tmp_path / "search"))
+    assert len(reopened) == 12 and "filler00008" in reopened
+    assert reopened.search("notebooks")[0].url == "https://youtu.be/bbbbbbbbbbb?t=4"
+
+
+def test_main_agent_indexes_processed_videos(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_PATH", str(tmp_path / "search"))
+    agent = MainAgent()
+    transcript = Transcript("dQw4w9WgXcQ", "en", segments(VIDEOS["aaaaaaaaaaa"]))
+    agent.handle_message("dQw4w9WgXcQ", transcript=transcript, memory=SessionMemory())
+
+    assert agent.search_index.search('"why it works"')[0].url == "https://youtu.be/dQw4w9WgXcQ?t=4"
+
+
+def index_videos(path, writer):
+    index = TranscriptSearchIndex(path)
+    for i in range(6):
+        index.add(f"writer{writer}-{i:03d}", segments([f"shared words from writer {writer}"]))
+
+
+def test_writers_in_several_processes_share_one_directory(tmp_path):
+    path = str(tmp_path / "search")
+    context = multiprocessing.get_context("spawn")
+    writers = [context.Process(target=index_videos, args=(path, writer)) for writer in range(3)]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join()
+    assert [process.exitcode for process in writers] == [0, 0, 0]
+
+    index = TranscriptSearchIndex(path)
+    assert len(index) == 18 and index.documents == 18
+    assert len(index.search('"shared words"', limit=20)) == 18
+
+
+def test_flushes_only_read_runs_committed_by_other_writers(tmp_path, monkeypatch):
+    decoded = []
+    video_id = search_index._Run.video_id
+    monkeypatch.setattr(search_index._Run, "video_id", lambda run, doc: decoded.append(doc) or video_id(run, doc))
+    path = str(tmp_path / "search")
+    index = TranscriptSearchIndex(path)
+    for i in range(40):
+        index.add(f"video{i:06d}", segments([f"talk number {i}"]))
+    assert decoded == [] and len(index) == 40
+
+    other = TranscriptSearchIndex(path)
+    assert len(decoded) == 40 and "video000039" in other
+    other.add("othervideo1", segments(["from another writer"]))
+    index.add("video000040", segments(["talk number 40"]))
+    # Only the one-video run the other writer committed is new to this process.
+    assert len(decoded) == 41 and "othervideo1" in index and len(index) == 42
+
+
+def test_indexing_failure_does_not_fail_the_article(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEARCH_INDEX_PATH", str(tmp_path / "search"))
+    agent = MainAgent()
+
+    def broken(video_id, segments):
+        raise OSError("disk full")
+    monkeypatch.setattr(agent.search_index, "add", broken)
+    transcript = Transcript("dQw4w9WgXcQ", "en", segments(VIDEOS["aaaaaaaaaaa"]))
+    result = agent.handle_message("dQw4w9WgXcQ", transcript=transcript, memory=SessionMemory())
+    assert result["response"]
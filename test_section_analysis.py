@@ -0,0 +1,61 @@
+"""
+Per-section map-reduce in the Worker matches a whole-transcript pass and
+does not depend on the number of worker processes.
+"""
+from project.agents.worker import Worker
+from project.memory.session_memory import SessionMemory
+from project.tools.section_analysis import SectionProcessor, analyze_section, merge_sections, section_heading
+from project.tools.tools import SEOKeywordGenerator, SimpleSummarizer
+from project.tools.transcript import Transcript
+
+TOPICS = ("attention layers", "training data", "agent memory", "vector search")
+SEGMENTS = [
+    {"start": i * 3.0, "duration": 3.0,
+     "text": f"Part {i} explains {TOPICS[i % 4]} with {TOPICS[(i * 7) % 4]} examples."}
+    for i in range(240)
+]
+
+
+def make_plan():
+    transcript = Transcript("dQw4w9WgXcQ", "en", SEGMENTS)
+    texts = [segment["text"] for segment in SEGMENTS]
+    sections = [" ".join(texts[i:i + 20]) for i in range(0, len(texts), 20)]
+    return {"transcript_data": transcript, "transcript": transcript.text, "sections": sections}
+
+
+def test_merge_matches_whole_text_analysis():
+    plan = make_plan()
+    merged = merge_sections(plan["transcript"], [analyze_section(s) for s in plan["sections"]])
+    text = plan["transcript"]
+    assert SEOKeywordGenerator().generate(text, analysis=merged) == SEOKeywordGenerator().generate(text)
+    assert SimpleSummarizer().summarize(text, 3, analysis=merged) == SimpleSummarizer().summarize(text, 3)
+    assert merged.word_count == len(text.split())
+
+
+def test_parallel_sections_are_deterministic():
+    serial = Worker(section_processor=SectionProcessor(workers=1))
+    pooled = SectionProcessor(workers=3, min_parallel_chars=0)
+    parallel = Worker(section_processor=pooled)
+    try:
+        expected = serial.analyze(make_plan())
+        assert parallel.analyze(make_plan()) == expected
+        assert pooled._get_pool()._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        pooled.shutdown()
+
+    assert len(expected["sections"]) == 12
+    assert expected["sections"][0]["heading"]
+    body = serial.generate_blog(make_plan(), SessionMemory())["body"]
+    assert body.count("### ") == 12
+
+
+def test_headings_skip_spoken_filler():
+    chatty = "Yeah, like, yeah. So like I was saying, yeah, the gradient is like really important for descent, yeah."
+    assert analyze_section(chatty)["heading"] == "Gradient"
+    assert section_heading(["yeah", "like", "attention", "okay", "tokens"]) == "Attention and Tokens"
+
+    worker = Worker(section_processor=SectionProcessor(workers=1))
+    filler = "Yeah like yeah, okay so like, you know, yeah right. Like really, yeah."
+    plan = {"transcript": filler, "sections": [filler, "Attention layers and attention heads."]}
+    headings = [section["heading"] for section in worker.analyze(plan)["sections"]]
+    assert headings == ["Part 1", "Attention and Layers"]
@@ -0,0 +1,69 @@
+"""
+Tests for the HTTP service against a stubbed transcript source.
+"""
+import hashlib
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from project.main_agent import MainAgent
+from project.memory.session_memory import SessionMemory
+from project.server import STREAM_CHUNK_CHARS, _coalesce, create_app
+from project.tools.tools import Transcript
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+class StubFetcher:
+    def fetch_transcript(self, url_or_query):
+        if url_or_query != URL:
+            raise ValueError(f"Could not extract video ID from: {url_or_query}")
+        segments = [
+            {"start": i * 4.0, "duration": 4.0, "text": f"Streaming segment number {i}."}
+            for i in range(3000)
+        ]
+        return Transcript("dQw4w9WgXcQ", "en", segments)
+
+
+def make_client(max_in_flight=4):
+    agent = MainAgent()
+    agent.planner.transcript_fetcher = StubFetcher()
+    return agent, TestClient(create_app(agent, max_in_flight=max_in_flight))
+
+
+def test_stream_matches_full_article():
+    agent, client = make_client()
+    full = client.post("/convert", json={"url": URL}).json()["article"]
+
+    with client.stream("POST", "/convert/stream", json={"url": URL}) as response:
+        assert response.status_code == 200
+        assert response.read().decode("utf-8") == full
+    assert client.get("/health").json()["in_flight"] == 0
+
+    chunks = list(_coalesce(agent.stream_message(URL), STREAM_CHUNK_CHARS))
+    assert len(chunks) > 2
+    assert chunks[0].startswith("# ")
+    assert "**Summary:**" in chunks[0] and "Timestamped Transcript" not in chunks[0]
+
+
+def test_streamed_draft_is_measured_not_joined():
+    agent, _ = make_client()
+    memory = SessionMemory()
+    article = "".join(agent.stream_message(URL, memory=memory))
+
+    draft = memory.get("last_draft")
+    assert draft["body"] is None and draft["length"] == len(article)
+    assert draft["sha256"] == hashlib.sha256(article.encode("utf-8")).hexdigest()
+    evaluation = memory.get("last_evaluation")
+    assert evaluation["score"] > 0 and evaluation["final_article"] is None
+
+
+def test_bad_url_and_overload():
+    _, client = make_client()
+    assert client.post("/convert", json={"url": "not a video"}).status_code == 422
+
+    _, busy = make_client(max_in_flight=0)
+    assert busy.post("/convert", json={"url": URL}).status_code == 429
+    assert busy.post("/convert/stream", json={"url": URL}).status_code == 429
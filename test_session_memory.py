@@ -0,0 +1,112 @@
+import os
+import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from project.main_agent import MainAgent
+from project.memory.backends import InProcessBackend, SQLiteBackend
+from project.memory.session_memory import SessionMemory
+from project.tools.text_analysis import TextAnalysis
+from project.tools.transcript import Transcript
+
+SEGMENTS = [
+    {"start": float(i), "duration": 1.0, "text": f"Sentence number {i} talks about agents."}
+    for i in range(400)
+]
+
+
+def make_plan():
+    transcript = Transcript("dQw4w9WgXcQ", "en", SEGMENTS)
+    return {
+        "transcript_data": transcript,
+        "transcript": transcript.text,
+        "timestamped_transcript": transcript,
+        "sections": [transcript.text[i:i + 800] for i in range(0, len(transcript.text), 800)],
+        "style": {"tone": "simple"},
+    }
+
+
+def test_default_memory_keeps_values_as_is():
+    memory = SessionMemory()
+    plan = make_plan()
+    memory.set("last_plan", plan)
+    assert memory.get("last_plan") is plan
+    assert memory.get("missing", 1) == 1
+    assert dict(memory.to_dict()) == {"last_plan": plan}
+
+
+def test_in_process_lru_limits():
+    memory = SessionMemory(InProcessBackend(max_entries=2))
+    for key in ("a", "b", "c"):
+        memory.set(key, key)
+    memory.get("b")
+    memory.set("d", "d")
+    assert sorted(memory.keys()) == ["b", "d"]
+
+    sized = InProcessBackend(max_bytes=10_000)
+    for i in range(10):
+        sized.set(str(i), "x" * 3000)
+    assert len(sized.keys()) == 3
+    assert sized.evictions == 7
+
+
+def test_store_by_reference_shares_blobs():
+    backend = InProcessBackend()
+    memory = SessionMemory(backend, store_by_reference=True)
+    plan = make_plan()
+    memory.set("last_plan", plan)
+    memory.set("plan_copy", plan)
+
+    # Transcript columns, its text and the sections list, each stored once.
+    assert len(backend._blobs) == 3
+    restored = memory.get("last_plan")
+    assert restored["transcript"] == plan["transcript"]
+    assert restored["transcript_data"].text is restored["transcript"]
+    assert list(restored["timestamped_transcript"]) == SEGMENTS
+    assert restored["sections"] == plan["sections"]
+
+    memory.delete("last_plan")
+    assert len(backend._blobs) == 3
+    memory.delete("plan_copy")
+    assert backend._blobs == {}
+
+
+def test_sqlite_backend_persists_across_instances():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "memory.db")
+        memory = SessionMemory(SQLiteBackend(path, "s1"), store_by_reference=True)
+        plan = make_plan()
+        plan["analysis"] = TextAnalysis(plan["transcript"])
+        memory.set("last_plan", plan)
+        memory.set("last_plan", plan)
+
+        reopened = SessionMemory(SQLiteBackend(path, "s1"), store_by_reference=True)
+        restored = reopened.get("last_plan")
+        assert restored["transcript_data"].content_hash == plan["transcript_data"].content_hash
+        assert restored["analysis"].word_count == plan["analysis"].word_count
+        assert SessionMemory(SQLiteBackend(path, "s2")).keys() == []
+
+        reopened.delete("last_plan")
+        assert reopened.keys() == []
+
+
+def test_text_analysis_pickles_after_partial_split():
+    analysis = TextAnalysis("One. Two! Three? Four.")
+    assert analysis.sentences(2) == ["One.", "Two!"]
+    restored = pickle.loads(pickle.dumps(analysis))
+    assert restored.sentences() == ["One.", "Two!", "Three?", "Four."]
+
+
+def test_concurrent_requests_do_not_share_memory():
+    agent = MainAgent()
+    transcripts = [
+        Transcript(f"video{i:06d}", "en", [dict(segment, text=f"Video {i}: {segment['text']}") for segment in SEGMENTS[:40]])
+        for i in range(4)
+    ]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda t: agent.handle_message(t.video_id, transcript=t), transcripts))
+
+    for transcript, result in zip(transcripts, results):
+        assert result["plan"]["transcript_data"] is transcript
+        assert f"Video {transcript.video_id[-1]}:" in result["response"]
+    assert agent.memory.get("last_plan") is None and agent.memory.get("last_draft") is None
@@ -0,0 +1,40 @@
+"""
+Tests for content-addressed memoization of agent stages.
+"""
+from project.main_agent import MainAgent
+from project.memory.session_memory import SessionMemory
+from project.tools.transcript import Transcript
+
+TRANSCRIPT = Transcript("dQw4w9WgXcQ", "en", [
+    {"start": 0.0, "duration": 3.0, "text": "Memoized stages skip repeated work."},
+    {"start": 3.0, "duration": 3.0, "text": "Only rendering depends on style."},
+])
+
+
+def run(agent, style):
+    memory = SessionMemory()
+    memory.set("style_preferences", style)
+    return agent.handle_message("dQw4w9WgXcQ", transcript=TRANSCRIPT, memory=memory)
+
+
+def test_unchanged_input_hits_every_stage():
+    agent = MainAgent()
+    first = run(agent, {"tone": "simple"})
+    assert agent.stage_cache.stats == {"hits": 0, "misses": 3, "evictions": 0}
+
+    second = run(agent, {"tone": "simple"})
+    assert agent.stage_cache.stats["hits"] == 3
+    assert second["response"] == first["response"]
+
+
+def test_style_change_rerenders_only(monkeypatch):
+    agent = MainAgent()
+    run(agent, {"tone": "simple"})
+    run(agent, {"tone": "formal"})
+    assert agent.stage_cache.stats == {"hits": 2, "misses": 4, "evictions": 0}
+
+    # A new summarizer version recomputes the analysis; the body is
+    # re-rendered only if the resulting metadata actually changed.
+    monkeypatch.setattr(agent.worker.summarizer, "VERSION", "2")
+    run(agent, {"tone": "formal"})
+    assert agent.stage_cache.stats["misses"] == 5
@@ -0,0 +1,31 @@
+"""
+Tests for batched timestamp label formatting.
+"""
+import random
+
+from project.tools import timestamps
+from project.tools.timestamps import format_time_labels
+
+
+def legacy_label(t):
+    return f"{int(t // 60):02d}:{int(t % 60):02d}"
+
+
+def test_matches_legacy_format_under_an_hour(monkeypatch):
+    rng = random.Random(7)
+    starts = sorted(rng.uniform(0, 3590) for _ in range(2000))
+    durations = [rng.uniform(0, 9.99) for _ in starts]
+    expected = (
+        [legacy_label(s) for s in starts],
+        [legacy_label(s + d) for s, d in zip(starts, durations)],
+    )
+
+    assert format_time_labels(starts, durations) == expected
+    monkeypatch.setattr(timestamps, "_get_numpy", lambda: None)
+    assert format_time_labels(starts, durations) == expected
+
+
+def test_long_videos_use_hours():
+    starts, ends = format_time_labels([59.9, 3725.2], [0.5, 10.0])
+    assert starts == ["00:00:59", "01:02:05"]
+    assert ends == ["00:01:00", "01:02:15"]
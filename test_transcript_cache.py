@@ -0,0 +1,61 @@
+"""
+Tests for the columnar Transcript container and the SQLite transcript cache.
+"""
+import pickle
+
+from project.tools.transcript import Transcript
+from project.tools.transcript_cache import TranscriptCache, decode_transcript, encode_transcript
+
+SEGMENTS = [
+    {"start": 0.0, "duration": 1.5, "text": "héllo"},
+    {"start": 1.5, "duration": 2.0, "text": "world"},
+    {"start": 5.0, "duration": 1.0, "text": "again"},
+]
+
+
+def make(video_id="abcdefghijk"):
+    return Transcript(video_id, "en", SEGMENTS)
+
+
+def test_transcript_views():
+    transcript = make()
+    assert list(transcript) == SEGMENTS
+    assert transcript.text == "héllo world again"
+    assert transcript[-1] == SEGMENTS[-1]
+    assert list(transcript.between(1.0, 4.0)) == SEGMENTS[:2]
+    assert transcript.between(3.6, 4.9).text == ""
+    assert transcript[1:].text == "world again"
+    assert list(pickle.loads(pickle.dumps(transcript[1:]))) == SEGMENTS[1:]
+
+
+def test_encoding_round_trip():
+    decoded = decode_transcript("abcdefghijk", "en", encode_transcript(make()))
+    assert list(decoded) == SEGMENTS and decoded.text == make().text
+
+
+def test_hits_misses_and_ttl(tmp_path):
+    cache = TranscriptCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60)
+    assert cache.get("abcdefghijk", "en") is None
+    cache.put("en", make())
+
+    entry = cache.get("abcdefghijk", "en")
+    assert entry.fresh and list(entry.transcript) == SEGMENTS
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+    cache.ttl_seconds = -1
+    assert cache.get("abcdefghijk", "en") is None
+    cache.stale_while_revalidate = True
+    assert cache.get("abcdefghijk", "en").fresh is False
+
+
+def test_lru_eviction_by_size(tmp_path):
+    size = len(encode_transcript(make()))
+    cache = TranscriptCache(str(tmp_path / "cache.sqlite3"), max_bytes=2 * size)
+    cache.put("en", make("aaaaaaaaaaa"))
+    cache.put("en", make("bbbbbbbbbbb"))
+    cache.get("aaaaaaaaaaa", "en")
+    cache.put("en", make("ccccccccccc"))
+
+    assert cache.stats["evictions"] == 1
+    assert cache.get("bbbbbbbbbbb", "en") is None
+    assert cache.get("aaaaaaaaaaa", "en") is not None
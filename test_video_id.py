@@ -0,0 +1,40 @@
+from project.tools.video_id import dedupe_urls, extract_video_id, extract_video_ids
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+
+def test_extracts_supported_url_forms():
+    urls = [
+        f"https://www.youtube.com/watch?v={VIDEO_ID}",
+        f"https://www.youtube.com/watch?feature=share&v={VIDEO_ID}&t=42",
+        f"https://m.youtube.com/watch?v={VIDEO_ID}",
+        f"https://music.youtube.com/watch?v={VIDEO_ID}&list=RDAMVM",
+        f"https://youtu.be/{VIDEO_ID}?si=abc",
+        f"https://www.youtube.com/embed/{VIDEO_ID}",
+        f"https://www.youtube.com/v/{VIDEO_ID}",
+        f"https://www.youtube.com/shorts/{VIDEO_ID}",
+        f"https://www.youtube.com/live/{VIDEO_ID}?feature=shared",
+        f"https://www.youtube-nocookie.com/embed/{VIDEO_ID}",
+        f"youtube.com/watch?v={VIDEO_ID}",
+        VIDEO_ID,
+    ]
+    assert [extract_video_id(url) for url in urls] == [VIDEO_ID] * len(urls)
+
+
+def test_rejects_non_youtube_and_malformed_ids():
+    assert extract_video_id(f"https://notyoutube.com/watch?v={VIDEO_ID}") is None
+    assert extract_video_id(f"https://www.youtube.com/watch?v={VIDEO_ID}X") is None
+    assert extract_video_id("https://www.youtube.com/watch?list=PL123") is None
+    assert extract_video_id("not a video") is None
+
+
+def test_bulk_extract_and_dedupe_keep_first_seen_order():
+    urls = [
+        "https://youtu.be/aaaaaaaaaaa",
+        f"https://www.youtube.com/watch?v={VIDEO_ID}",
+        "https://www.youtube.com/shorts/aaaaaaaaaaa",
+        "garbage",
+        VIDEO_ID,
+    ]
+    assert extract_video_ids(urls) == ["aaaaaaaaaaa", VIDEO_ID]
+    assert list(dedupe_urls(urls)) == urls[:2] + ["garbage"]
@@ -0,0 +1,34 @@
+"""
+Tests for rendering the Worker's article into a sink.
+"""
+import hashlib
+import io
+
+import pytest
+
+from project.agents.worker import Worker
+from project.memory.session_memory import SessionMemory
+from project.memory.stage_cache import StageCache
+from project.tools.transcript import Transcript
+
+SEGMENTS = [
+    {"start": i * 2.5, "duration": 2.5, "text": f"Segment {i} covers attention, tokens and layer {i % 12}."}
+    for i in range(1500)
+]
+
+
+@pytest.mark.parametrize("stage_cache", [None, StageCache()])
+def test_sink_output_matches_generate_blog(stage_cache):
+    worker = Worker(stage_cache=stage_cache)
+    plan = {"transcript_data": Transcript("dQw4w9WgXcQ", "en", SEGMENTS), "style": {"tone": "simple"}}
+    expected = worker.generate_blog(plan, SessionMemory())
+
+    sink = io.StringIO()
+    draft = worker.write_blog(plan, sink, SessionMemory())
+    body = sink.getvalue()
+
+    assert body == expected["body"]
+    assert draft["length"] == len(body)
+    assert draft["sha256"] == hashlib.sha256(body.encode("utf-8")).hexdigest()
+    assert {k: v for k, v in draft.items() if k not in ("body", "length", "sha256")} == \
+        {k: v for k, v in expected.items() if k != "body"}